@@ -0,0 +1,102 @@
+"""
+Mesure mémoire et temps de construction des entités (100 000 par défaut)
+
+Compare, pour chaque modèle de core/data_models.py:
+- l'ancienne représentation (dataclass avec __dict__, listes/dicts neufs)
+- la représentation compacte (__slots__, vides partagés, chaînes internées)
+- le stockage en colonnes (EntityTable)
+
+Usage: python benchmark_models.py [nombre d'entités]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import MISSING, field, fields, make_dataclass
+
+sys.path.insert(0, 'src')
+
+from core.compact import SHARED_EMPTY
+from core.data_models import City, Industry, TransportLine, Vehicle
+from core.entity_table import EntityTable
+
+VEHICLE_TYPES = ["train", "truck", "ship", "plane"]
+MODELS = [f"Modèle {i}" for i in range(80)]
+INDUSTRY_TYPES = ["oil", "coal", "farm", "factory", "sawmill"]
+
+def legacy_class(cls):
+    """Équivalent de cls tel qu'il était: dataclass ordinaire, conteneurs neufs"""
+    specs = []
+    for spec in fields(cls):
+        if spec.default is SHARED_EMPTY:
+            specs.append((spec.name, spec.type, field(default_factory=spec.metadata['factory'])))
+        elif spec.default is not MISSING:
+            specs.append((spec.name, spec.type, field(default=spec.default)))
+        else:
+            specs.append((spec.name, spec.type))
+    return make_dataclass(f"Legacy{cls.__name__}", specs)
+
+def fresh(text):
+    """Copie d'une chaîne (comme lue depuis un fichier: jamais partagée)"""
+    return "".join(list(text))
+
+def vehicle_args(rnd, i):
+    return dict(id=i, name=f"Véhicule {i}", vehicle_type=fresh(rnd.choice(VEHICLE_TYPES)),
+                model=fresh(rnd.choice(MODELS)), year=rnd.randint(1850, 2050),
+                speed=rnd.uniform(40, 300), x=rnd.uniform(0, 8192), y=rnd.uniform(0, 8192),
+                purchase_cost=rnd.randint(10**5, 10**7))
+
+def city_args(rnd, i):
+    return dict(id=i, name=f"Ville {i}", x=rnd.uniform(0, 8192), y=rnd.uniform(0, 8192),
+                population=rnd.randint(100, 100000))
+
+def industry_args(rnd, i):
+    return dict(id=i, name=f"Industrie {i}", industry_type=fresh(rnd.choice(INDUSTRY_TYPES)),
+                x=rnd.uniform(0, 8192), y=rnd.uniform(0, 8192))
+
+def line_args(rnd, i):
+    return dict(id=i, name=f"Ligne {i}", transport_type=fresh(rnd.choice(VEHICLE_TYPES)),
+                profit=rnd.randint(-10**5, 10**6))
+
+def measure(build):
+    """Retourne (mémoire retenue en octets, durée en secondes)"""
+    # Durée mesurée sans tracemalloc, qui ralentit chaque allocation
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size, elapsed
+
+def run(count):
+    print(f"{count:,} entités par modèle\n")
+    print(f"{'Modèle':<14}{'Représentation':<16}{'Octets/entité':>14}{'Construction':>14}")
+
+    for cls, make_args in ((Vehicle, vehicle_args), (City, city_args),
+                           (Industry, industry_args), (TransportLine, line_args)):
+        legacy = legacy_class(cls)
+
+        # Valeurs générées pendant la construction, comme à la lecture d'un fichier
+        def rows():
+            rnd = random.Random(0)
+            return (make_args(rnd, i) for i in range(count))
+
+        results = [
+            ("dataclass", measure(lambda: [legacy(**args) for args in rows()])),
+            ("compacte", measure(lambda: [cls(**args) for args in rows()])),
+        ]
+        if cls is not TransportLine:
+            results.append(("EntityTable", measure(lambda: EntityTable(cls, rows()))))
+
+        for label, (size, elapsed) in results:
+            print(f"{cls.__name__:<14}{label:<16}{size / count:>14.1f}{elapsed:>13.3f}s")
+        print()
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Interface en ligne de commande de TS_Tool_Routier (sans Qt)
+
+Traitement par lots d'un ou plusieurs répertoires de sauvegardes:
+
+    python src/main.py batch SAVES/ --fields money_offset game_version
+    python src/main.py batch SAVES/ --set-money 5000000 --backup
+    python src/main.py batch a.save b.save --export ndjson --output-dir exports/
+
+Chaque fichier est traité par un SaveFileManager dans un processus séparé
+(au plus --workers processus, au plus --max-pending fichiers en attente).
+Une ligne JSON par fichier est écrite sur la sortie standard, dans l'ordre
+de fin de traitement; les journaux vont sur la sortie d'erreur.
+
+Codes de sortie: 0 si tous les fichiers ont été traités, 1 si au moins un
+a échoué, 2 en cas d'erreur d'utilisation (aucun fichier trouvé...).
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+# Formats d'export et extension des fichiers produits
+EXPORT_EXTENSIONS = {'json': '.json', 'ndjson': '.ndjson', 'npz': '.npz'}
+
+DEFAULT_PATTERN = '*.save'
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str)
+
+class _ErrorCollector(logging.Handler):
+    """Retient les erreurs journalisées pendant le traitement d'un fichier"""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.messages: List[str] = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+def _configure_logging(verbose: bool):
+    """Journaux sur stderr: stdout est réservé aux résultats JSON"""
+    logger = logging.getLogger("TS_Tool_Routier")
+    logger.setLevel(logging.INFO if verbose else logging.WARNING)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s',
+                                               datefmt='%H:%M:%S'))
+        logger.addHandler(handler)
+
+def _plain_value(value):
+    """Valeur de champ sérialisable en JSON (octets en hexadécimal)"""
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+def _export_path(filepath: str, export_format: str, output_dir: Optional[str]) -> str:
+    source = Path(filepath)
+    directory = Path(output_dir) if output_dir else source.parent
+    return str(directory / (source.stem + EXPORT_EXTENSIONS[export_format]))
+
+def process_file(filepath: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Traite un fichier de sauvegarde (exécuté dans un processus du pool)
+
+    Args:
+        filepath: Fichier .save
+        options: Opérations demandées (voir _batch_options)
+
+    Returns:
+        Résultat sérialisable: {'file', 'ok', 'elapsed', ...} et 'error' en cas d'échec
+    """
+    # Imports locaux: le processus parent n'a besoin que d'argparse
+    from core.save_file import LOAD_MODE_COW, LOAD_MODE_READONLY, SaveFileManager
+
+    result: Dict[str, Any] = {'file': filepath, 'ok': False}
+    start = time.perf_counter()
+    collector = _ErrorCollector()
+    root_logger = logging.getLogger("TS_Tool_Routier")
+    root_logger.addHandler(collector)
+
+    manager = SaveFileManager()
+    try:
+        writing = options['set_money'] is not None
+        mode = LOAD_MODE_COW if writing else LOAD_MODE_READONLY
+        if manager.load_save_file(filepath, mode) is None:
+            raise RuntimeError(collector.messages[-1] if collector.messages
+                               else "Chargement impossible")
+        result['size'] = len(manager.raw_data)
+        result['compressed'] = manager.compression is not None
+
+        if options['fields'] is not None:
+            names = options['fields'] or None
+            result['fields'] = {
+                name: _plain_value(value)
+                for name, value in manager.read_fields(names).items()
+            }
+
+        if writing and not manager.has_money_offset():
+            # Jamais d'écriture à un emplacement deviné
+            spec = manager.known_offsets['money_offset']
+            raise ValueError(f"Offset de l'argent hors du fichier: 0x{spec['offset']:08X} "
+                             f"(fichier de {len(manager.raw_data)} octets)")
+
+        if options['backup']:
+            from utils.backup_manager import BackupManager
+            backup_path = BackupManager(options['backup_dir']).create_backup(filepath, "batch")
+            if backup_path is None:
+                raise RuntimeError(collector.messages[-1] if collector.messages
+                                   else "Sauvegarde de sécurité impossible")
+            result['backup'] = backup_path
+
+        if writing:
+            manager.set_field('money_offset', options['set_money'])
+            # Sauvegarde de sécurité seulement avec --backup (créée ci-dessus):
+            # save_to_file passerait sinon par le gestionnaire global, dans
+            # paths.backup_dir, et lancerait la conservation dans ce processus
+            if not manager.save_to_file(filepath, backup=False):
+                raise RuntimeError(collector.messages[-1] if collector.messages
+                                   else "Écriture impossible")
+            result['money'] = options['set_money']
+            result['money_offset'] = manager.schema.fields['money_offset'].offset
+
+        export_format = options['export']
+        if export_format:
+            export_path = _export_path(filepath, export_format, options['output_dir'])
+            if export_format == 'npz':
+                manager.export_to_columns(export_path)
+            elif export_format == 'ndjson':
+                manager.export_to_ndjson(export_path)
+            else:
+                manager.export_to_json(export_path)
+            result['export'] = export_path
+
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+    finally:
+        manager.close()
+        root_logger.removeHandler(collector)
+        result['elapsed'] = round(time.perf_counter() - start, 4)
+    return result
+
+def _worker_init(verbose: bool):
+    """Initialisation d'un processus du pool (journaux sur stderr)"""
+    _configure_logging(verbose)
+
+def iter_save_files(paths: Sequence[str], pattern: str = DEFAULT_PATTERN,
+                    recursive: bool = False) -> Iterator[str]:
+    """
+    Fichiers à traiter: fichiers donnés tels quels, répertoires parcourus
+
+    Args:
+        paths: Fichiers et/ou répertoires
+        pattern: Motif des fichiers retenus dans les répertoires
+        recursive: Parcourir aussi les sous-répertoires
+    """
+    seen = set()
+    for path in paths:
+        source = Path(path)
+        if source.is_dir():
+            matches = source.rglob(pattern) if recursive else source.glob(pattern)
+            candidates = sorted(match for match in matches if match.is_file())
+        else:
+            candidates = [source]
+        for candidate in candidates:
+            key = os.path.abspath(candidate)
+            if key not in seen:
+                seen.add(key)
+                yield str(candidate)
+
+def _write_result(out: TextIO, result: Dict[str, Any]):
+    out.write(_encoder.encode(result) + '\n')
+    out.flush()
+
+def run_batch(files: Sequence[str], options: Dict[str, Any], workers: int,
+              max_pending: int, out: TextIO, verbose: bool = False) -> int:
+    """
+    Traite les fichiers dans un pool de processus, avec un nombre borné de tâches en attente
+
+    Returns:
+        Nombre de fichiers en échec
+    """
+    failures = 0
+
+    def report(result):
+        nonlocal failures
+        if not result['ok']:
+            failures += 1
+        _write_result(out, result)
+
+    if workers <= 1:
+        # Un seul processus: traitement direct, sans pool
+        for filepath in files:
+            report(process_file(filepath, options))
+        return failures
+
+    remaining = iter(files)
+    pending = {}
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_worker_init, initargs=(verbose,)) as executor:
+        try:
+            while True:
+                # Remplir la fenêtre de tâches en attente
+                for filepath in remaining:
+                    pending[executor.submit(process_file, filepath, options)] = filepath
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    filepath = pending.pop(future)
+                    try:
+                        report(future.result())
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        report({'file': filepath, 'ok': False, 'error': str(e)})
+        except BrokenProcessPool as e:
+            # Un processus a été tué: les fichiers restants sont signalés en échec
+            message = f"Pool de processus interrompu: {e}"
+            for filepath in list(pending.values()) + list(remaining):
+                report({'file': filepath, 'ok': False, 'error': message})
+    return failures
+
+def _batch_options(args) -> Dict[str, Any]:
+    return {
+        'fields': args.fields,
+        'set_money': args.set_money,
+        'export': args.export,
+        'output_dir': args.output_dir,
+        'backup': args.backup,
+        'backup_dir': args.backup_dir,
+    }
+
+def _default_backup_dir() -> str:
+    from utils.config import get_setting
+    return get_setting('paths', 'backup_dir', 'backups')
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="ts_tool",
+                                     description="TS_Tool_Routier en ligne de commande")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    batch = commands.add_parser('batch', help="Traiter des sauvegardes par lots")
+    batch.add_argument('paths', nargs='+', help="Fichiers .save ou répertoires")
+    batch.add_argument('--pattern', default=DEFAULT_PATTERN,
+                       help=f"Motif des fichiers dans les répertoires ({DEFAULT_PATTERN})")
+    batch.add_argument('-r', '--recursive', action='store_true',
+                       help="Parcourir les sous-répertoires")
+    batch.add_argument('--fields', nargs='*', metavar='CHAMP',
+                       help="Lire des champs connus (tous si aucun nom)")
+    batch.add_argument('--set-money', type=int, metavar='MONTANT',
+                       help="Écrire le montant d'argent et enregistrer le fichier")
+    batch.add_argument('--export', choices=sorted(EXPORT_EXTENSIONS),
+                       help="Exporter les données (json, ndjson ou npz)")
+    batch.add_argument('--output-dir', help="Répertoire des exports (celui du fichier par défaut)")
+    batch.add_argument('--backup', action='store_true',
+                       help="Créer une sauvegarde de sécurité de chaque fichier")
+    batch.add_argument('--backup-dir', help="Répertoire des sauvegardes de sécurité")
+    batch.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                       help="Nombre de processus (1: pas de pool)")
+    batch.add_argument('--max-pending', type=int,
+                       help="Fichiers en attente au plus (2 x workers par défaut)")
+    batch.add_argument('-v', '--verbose', action='store_true', help="Journaux détaillés")
+    return parser
+
+def _check_money(parser: argparse.ArgumentParser, amount: int):
+    from utils.config import get_setting
+    low = get_setting('game', 'min_money', None)
+    high = get_setting('game', 'max_money', None)
+    if (low is not None and amount < low) or (high is not None and amount > high):
+        parser.error(f"Montant hors limites: {amount} (de {low} à {high})")
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Point d'entrée de la ligne de commande
+
+    Returns:
+        Code de sortie (EXIT_OK, EXIT_FAILED ou EXIT_USAGE)
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    _configure_logging(args.verbose)
+
+    if args.workers < 1:
+        parser.error("--workers doit être au moins 1")
+    if args.max_pending is not None and args.max_pending < 1:
+        parser.error("--max-pending doit être au moins 1")
+    if args.set_money is not None:
+        _check_money(parser, args.set_money)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    if args.backup and not args.backup_dir:
+        args.backup_dir = _default_backup_dir()
+
+    files = list(iter_save_files(args.paths, args.pattern, args.recursive))
+    missing = [path for path in files if not os.path.isfile(path)]
+    if missing:
+        for path in missing:
+            print(f"Fichier introuvable: {path}", file=sys.stderr)
+        return EXIT_USAGE
+    if not files:
+        print("Aucun fichier à traiter", file=sys.stderr)
+        return EXIT_USAGE
+
+    workers = min(args.workers, len(files))
+    max_pending = args.max_pending or 2 * workers
+    failures = run_batch(files, _batch_options(args), workers, max(max_pending, workers),
+                         sys.stdout, args.verbose)
+
+    logging.getLogger("TS_Tool_Routier").info(
+        f"Lot terminé: {len(files) - failures}/{len(files)} fichier(s) traité(s)")
+    return EXIT_FAILED if failures else EXIT_OK
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
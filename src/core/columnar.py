@@ -0,0 +1,190 @@
+"""
+Export binaire en colonnes des entités (fichier .npz non compressé)
+
+Une entrée .npy par colonne ("vehicles.speed", "cities.population"...):
+- champs numériques: tableau typé
+- champs texte: codes uint32 + valeurs distinctes ("<colonne>.categories")
+- champs liste/dict: positions des lignes non vides ("<colonne>.rows") et
+  leurs valeurs en JSON ("<colonne>.json")
+Le schéma (sections, nombre de lignes, nature des champs) est stocké en
+JSON dans l'entrée "__schema__".
+
+Le fichier se relit avec np.load() dans un notebook; load_columnar()
+projette directement chaque colonne en mémoire (np.memmap) à partir de son
+offset dans l'archive, sans rien copier.
+"""
+
+import json
+import struct
+import zipfile
+from typing import Dict
+import numpy as np
+from numpy.lib import format as npy_format
+from .data_models import City, GameSave, Industry, TransportLine, Vehicle
+from .entity_table import COLUMN_OBJECT, COLUMN_STRING, EntityTable
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+COLUMNAR_VERSION = 1
+SCHEMA_KEY = '__schema__'
+
+# Sections exportées et dataclass de leurs lignes
+SECTION_CLASSES = {
+    'cities': City,
+    'vehicles': Vehicle,
+    'industries': Industry,
+    'lines': TransportLine,
+}
+
+# En-tête local d'une entrée zip: signature, versions, drapeaux, ... longueurs du nom et de l'extra
+ZIP_LOCAL_HEADER = struct.Struct('<4s5H3I2H')
+ZIP_LOCAL_SIGNATURE = b'PK\x03\x04'
+
+def _json_array(value) -> np.ndarray:
+    return np.frombuffer(json.dumps(value, ensure_ascii=False).encode('utf-8'), dtype=np.uint8)
+
+def _json_value(array: np.ndarray):
+    return json.loads(np.asarray(array).tobytes().decode('utf-8'))
+
+def _section_table(save: GameSave, section: str) -> EntityTable:
+    entities = getattr(save, section)
+    if isinstance(entities, EntityTable):
+        return entities
+    # Les lignes de transport sont une liste d'objets
+    return EntityTable(SECTION_CLASSES[section], entities)
+
+def export_columnar(save: GameSave, filepath: str) -> int:
+    """
+    Écrit les tables d'entités de la sauvegarde dans un .npz non compressé
+
+    Returns:
+        Nombre d'entités écrites
+    """
+    arrays = {}
+    schema = {'version': COLUMNAR_VERSION, 'sections': {}}
+    total = 0
+
+    for section in SECTION_CLASSES:
+        table = _section_table(save, section)
+        kinds = {}
+        for name in table.field_names:
+            kind = kinds[name] = table.column_kind(name)
+            key = f"{section}.{name}"
+            if kind == COLUMN_OBJECT:
+                objects = table.objects(name)
+                rows = sorted(objects)
+                arrays[f"{key}.rows"] = np.array(rows, dtype=np.int64)
+                arrays[f"{key}.json"] = _json_array([objects[row] for row in rows])
+            else:
+                arrays[key] = table.column(name)
+                if kind == COLUMN_STRING:
+                    arrays[f"{key}.categories"] = _json_array(table.categories(name))
+
+        schema['sections'][section] = {'size': len(table), 'fields': kinds}
+        total += len(table)
+
+    # np.savez n'applique aucune compression: les colonnes restent projetables
+    np.savez(filepath, **{SCHEMA_KEY: _json_array(schema)}, **arrays)
+    logger.info(f"Export colonnes: {filepath} ({total} entités)")
+    return total
+
+def _stored_array_header(f, info: zipfile.ZipInfo):
+    """
+    Place f au début des données d'une entrée .npy non compressée
+
+    Returns:
+        (forme, ordre Fortran, dtype), ou None si l'en-tête .npy n'est pas lisible ici
+    """
+    # Les données de l'entrée suivent son en-tête local (nom + extra)
+    f.seek(info.header_offset)
+    header = ZIP_LOCAL_HEADER.unpack(f.read(ZIP_LOCAL_HEADER.size))
+    if header[0] != ZIP_LOCAL_SIGNATURE:
+        raise ValueError(f"Entrée zip invalide: {info.filename}")
+    f.seek(header[-2] + header[-1], 1)
+
+    version = npy_format.read_magic(f)
+    if version == (1, 0):
+        return npy_format.read_array_header_1_0(f)
+    if version == (2, 0):
+        return npy_format.read_array_header_2_0(f)
+    return None
+
+def _member_arrays(filepath: str, mmap: bool) -> Dict[str, np.ndarray]:
+    """Entrées .npy de l'archive, projetées en mémoire (copy-on-write) si possible"""
+    arrays = {}
+    with zipfile.ZipFile(filepath) as archive, open(filepath, 'rb') as f:
+        for info in archive.infolist():
+            if not info.filename.endswith('.npy'):
+                continue
+            key = info.filename[:-len('.npy')]
+
+            header = None
+            if mmap and info.compress_type == zipfile.ZIP_STORED:
+                header = _stored_array_header(f, info)
+            if header is None:
+                with archive.open(info) as member:
+                    arrays[key] = npy_format.read_array(member, allow_pickle=False)
+                continue
+
+            shape, fortran_order, dtype = header
+            if dtype.hasobject:
+                raise ValueError(f"Colonne d'objets non supportée: {key}")
+            count = int(np.prod(shape))
+            if count == 0:
+                arrays[key] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[key] = np.memmap(filepath, dtype=dtype, mode='c', offset=f.tell(),
+                                        shape=shape, order='F' if fortran_order else 'C')
+    return arrays
+
+def load_columnar(filepath: str, mmap: bool = True) -> Dict[str, EntityTable]:
+    """
+    Relit un export en colonnes
+
+    Args:
+        filepath: Fichier .npz écrit par export_columnar
+        mmap: Projeter les colonnes en mémoire plutôt que les lire
+
+    Returns:
+        {section: EntityTable} (les tables restent modifiables en mémoire)
+    """
+    arrays = _member_arrays(filepath, mmap)
+    if SCHEMA_KEY not in arrays:
+        raise ValueError("Fichier sans schéma: pas un export en colonnes")
+
+    schema = _json_value(arrays[SCHEMA_KEY])
+    if schema.get('version') != COLUMNAR_VERSION:
+        raise ValueError(f"Version d'export non supportée: {schema.get('version')}")
+
+    tables = {}
+    for section, info in schema['sections'].items():
+        row_class = SECTION_CLASSES.get(section)
+        if row_class is None:
+            logger.warning(f"Section inconnue ignorée: {section}")
+            continue
+
+        columns, categories, objects = {}, {}, {}
+        for name, kind in info['fields'].items():
+            key = f"{section}.{name}"
+            if kind == COLUMN_OBJECT:
+                rows = arrays[f"{key}.rows"].tolist()
+                objects[name] = dict(zip(rows, _json_value(arrays[f"{key}.json"])))
+                continue
+            columns[name] = arrays[key]
+            if kind == COLUMN_STRING:
+                categories[name] = _json_value(arrays[f"{key}.categories"])
+
+        tables[section] = EntityTable.from_columns(row_class, info['size'], columns,
+                                                   categories, objects)
+    return tables
+
+def load_into_save(save: GameSave, filepath: str, mmap: bool = True) -> GameSave:
+    """Remplace les tables d'entités d'une sauvegarde par celles d'un export"""
+    tables = load_columnar(filepath, mmap)
+    for section, table in tables.items():
+        if section == 'lines':
+            save.lines = [row.to_object() for row in table]
+        else:
+            setattr(save, section, table)
+    return save
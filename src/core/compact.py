@@ -0,0 +1,222 @@
+"""
+Représentation compacte des entités (City, Vehicle, Industry, TransportLine)
+
+- __slots__: pas de __dict__ par instance
+- listes et dictionnaires vides partagés: un champ déclaré avec
+  empty_default(list) ne contient qu'une sentinelle commune tant qu'il est
+  vide; un vrai conteneur n'est créé qu'à la première écriture
+- chaînes répétées (modèle, type de véhicule...) internées avec sys.intern
+"""
+
+import sys
+from dataclasses import MISSING, Field, field, fields, is_dataclass
+from typing import Any, Callable, Iterable
+
+class _SharedEmpty:
+    """Sentinelle stockée dans les champs conteneurs encore vides"""
+
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return 'SHARED_EMPTY'
+
+    def __reduce__(self):
+        return 'SHARED_EMPTY'
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+SHARED_EMPTY = _SharedEmpty()
+
+def empty_default(factory: Callable[[], Any]) -> Field:
+    """Champ conteneur vide par défaut, sans allocation par instance"""
+    return field(default=SHARED_EMPTY, metadata={'factory': factory})
+
+def default_value(spec: Field):
+    """
+    Valeur par défaut neuve d'un champ de dataclass
+
+    Returns:
+        La valeur, ou dataclasses.MISSING si le champ est obligatoire
+    """
+    if spec.default is SHARED_EMPTY:
+        return spec.metadata['factory']()
+    if spec.default is not MISSING:
+        return spec.default
+    if spec.default_factory is not MISSING:
+        return spec.default_factory()
+    return MISSING
+
+class EmptyView:
+    """
+    Conteneur vide rendu par un champ non encore matérialisé
+
+    Les lectures ne créent rien; la première modification (append, update,
+    item = ..., +=) crée le vrai conteneur et l'enregistre dans l'instance.
+    """
+
+    __slots__ = ('_owner', '_slot', '_factory')
+
+    def __init__(self, owner, slot, factory):
+        self._owner = owner
+        self._slot = slot
+        self._factory = factory
+
+    def _materialize(self):
+        value = self._factory()
+        self._slot.__set__(self._owner, value)
+        return value
+
+    # Lectures
+    def __len__(self):
+        return 0
+
+    def __iter__(self):
+        return iter(())
+
+    def __contains__(self, item):
+        return False
+
+    def __bool__(self):
+        return False
+
+    def __getitem__(self, key):
+        return self._factory()[key]
+
+    def get(self, key, default=None):
+        return default
+
+    def keys(self):
+        return self._factory().keys()
+
+    def values(self):
+        return self._factory().values()
+
+    def items(self):
+        return self._factory().items()
+
+    def count(self, item):
+        return 0
+
+    def copy(self):
+        return self._factory()
+
+    def __eq__(self, other):
+        return other == self._factory()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self._factory())
+
+    def __copy__(self):
+        return self._factory()
+
+    def __deepcopy__(self, memo):
+        return self._factory()
+
+    def __reduce__(self):
+        return self._factory, ()
+
+    # Écritures: matérialisation puis délégation
+    def __setitem__(self, key, value):
+        self._materialize()[key] = value
+
+    def __iadd__(self, other):
+        value = self._materialize()
+        value += other
+        return value
+
+    def __ior__(self, other):
+        value = self._materialize()
+        value |= other
+        return value
+
+    def __getattr__(self, name):
+        # append, extend, insert, update, setdefault...
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._materialize(), name)
+
+class _CopyOnWriteSlot:
+    """Descripteur d'un champ conteneur: sentinelle partagée tant qu'il est vide"""
+
+    def __init__(self, slot, factory):
+        self.slot = slot
+        self.factory = factory
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = self.slot.__get__(obj, owner)
+        if value is SHARED_EMPTY:
+            return EmptyView(obj, self.slot, self.factory)
+        return value
+
+    def __set__(self, obj, value):
+        self.slot.__set__(obj, value)
+
+class _InternedSlot:
+    """Descripteur d'un champ texte dont les valeurs sont internées"""
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return self.slot.__get__(obj, owner)
+
+    def __set__(self, obj, value):
+        if type(value) is str:
+            value = sys.intern(value)
+        self.slot.__set__(obj, value)
+
+def _add_slots(cls):
+    """Recrée une dataclass avec __slots__ (équivalent de slots=True, Python < 3.10)"""
+    names = tuple(spec.name for spec in fields(cls))
+    namespace = dict(cls.__dict__)
+    namespace['__slots__'] = names
+    for name in names:
+        namespace.pop(name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+def compact(interned: Iterable[str] = ()):
+    """
+    Décorateur de dataclass: __slots__, conteneurs vides partagés, chaînes internées
+
+    Args:
+        interned: Champs texte dont les valeurs sont internées
+
+    Exemple:
+        @compact(interned=('model',))
+        @dataclass
+        class Vehicle: ...
+    """
+    interned = frozenset(interned)
+
+    def decorate(cls):
+        if not is_dataclass(cls):
+            raise TypeError(f"{cls.__name__} n'est pas une dataclass")
+
+        cls = _add_slots(cls)
+        for spec in fields(cls):
+            slot = cls.__dict__[spec.name]
+            if spec.default is SHARED_EMPTY:
+                setattr(cls, spec.name, _CopyOnWriteSlot(slot, spec.metadata['factory']))
+            elif spec.name in interned:
+                setattr(cls, spec.name, _InternedSlot(slot))
+        return cls
+
+    return decorate
@@ -0,0 +1,388 @@
+"""
+Sauvegardes compressées (zlib), entièrement ou après un en-tête en clair
+
+Le flux est décompressé progressivement (zlib.decompressobj, sortie bornée
+par appel) dans un fichier temporaire projeté en mémoire: la mémoire utilisée
+ne dépend pas de la taille décompressée et les premières pages sont
+disponibles avant la fin de la décompression.
+
+À l'enregistrement, les données sont découpées en blocs de CHUNK_SIZE
+octets. Chaque bloc est compressé indépendamment (deflate brut terminé par
+Z_FULL_FLUSH, sans référence aux blocs précédents): le fichier écrit reste un
+flux zlib standard, et aux enregistrements suivants les blocs non modifiés
+sont recopiés tels quels depuis le fichier précédent. La position des blocs
+compressés est conservée à côté du fichier (<fichier>.tschunks).
+"""
+
+import io
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import BinaryIO, Callable, List, Optional, Set, Tuple
+from utils.fast_copy import copy_range
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CHUNK_MAP_SUFFIX = '.tschunks'
+CHUNK_MAP_VERSION = 1
+
+# Taille d'un bloc de données décompressées (unité de recompression)
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# Lectures du flux compressé et sortie maximale par appel à decompress()
+INPUT_READ_SIZE = 1024 * 1024
+OUTPUT_LIMIT = 1024 * 1024
+
+# Zone de recherche d'un flux zlib (en-tête en clair éventuel)
+HEADER_SCAN_SIZE = 4096
+
+# Octets compressés décompressés pour valider un flux candidat
+PROBE_SIZE = 64 * 1024
+
+# Taille de l'aperçu transmis avant la fin de la décompression
+PREVIEW_SIZE = 1024 * 1024
+
+# Niveau de compression selon le champ FLEVEL de l'en-tête zlib
+FLEVEL_TO_LEVEL = {0: 1, 1: 5, 2: 6, 3: 9}
+
+# Dernier bloc deflate vide (fin du flux) et somme de contrôle Adler-32
+FINAL_BLOCK = b'\x03\x00'
+ADLER = struct.Struct('>I')
+
+@dataclass
+class CompressedLayout:
+    """Organisation d'un fichier compressé et de ses données décompressées"""
+    prefix_size: int        # En-tête en clair (offset du flux zlib dans le fichier)
+    header: bytes           # En-tête zlib (2 octets)
+    level: int              # Niveau de compression utilisé à l'enregistrement
+    data_size: int          # En-tête en clair + données décompressées
+    suffix_offset: int      # Octets qui suivent le flux, dans le fichier
+    suffix_size: int
+    chunk_size: int = CHUNK_SIZE
+    # (offset, longueur) des blocs compressés dans le fichier, si connus
+    segments: Optional[List[Tuple[int, int]]] = None
+    file_size: int = 0
+    mtime_ns: int = 0
+
+    def chunk_bounds(self) -> List[Tuple[int, int]]:
+        """Plages [début, fin) des blocs dans les données décompressées"""
+        return [
+            (start, min(start + self.chunk_size, self.data_size))
+            for start in range(self.prefix_size, self.data_size, self.chunk_size)
+        ]
+
+    def dirty_chunks(self, ranges) -> Set[int]:
+        """Indices des blocs touchés par des plages modifiées"""
+        chunks = set()
+        for start, end in ranges:
+            start = max(start, self.prefix_size)
+            if start >= end:
+                continue
+            first = (start - self.prefix_size) // self.chunk_size
+            last = (end - 1 - self.prefix_size) // self.chunk_size
+            chunks.update(range(first, last + 1))
+        return chunks
+
+def _valid_header(cmf: int, flg: int) -> bool:
+    """En-tête zlib deflate, sans dictionnaire prédéfini"""
+    return (cmf & 0x0F) == 8 and (cmf >> 4) <= 7 and (cmf << 8 | flg) % 31 == 0 and not flg & 0x20
+
+def find_zlib_stream(filepath: str, scan_size: int = HEADER_SCAN_SIZE) -> Optional[int]:
+    """
+    Cherche un flux zlib au début du fichier (éventuellement après un en-tête en clair)
+
+    Un candidat n'est retenu que si ses PROBE_SIZE premiers octets se
+    décompressent sans erreur.
+
+    Returns:
+        Offset du flux dans le fichier, ou None si le fichier n'est pas compressé
+    """
+    with open(filepath, 'rb') as f:
+        head = f.read(scan_size + PROBE_SIZE)
+
+    for offset in range(min(scan_size, max(0, len(head) - 2))):
+        if not _valid_header(head[offset], head[offset + 1]):
+            continue
+        decompressor = zlib.decompressobj()
+        try:
+            output = decompressor.decompress(head[offset:offset + PROBE_SIZE], OUTPUT_LIMIT)
+        except zlib.error:
+            continue
+        if output or decompressor.eof:
+            return offset
+    return None
+
+def inflate_file(filepath: str, stream_offset: int, write: Callable[[bytes], object],
+                 progress: Optional[Callable[[int], None]] = None,
+                 cancel: Optional[Callable[[], bool]] = None,
+                 preview: Optional[Callable[[bytes], None]] = None) -> Optional[CompressedLayout]:
+    """
+    Décompresse progressivement le fichier: en-tête en clair puis flux zlib
+
+    Args:
+        filepath: Fichier compressé
+        stream_offset: Offset du flux zlib (voir find_zlib_stream)
+        write: Reçoit les données décompressées, dans l'ordre
+        progress: Appelé avec le pourcentage du fichier compressé lu
+        cancel: Retourne True pour interrompre la décompression
+        preview: Appelé une fois avec les PREVIEW_SIZE premiers octets
+
+    Returns:
+        CompressedLayout, ou None si la décompression a été annulée
+
+    Raises:
+        ValueError: si le flux est tronqué
+        zlib.error: si le flux est corrompu
+    """
+    stat = os.stat(filepath)
+    total = stat.st_size
+    decompressor = zlib.decompressobj()
+    preview_data = bytearray() if preview is not None else None
+    data_size = 0
+    fed = 0
+
+    def emit(chunk):
+        nonlocal data_size, preview_data
+        if not chunk:
+            return
+        write(chunk)
+        data_size += len(chunk)
+        if preview_data is not None:
+            preview_data += chunk[:PREVIEW_SIZE - len(preview_data)]
+            if len(preview_data) >= PREVIEW_SIZE:
+                preview(bytes(preview_data))
+                preview_data = None
+
+    with open(filepath, 'rb') as f:
+        emit(f.read(stream_offset))
+        header = f.read(2)
+        f.seek(stream_offset)
+
+        while not decompressor.eof:
+            if cancel is not None and cancel():
+                return None
+
+            block = f.read(INPUT_READ_SIZE)
+            fed += len(block)
+
+            # Sortie bornée: le reste de l'entrée est repris dans unconsumed_tail
+            pending = block
+            while not decompressor.eof:
+                output = decompressor.decompress(pending, OUTPUT_LIMIT)
+                emit(output)
+                pending = decompressor.unconsumed_tail
+                if not pending and len(output) < OUTPUT_LIMIT:
+                    break
+
+            if not block and not decompressor.eof:
+                raise ValueError("Flux compressé tronqué")
+
+            if progress:
+                progress(min(100, (stream_offset + fed) * 100 // max(1, total)))
+
+    if preview_data is not None:
+        preview(bytes(preview_data))
+
+    suffix_offset = stream_offset + fed - len(decompressor.unused_data)
+    header_level = FLEVEL_TO_LEVEL[header[1] >> 6]
+    logger.info(f"Flux zlib à 0x{stream_offset:X}: {total} -> {data_size} octets")
+
+    return CompressedLayout(
+        prefix_size=stream_offset,
+        header=header,
+        level=header_level,
+        data_size=data_size,
+        suffix_offset=suffix_offset,
+        suffix_size=total - suffix_offset,
+        file_size=total,
+        mtime_ns=stat.st_mtime_ns
+    )
+
+def inflate_to_mapping(filepath: str, stream_offset: int, access: int = mmap.ACCESS_READ,
+                       progress: Optional[Callable[[int], None]] = None,
+                       cancel: Optional[Callable[[], bool]] = None,
+                       preview: Optional[Callable[[bytes], None]] = None):
+    """
+    Décompresse le fichier dans un fichier temporaire anonyme et le projette en mémoire
+
+    Le fichier temporaire disparaît avec la projection.
+
+    Returns:
+        (données, CompressedLayout), ou None si la décompression a été annulée
+    """
+    with tempfile.TemporaryFile(prefix='ts_tool_', suffix='.inflated') as temp:
+        layout = inflate_file(filepath, stream_offset, temp.write, progress, cancel, preview)
+        if layout is None:
+            return None
+        temp.flush()
+        # mmap refuse les fichiers vides
+        if layout.data_size == 0:
+            return bytearray(), layout
+        return mmap.mmap(temp.fileno(), 0, access=access), layout
+
+def chunk_map_path(filepath: str) -> str:
+    """Chemin de la carte des blocs compressés d'une sauvegarde"""
+    return filepath + CHUNK_MAP_SUFFIX
+
+def load_chunk_map(filepath: str, layout: CompressedLayout) -> bool:
+    """
+    Relit la position des blocs compressés écrits lors d'un enregistrement précédent
+
+    La carte n'est utilisée que si le fichier n'a pas changé depuis.
+
+    Returns:
+        True si layout.segments a été renseigné
+    """
+    try:
+        with open(chunk_map_path(filepath), 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    expected = {
+        'version': CHUNK_MAP_VERSION,
+        'file_size': layout.file_size,
+        'mtime_ns': layout.mtime_ns,
+        'prefix_size': layout.prefix_size,
+        'data_size': layout.data_size,
+        'chunk_size': layout.chunk_size,
+    }
+    if any(saved.get(key) != value for key, value in expected.items()):
+        logger.debug(f"Carte des blocs périmée: {chunk_map_path(filepath)}")
+        return False
+
+    segments = [tuple(segment) for segment in saved.get('segments', [])]
+    if len(segments) != len(layout.chunk_bounds()):
+        return False
+    layout.segments = segments
+    return True
+
+def save_chunk_map(filepath: str, layout: CompressedLayout):
+    """Enregistre la position des blocs compressés à côté du fichier"""
+    try:
+        with open(chunk_map_path(filepath), 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': CHUNK_MAP_VERSION,
+                'file_size': layout.file_size,
+                'mtime_ns': layout.mtime_ns,
+                'prefix_size': layout.prefix_size,
+                'data_size': layout.data_size,
+                'chunk_size': layout.chunk_size,
+                'segments': layout.segments,
+            }, f)
+    except OSError as e:
+        logger.error(f"Erreur écriture carte des blocs: {e}")
+
+def compress_chunk(chunk: bytes, level: int) -> bytes:
+    """Compresse un bloc indépendamment des autres (deflate brut + Z_FULL_FLUSH)"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(chunk) + compressor.flush(zlib.Z_FULL_FLUSH)
+
+def _copy_range(source: BinaryIO, out: BinaryIO, offset: int, length: int):
+    try:
+        out_fd = out.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        out_fd = None
+    if out_fd is not None:
+        # Copie dans le noyau (clone de plage, copy_file_range...) quand c'est possible
+        out.flush()
+        _, copied = copy_range(source.fileno(), out_fd, offset, length)
+        out.seek(0, os.SEEK_END)
+        if copied != length:
+            raise ValueError("Fichier source tronqué")
+        return
+    
+    source.seek(offset)
+    while length > 0:
+        block = source.read(min(length, INPUT_READ_SIZE))
+        if not block:
+            raise ValueError("Fichier source tronqué")
+        out.write(block)
+        length -= len(block)
+
+def write_compressed(layout: CompressedLayout, data, dirty_ranges,
+                     source_path: str, out: BinaryIO,
+                     progress: Optional[Callable[[int], None]] = None,
+                     workers: Optional[int] = None) -> CompressedLayout:
+    """
+    Écrit les données recompressées (en-tête en clair, flux zlib, octets suivants)
+
+    Les blocs non modifiés dont la position est connue sont recopiés depuis
+    source_path; les autres sont compressés en parallèle (zlib libère le GIL),
+    par fenêtre bornée de blocs.
+
+    Args:
+        layout: Organisation du fichier source
+        data: Données décompressées (en-tête en clair inclus)
+        dirty_ranges: Plages de data modifiées depuis le dernier enregistrement
+        source_path: Fichier compressé correspondant à layout
+        out: Fichier de destination, ouvert en écriture binaire
+        progress: Appelé avec le pourcentage de blocs écrits
+        workers: Nombre de threads de compression
+
+    Returns:
+        Organisation du fichier écrit (sans file_size ni mtime_ns)
+    """
+    if len(data) != layout.data_size:
+        raise ValueError("La taille des données décompressées a changé")
+
+    bounds = layout.chunk_bounds()
+    dirty = layout.dirty_chunks(dirty_ranges)
+    reusable = layout.segments if layout.segments and len(layout.segments) == len(bounds) else None
+    workers = workers or os.cpu_count() or 1
+
+    out.write(data[:layout.prefix_size])
+    out.write(layout.header)
+    position = layout.prefix_size + len(layout.header)
+
+    segments = []
+    checksum = zlib.adler32(b'')
+    recompressed = 0
+
+    with open(source_path, 'rb') as source, ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        next_chunk = 0
+
+        while next_chunk < len(bounds) or pending:
+            # Fenêtre bornée: au plus 2 blocs par thread en mémoire
+            while next_chunk < len(bounds) and len(pending) < workers * 2:
+                start, end = bounds[next_chunk]
+                chunk = data[start:end]
+                checksum = zlib.adler32(chunk, checksum)
+                if reusable is not None and next_chunk not in dirty:
+                    pending.append((None, reusable[next_chunk]))
+                else:
+                    pending.append((executor.submit(compress_chunk, chunk, layout.level), None))
+                    recompressed += 1
+                next_chunk += 1
+
+            future, segment = pending.popleft()
+            if future is None:
+                _copy_range(source, out, *segment)
+                length = segment[1]
+            else:
+                compressed = future.result()
+                out.write(compressed)
+                length = len(compressed)
+
+            segments.append((position, length))
+            position += length
+            if progress:
+                progress(len(segments) * 100 // len(bounds))
+
+        out.write(FINAL_BLOCK)
+        out.write(ADLER.pack(checksum))
+        position += len(FINAL_BLOCK) + ADLER.size
+        _copy_range(source, out, layout.suffix_offset, layout.suffix_size)
+
+    logger.info(f"Recompression: {recompressed}/{len(bounds)} bloc(s)")
+
+    return replace(layout, segments=segments, suffix_offset=position,
+                   file_size=0, mtime_ns=0)
@@ -5,6 +5,12 @@ Modèles de données pour Transport Fever 2
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from .compact import compact, empty_default
+
+def _entity_table(row_class, rows=()):
+    """Table d'entités vide ou remplie (numpy importé à la première sauvegarde)"""
+    from .entity_table import EntityTable
+    return EntityTable(row_class, rows)
 
 @dataclass
 class GameSave:
@@ -17,10 +23,10 @@ class GameSave:
     money: int = 0
     difficulty: str = "Normal"
     
-    # Entités du jeu
-    cities: List['City'] = field(default_factory=list)
-    vehicles: List['Vehicle'] = field(default_factory=list)
-    industries: List['Industry'] = field(default_factory=list)
+    # Entités du jeu (tables en colonnes, voir EntityTable)
+    cities: 'EntityTable' = field(default_factory=lambda: _entity_table(City))
+    vehicles: 'EntityTable' = field(default_factory=lambda: _entity_table(Vehicle))
+    industries: 'EntityTable' = field(default_factory=lambda: _entity_table(Industry))
     lines: List['TransportLine'] = field(default_factory=list)
     
     # Métadonnées
@@ -28,12 +34,44 @@ class GameSave:
     map_seed: int = 0
     campaign_progress: int = 0
     
+    # Accès typé aux champs connus: (lecture, écriture), lié par SaveFileManager
+    _field_access = None
+    
+    # Tables d'entités et dataclass de leurs lignes
+    ENTITY_TABLES = {'cities': 'City', 'vehicles': 'Vehicle', 'industries': 'Industry'}
+    
+    def __post_init__(self):
+        from .entity_table import EntityTable
+        
+        # Accepter des listes d'objets (ancienne représentation)
+        for name, row_class in self.ENTITY_TABLES.items():
+            value = getattr(self, name)
+            if not isinstance(value, EntityTable):
+                setattr(self, name, _entity_table(globals()[row_class], value))
+    
+    def bind_fields(self, getter, setter):
+        """Relie la sauvegarde aux accesseurs compilés de son SaveFileManager"""
+        self._field_access = (getter, setter)
+    
+    def get_field(self, name: str):
+        """Valeur typée d'un champ connu (int, float, str ou tuple)"""
+        if self._field_access is None:
+            raise RuntimeError("Sauvegarde non liée à un fichier")
+        return self._field_access[0](name)
+    
+    def set_field(self, name: str, value):
+        """Écrit un champ connu dans les données de la sauvegarde"""
+        if self._field_access is None:
+            raise RuntimeError("Sauvegarde non liée à un fichier")
+        self._field_access[1](name, value)
+    
     def __str__(self):
         return (f"Save: {self.filename}\n"
                 f"Argent: {self.money:,} €\n"
                 f"Villes: {len(self.cities)}\n"
                 f"Véhicules: {len(self.vehicles)}")
 
+@compact()
 @dataclass
 class City:
     """Représente une ville dans le jeu"""
@@ -43,14 +81,15 @@ class City:
     y: float  # Coordonnée Y sur la carte
     population: int = 1000
     growth_rate: float = 1.0
-    connected_industries: List[int] = field(default_factory=list)
+    connected_industries: List[int] = empty_default(list)
     
     # Ressources disponibles
-    resources: Dict[str, int] = field(default_factory=dict)
+    resources: Dict[str, int] = empty_default(dict)
     
     def get_position(self):
         return (self.x, self.y)
 
+@compact(interned=('vehicle_type', 'model'))
 @dataclass
 class Vehicle:
     """Représente un véhicule (train, camion, bateau, avion)"""
@@ -75,6 +114,7 @@ class Vehicle:
     purchase_cost: int = 100000
     running_cost: int = 1000
 
+@compact(interned=('industry_type',))
 @dataclass
 class Industry:
     """Représente une industrie ou une ressource"""
@@ -84,14 +124,15 @@ class Industry:
     x: float
     y: float
     production_rate: float = 1.0
-    connected_to: List[int] = field(default_factory=list)  # IDs des villes connectées
+    connected_to: List[int] = empty_default(list)  # IDs des villes connectées
 
-@dataclass  
+@compact(interned=('transport_type',))
+@dataclass
 class TransportLine:
     """Représente une ligne de transport"""
     id: int
     name: str
     transport_type: str  # "train", "truck", "ship", "plane"
-    stops: List[Dict] = field(default_factory=list)  # Liste des arrêts
-    vehicles: List[int] = field(default_factory=list)  # IDs des véhicules assignés
-    profit: int = 0  Profit mensuel
+    stops: List[Dict] = empty_default(list)  # Liste des arrêts
+    vehicles: List[int] = empty_default(list)  # IDs des véhicules assignés
+    profit: int = 0  # Profit mensuel
@@ -0,0 +1,58 @@
+"""
+Suivi des plages d'octets modifiées dans une sauvegarde
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, Tuple
+
+class DirtyRanges:
+    """Ensemble d'intervalles [début, fin) modifiés, fusionnés et triés"""
+
+    def __init__(self):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+
+    def add(self, offset: int, length: int):
+        """
+        Enregistre une modification
+
+        Args:
+            offset: Premier octet modifié
+            length: Nombre d'octets modifiés
+        """
+        if length <= 0:
+            return
+
+        start, end = offset, offset + length
+
+        # Intervalles qui chevauchent ou touchent [start, end)
+        first = bisect_left(self._ends, start)
+        last = bisect_right(self._starts, end)
+
+        if first < last:
+            start = min(start, self._starts[first])
+            end = max(end, self._ends[last - 1])
+
+        self._starts[first:last] = [start]
+        self._ends[first:last] = [end]
+
+    def clear(self):
+        """Oublie toutes les modifications"""
+        self._starts.clear()
+        self._ends.clear()
+
+    def total_bytes(self) -> int:
+        """Nombre total d'octets modifiés"""
+        return sum(end - start for start, end in self)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(list(zip(self._starts, self._ends)))
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def __repr__(self) -> str:
+        return f"DirtyRanges({list(self)})"
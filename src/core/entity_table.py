@@ -0,0 +1,561 @@
+"""
+Stockage en colonnes des entités d'une sauvegarde (villes, véhicules, industries)
+
+Chaque champ numérique est un tableau NumPy, chaque champ texte est codé
+par dictionnaire (un code uint32 par ligne et la liste des valeurs
+distinctes). Les listes et dictionnaires (ex. connected_industries) ne sont
+stockés que pour les lignes où ils ne sont pas vides.
+
+La table se manipule comme une liste: len(), itération, indexation et
+append() renvoient ou acceptent des vues de ligne qui exposent les mêmes
+attributs que la dataclass d'origine (city.name, vehicle.speed...). Les
+filtres et agrégats travaillent directement sur les colonnes.
+"""
+
+import dataclasses
+import typing
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+import numpy as np
+from .compact import default_value
+
+# Capacité initiale des colonnes (doublée à chaque dépassement)
+INITIAL_CAPACITY = 16
+
+# Valeur stockée pour None dans une colonne Optional[int]
+NULL_INT = np.iinfo(np.int64).min
+
+# Natures de colonne
+COLUMN_INT = 'int'
+COLUMN_FLOAT = 'float'
+COLUMN_OPTIONAL_INT = 'optional_int'
+COLUMN_STRING = 'string'
+COLUMN_OBJECT = 'object'
+
+# Nombre de lignes converties à la fois par iter_records
+RECORD_BATCH = 4096
+
+# Champ absent d'une ligne fournie sous forme de dictionnaire
+_ABSENT = object()
+
+COLUMN_DTYPES = {
+    COLUMN_INT: np.int64,
+    COLUMN_FLOAT: np.float64,
+    COLUMN_OPTIONAL_INT: np.int64,
+    COLUMN_STRING: np.uint32,
+}
+
+def _column_kind(annotation) -> str:
+    """Nature de colonne d'une annotation de champ de dataclass"""
+    if annotation is int or annotation is bool:
+        return COLUMN_INT
+    if annotation is float:
+        return COLUMN_FLOAT
+    if annotation is str:
+        return COLUMN_STRING
+    args = typing.get_args(annotation)
+    if typing.get_origin(annotation) is Union and set(args) == {int, type(None)}:
+        return COLUMN_OPTIONAL_INT
+    return COLUMN_OBJECT
+
+class EntityRow:
+    """
+    Vue légère sur une ligne d'une EntityTable
+
+    Les classes de vue sont générées par EntityTable: une propriété par champ,
+    plus les méthodes de la dataclass d'origine (ex. City.get_position).
+    """
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'EntityTable', index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def row_index(self) -> int:
+        """Position de la ligne dans sa table"""
+        return self._index
+
+    def to_object(self):
+        """Copie la ligne dans une instance de la dataclass d'origine"""
+        return self._table.row_class(**self._table.row_values(self._index))
+
+    def __eq__(self, other):
+        if isinstance(other, EntityRow):
+            return self._table is other._table and self._index == other._index
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self._table), self._index))
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={value!r}"
+                           for name, value in self._table.row_values(self._index).items())
+        return f"{self._table.row_class.__name__}({values})"
+
+def _make_property(name: str) -> property:
+    def getter(row):
+        return row._table.get_value(row._index, name)
+
+    def setter(row, value):
+        row._table.set_value(row._index, name, value)
+
+    return property(getter, setter)
+
+class EntityTable:
+    """Table en colonnes des instances d'une dataclass (City, Vehicle, Industry)"""
+
+    def __init__(self, row_class: type, rows: Iterable[Any] = ()):
+        """
+        Args:
+            row_class: Dataclass décrivant une ligne (champs et valeurs par défaut)
+            rows: Lignes initiales (instances de row_class, vues ou dictionnaires)
+        """
+        self.row_class = row_class
+        self._fields = {spec.name: spec for spec in dataclasses.fields(row_class)}
+        hints = typing.get_type_hints(row_class)
+        self._kinds = {name: _column_kind(hints.get(name, Any)) for name in self._fields}
+
+        self._size = 0
+        self._capacity = 0
+        self._columns: Dict[str, np.ndarray] = {}
+        self._categories: Dict[str, List[str]] = {}
+        self._codes: Dict[str, Dict[str, int]] = {}
+        self._objects: Dict[str, Dict[int, Any]] = {}
+
+        for name, kind in self._kinds.items():
+            if kind == COLUMN_OBJECT:
+                self._objects[name] = {}
+            else:
+                self._columns[name] = np.empty(0, dtype=COLUMN_DTYPES[kind])
+            if kind == COLUMN_STRING:
+                self._categories[name] = []
+                self._codes[name] = {}
+
+        self._row_type = self._make_row_type()
+        self.extend(rows)
+
+    def _make_row_type(self) -> type:
+        """Classe de vue: une propriété par champ + méthodes de la dataclass"""
+        namespace = {'__slots__': ()}
+        for name, value in vars(self.row_class).items():
+            if callable(value) and not name.startswith('__'):
+                namespace[name] = value
+        for name in self._fields:
+            namespace[name] = _make_property(name)
+        return type(f"{self.row_class.__name__}Row", (EntityRow,), namespace)
+
+    @classmethod
+    def from_columns(cls, row_class: type, size: int,
+                     columns: Mapping[str, np.ndarray],
+                     categories: Optional[Mapping[str, Sequence[str]]] = None,
+                     objects: Optional[Mapping[str, Mapping[int, Any]]] = None) -> 'EntityTable':
+        """
+        Reconstruit une table à partir de colonnes existantes (sans copie)
+
+        Les colonnes peuvent être des np.memmap en copy-on-write: la table
+        reste modifiable et les pages ne sont lues qu'à l'accès. Les champs
+        absents prennent leur valeur par défaut.
+
+        Args:
+            row_class: Dataclass des lignes
+            size: Nombre de lignes
+            columns: {champ: tableau} (codes pour les champs texte)
+            categories: {champ texte: valeurs distinctes indexées par code}
+            objects: {champ liste/dict: {ligne: valeur non vide}}
+        """
+        table = cls(row_class)
+        categories = categories or {}
+        objects = objects or {}
+
+        for name, kind in table._kinds.items():
+            if kind == COLUMN_OBJECT:
+                table._objects[name] = dict(objects.get(name, {}))
+                continue
+
+            dtype = COLUMN_DTYPES[kind]
+            column = columns.get(name)
+            if column is None:
+                # Champ ajouté depuis l'export: valeur par défaut
+                if kind == COLUMN_STRING:
+                    column = np.full(size, table._encode(name, table._default(name)), dtype=dtype)
+                else:
+                    default = table._default(name)
+                    column = np.full(size, NULL_INT if default is None else default, dtype=dtype)
+            elif len(column) != size:
+                raise ValueError(f"Colonne '{name}': {len(column)} valeurs au lieu de {size}")
+            elif column.dtype != dtype:
+                column = column.astype(dtype)
+            table._columns[name] = column
+
+            if kind == COLUMN_STRING and name in categories:
+                table._categories[name] = list(categories[name])
+                table._codes[name] = {value: code for code, value in enumerate(table._categories[name])}
+
+        table._size = table._capacity = size
+        return table
+
+    # -- Construction ------------------------------------------------------
+
+    def _reserve(self, size: int):
+        if size <= self._capacity:
+            return
+        capacity = max(INITIAL_CAPACITY, self._capacity * 2, size)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+        self._capacity = capacity
+
+    def _default(self, name: str):
+        value = default_value(self._fields[name])
+        if value is not dataclasses.MISSING:
+            return value
+        raise TypeError(f"{self.row_class.__name__}: champ obligatoire manquant: '{name}'")
+
+    def _row_mapping(self, row) -> Dict[str, Any]:
+        """Valeurs d'une ligne fournie sous forme d'objet, de vue ou de dictionnaire"""
+        if isinstance(row, EntityRow):
+            return row._table.row_values(row._index)
+        if isinstance(row, dict):
+            if not row.keys() <= self._fields.keys():
+                unknown = set(row) - set(self._fields)
+                raise TypeError(f"{self.row_class.__name__}: champ(s) inconnu(s): {sorted(unknown)}")
+            return dict(row)
+        return {name: getattr(row, name) for name in self._fields}
+
+    def append(self, row=None, **values) -> EntityRow:
+        """
+        Ajoute une ligne
+
+        Args:
+            row: Instance de row_class, vue de ligne ou dictionnaire
+            **values: Valeurs des champs (à la place de row)
+
+        Returns:
+            Vue sur la ligne ajoutée
+        """
+        mapping = self._row_mapping(row if row is not None else values)
+        if row is not None and values:
+            mapping = {**mapping, **self._row_mapping(values)}
+
+        index = self._size
+        self._reserve(index + 1)
+        self._size += 1
+        try:
+            for name in self._fields:
+                value = mapping[name] if name in mapping else self._default(name)
+                self._store(index, name, value)
+        except Exception:
+            self._size -= 1
+            for objects in self._objects.values():
+                objects.pop(index, None)
+            raise
+        return self._row_type(self, index)
+
+    def extend(self, rows: Iterable[Any]):
+        """Ajoute plusieurs lignes (remplissage colonne par colonne)"""
+        # Objets lus par attribut, dictionnaires et vues lus par clé
+        records = [row if isinstance(row, self.row_class) else self._row_mapping(row)
+                   for row in rows]
+        if not records:
+            return
+
+        start = self._size
+        end = start + len(records)
+        self._reserve(end)
+        try:
+            for name, kind in self._kinds.items():
+                values = [
+                    row.get(name, _ABSENT) if type(row) is dict else getattr(row, name)
+                    for row in records
+                ]
+                if kind == COLUMN_OBJECT:
+                    objects = self._objects[name]
+                    for index, value in enumerate(values, start):
+                        if value and value is not _ABSENT:
+                            objects[index] = value
+                    continue
+                if _ABSENT in values:
+                    default = self._default(name)
+                    values = [default if value is _ABSENT else value for value in values]
+                if kind == COLUMN_STRING:
+                    codes = self._codes[name]
+                    values = [codes[value] if value in codes else self._encode(name, value)
+                              for value in values]
+                elif kind == COLUMN_OPTIONAL_INT:
+                    values = [NULL_INT if value is None else value for value in values]
+                self._columns[name][start:end] = values
+        except Exception:
+            for objects in self._objects.values():
+                for index in range(start, end):
+                    objects.pop(index, None)
+            raise
+        self._size = end
+
+    def clear(self):
+        """Supprime toutes les lignes (les dictionnaires de chaînes sont conservés)"""
+        self._size = 0
+        for objects in self._objects.values():
+            objects.clear()
+
+    # -- Accès par ligne ---------------------------------------------------
+
+    def _encode(self, name: str, value: str) -> int:
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            if not isinstance(value, str):
+                raise TypeError(f"{name}: chaîne attendue, {type(value).__name__} reçu")
+            code = codes[value] = len(self._categories[name])
+            self._categories[name].append(value)
+        return code
+
+    def _store(self, index: int, name: str, value):
+        kind = self._kinds[name]
+        if kind == COLUMN_OBJECT:
+            if value:
+                self._objects[name][index] = value
+            else:
+                self._objects[name].pop(index, None)
+        elif kind == COLUMN_STRING:
+            self._columns[name][index] = self._encode(name, value)
+        elif kind == COLUMN_OPTIONAL_INT:
+            self._columns[name][index] = NULL_INT if value is None else value
+        else:
+            self._columns[name][index] = value
+
+    def _check_index(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("Indice de ligne hors limites")
+        return index
+
+    def get_value(self, index: int, name: str):
+        """Valeur d'un champ d'une ligne (type Python d'origine)"""
+        kind = self._kinds[name]
+        if kind == COLUMN_OBJECT:
+            objects = self._objects[name]
+            value = objects.get(index)
+            if value is None:
+                # Liste/dictionnaire vide créé au premier accès, pour rester modifiable
+                value = objects[index] = self._default(name)
+            return value
+
+        value = self._columns[name][index]
+        if kind == COLUMN_STRING:
+            return self._categories[name][value]
+        if kind == COLUMN_OPTIONAL_INT:
+            return None if value == NULL_INT else int(value)
+        return value.item()
+
+    def set_value(self, index: int, name: str, value):
+        """Modifie un champ d'une ligne"""
+        if name not in self._fields:
+            raise AttributeError(f"{self.row_class.__name__} n'a pas de champ '{name}'")
+        self._store(self._check_index(index), name, value)
+
+    def row_values(self, index: int) -> Dict[str, Any]:
+        """Dictionnaire {champ: valeur} d'une ligne"""
+        index = self._check_index(index)
+        values = {}
+        for name, kind in self._kinds.items():
+            if kind == COLUMN_OBJECT:
+                # Lecture sans créer de liste vide pour la ligne
+                value = self._objects[name].get(index)
+                values[name] = value if value is not None else self._default(name)
+            else:
+                values[name] = self.get_value(index, name)
+        return values
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Toutes les lignes sous forme de dictionnaires"""
+        return list(self.iter_records())
+
+    def iter_records(self, names: Optional[Iterable[str]] = None,
+                     batch_size: int = RECORD_BATCH) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt les lignes sous forme de dictionnaires, par tranches de colonnes
+
+        Seule une tranche de batch_size lignes est convertie à la fois: la
+        mémoire utilisée ne dépend pas de la taille de la table.
+
+        Args:
+            names: Champs à inclure (tous par défaut), dans cet ordre
+            batch_size: Nombre de lignes converties par tranche
+        """
+        names = list(names) if names is not None else list(self._fields)
+        for name in names:
+            if name not in self._fields:
+                raise KeyError(f"{self.row_class.__name__} n'a pas de champ '{name}'")
+
+        for start in range(0, self._size, batch_size):
+            end = min(start + batch_size, self._size)
+            columns = []
+            for name in names:
+                kind = self._kinds[name]
+                if kind == COLUMN_OBJECT:
+                    objects = self._objects[name]
+                    values = [objects.get(index) for index in range(start, end)]
+                    values = [value if value is not None else self._default(name)
+                              for value in values]
+                else:
+                    values = self._columns[name][start:end].tolist()
+                    if kind == COLUMN_STRING:
+                        categories = self._categories[name]
+                        values = [categories[code] for code in values]
+                    elif kind == COLUMN_OPTIONAL_INT:
+                        values = [None if value == NULL_INT else value for value in values]
+                columns.append(values)
+
+            for values in zip(*columns):
+                yield dict(zip(names, values))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __iter__(self) -> Iterator[EntityRow]:
+        row_type = self._row_type
+        for index in range(self._size):
+            yield row_type(self, index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row_type(self, i) for i in range(*index.indices(self._size))]
+        return self._row_type(self, self._check_index(index))
+
+    def __repr__(self) -> str:
+        return f"EntityTable({self.row_class.__name__}, {self._size} lignes)"
+
+    # -- Accès par colonne -------------------------------------------------
+
+    @property
+    def field_names(self) -> List[str]:
+        return list(self._fields)
+
+    def column_kind(self, name: str) -> str:
+        """Nature de la colonne d'un champ (COLUMN_INT, COLUMN_STRING...)"""
+        return self._kinds[name]
+
+    def objects(self, name: str) -> Dict[int, Any]:
+        """Valeurs non vides d'un champ liste/dict, par position de ligne"""
+        return self._objects[name]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Colonne d'un champ numérique ou texte (vue, sans copie)
+
+        Les champs texte renvoient leurs codes; voir categories().
+        """
+        if name not in self._columns:
+            raise KeyError(f"Pas de colonne NumPy pour '{name}'")
+        return self._columns[name][:self._size]
+
+    def categories(self, name: str) -> List[str]:
+        """Valeurs distinctes d'un champ texte, indexées par code"""
+        return self._categories[name]
+
+    def decoded(self, name: str) -> np.ndarray:
+        """Colonne texte décodée (tableau d'objets str)"""
+        categories = np.array(self._categories[name] or [''], dtype=object)
+        return categories[self.column(name)]
+
+    def mask(self, **conditions) -> np.ndarray:
+        """
+        Masque booléen des lignes dont les champs valent les valeurs données
+
+        Une valeur peut être une liste/un ensemble (appartenance), pour les
+        champs texte comme numériques.
+
+        Exemple: vehicles.mask(vehicle_type='train', line_id=None)
+        """
+        result = np.ones(self._size, dtype=bool)
+        for name, expected in conditions.items():
+            kind = self._kinds.get(name)
+            if kind is None or kind == COLUMN_OBJECT:
+                raise KeyError(f"Filtre impossible sur '{name}'")
+            column = self.column(name)
+            many = isinstance(expected, (list, tuple, set, frozenset))
+            values = list(expected) if many else [expected]
+
+            if kind == COLUMN_STRING:
+                codes = self._codes[name]
+                values = [codes[value] for value in values if value in codes]
+            elif kind == COLUMN_OPTIONAL_INT:
+                values = [NULL_INT if value is None else value for value in values]
+
+            if len(values) == 1:
+                result &= column == values[0]
+            else:
+                result &= np.isin(column, values)
+        return result
+
+    def indices(self, mask: np.ndarray) -> np.ndarray:
+        """Positions des lignes sélectionnées par un masque"""
+        return np.flatnonzero(mask)
+
+    def rows(self, selection) -> List[EntityRow]:
+        """Vues sur les lignes d'un masque booléen ou d'un tableau de positions"""
+        selection = np.asarray(selection)
+        if selection.dtype == bool:
+            selection = np.flatnonzero(selection)
+        return [self._row_type(self, int(index)) for index in selection]
+
+    def where(self, **conditions) -> List[EntityRow]:
+        """Lignes qui vérifient les conditions de mask()"""
+        return self.rows(self.mask(**conditions))
+
+    def _numeric(self, name: str, mask: Optional[np.ndarray]) -> np.ndarray:
+        if self._kinds.get(name) not in (COLUMN_INT, COLUMN_FLOAT, COLUMN_OPTIONAL_INT):
+            raise KeyError(f"'{name}' n'est pas un champ numérique")
+        column = self.column(name)
+        if mask is not None:
+            column = column[mask]
+        if self._kinds[name] == COLUMN_OPTIONAL_INT:
+            column = column[column != NULL_INT]
+        return column
+
+    def sum(self, name: str, mask: Optional[np.ndarray] = None):
+        """Somme d'un champ numérique (sur les lignes du masque)"""
+        return self._numeric(name, mask).sum().item()
+
+    def mean(self, name: str, mask: Optional[np.ndarray] = None) -> Optional[float]:
+        """Moyenne d'un champ numérique, None si aucune ligne"""
+        column = self._numeric(name, mask)
+        return float(column.mean()) if len(column) else None
+
+    def value_counts(self, name: str, mask: Optional[np.ndarray] = None) -> Dict[Any, int]:
+        """Nombre de lignes par valeur d'un champ texte ou entier"""
+        column = self.column(name)
+        if mask is not None:
+            column = column[mask]
+        values, counts = np.unique(column, return_counts=True)
+        if self._kinds[name] == COLUMN_STRING:
+            categories = self._categories[name]
+            return {categories[value]: int(count) for value, count in zip(values, counts)}
+        return {value.item(): int(count) for value, count in zip(values, counts)}
+
+    def group_sum(self, by: str, name: str, mask: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """Somme d'un champ numérique par valeur d'un champ texte (ex. coûts par type)"""
+        if self._kinds.get(by) != COLUMN_STRING:
+            raise KeyError(f"'{by}' n'est pas un champ texte")
+        codes = self.column(by)
+        values = self.column(name)
+        if mask is not None:
+            codes, values = codes[mask], values[mask]
+        size = len(self._categories[by])
+        totals = np.bincount(codes, weights=values, minlength=size)
+        present = np.bincount(codes, minlength=size) > 0
+        return {
+            category: totals[code].item()
+            for code, category in enumerate(self._categories[by])
+            if present[code]
+        }
+
+    def nbytes(self) -> int:
+        """Mémoire occupée par les colonnes NumPy (capacité réservée comprise)"""
+        return sum(column.nbytes for column in self._columns.values())
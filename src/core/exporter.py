@@ -0,0 +1,185 @@
+"""
+Export en flux d'une sauvegarde (JSON ou NDJSON)
+
+Les entités sont parcourues paresseusement (EntityTable.iter_records pour
+les tables en colonnes) et écrites par lots dans un fichier tamponné: la
+mémoire utilisée ne dépend pas du nombre d'entités.
+
+- JSON: un objet; les champs simples de GameSave, puis chaque section
+  (villes, véhicules...) sous forme de tableau, une ligne par tranche
+  de WRITE_BATCH entités
+- NDJSON: une ligne par entité, avec une clé "section"; la première ligne
+  ("section": "save") contient les champs simples de GameSave
+"""
+
+import json
+from dataclasses import fields
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Sequence, TextIO, Union
+from .compact import EmptyView
+from .data_models import GameSave
+from .entity_table import EntityTable
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EXPORT_JSON = 'json'
+EXPORT_NDJSON = 'ndjson'
+EXPORT_FORMATS = (EXPORT_JSON, EXPORT_NDJSON)
+
+# Sections exportées entité par entité
+SECTIONS = ('cities', 'vehicles', 'industries', 'lines')
+
+# Tampon du fichier et nombre de lignes écrites par appel à write()
+WRITE_BUFFER = 1024 * 1024
+WRITE_BATCH = 1024
+
+# Sélection de champs: une liste pour toutes les sections ou {section: liste}
+FieldSelection = Optional[Union[Sequence[str], Mapping[str, Sequence[str]]]]
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str)
+
+def _section_fields(selection: FieldSelection, section: str, available: Sequence[str]):
+    """Champs exportés d'une section (None: tous)"""
+    if selection is None:
+        return None
+    if isinstance(selection, Mapping):
+        names = selection.get(section)
+        return list(names) if names is not None else None
+    # Liste commune: on ne garde que les champs présents dans la section
+    return [name for name in selection if name in available]
+
+def _plain(value):
+    """Conteneur vide partagé (EmptyView) -> liste/dict ordinaire"""
+    return value.copy() if isinstance(value, EmptyView) else value
+
+def iter_section(entities, names: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Parcourt une section sous forme de dictionnaires
+
+    Args:
+        entities: EntityTable ou liste de dataclasses (ex. TransportLine)
+        names: Champs à inclure (tous par défaut)
+    """
+    if isinstance(entities, EntityTable):
+        yield from entities.iter_records(names)
+        return
+
+    for entity in entities:
+        entity_names = names if names is not None else [spec.name for spec in fields(entity)]
+        yield {name: _plain(getattr(entity, name)) for name in entity_names}
+
+def _available_fields(entities) -> Sequence[str]:
+    if isinstance(entities, EntityTable):
+        return entities.field_names
+    for entity in entities:
+        return [spec.name for spec in fields(entity)]
+    return []
+
+def save_header(save: GameSave) -> Dict[str, Any]:
+    """Champs simples de la sauvegarde (hors sections)"""
+    return {
+        spec.name: getattr(save, spec.name)
+        for spec in fields(save)
+        if spec.name not in SECTIONS
+    }
+
+def _write_lines(out: TextIO, lines: Iterable[str], separator: str) -> int:
+    """Écrit les lignes par lots; retourne leur nombre"""
+    count = 0
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= WRITE_BATCH:
+            out.write((separator if count else '') + separator.join(batch))
+            count += len(batch)
+            batch.clear()
+    if batch:
+        out.write((separator if count else '') + separator.join(batch))
+        count += len(batch)
+    return count
+
+def _write_chunks(out: TextIO, records: Iterator[Dict[str, Any]]) -> int:
+    """
+    Écrit les éléments d'un tableau JSON par tranches de WRITE_BATCH
+
+    Chaque tranche est encodée en un seul appel (une ligne par tranche).
+
+    Returns:
+        Nombre d'éléments écrits
+    """
+    count = 0
+    while True:
+        chunk = list(islice(records, WRITE_BATCH))
+        if not chunk:
+            return count
+        out.write((',\n' if count else '') + _encoder.encode(chunk)[1:-1])
+        count += len(chunk)
+
+def write_ndjson(save: GameSave, out: TextIO, selection: FieldSelection = None) -> int:
+    """
+    Écrit la sauvegarde en NDJSON dans un fichier texte ouvert
+
+    Returns:
+        Nombre d'entités écrites
+    """
+    encode = _encoder.encode
+    out.write(encode({'section': 'save', **save_header(save)}) + '\n')
+
+    total = 0
+    for section in SECTIONS:
+        entities = getattr(save, section)
+        names = _section_fields(selection, section, _available_fields(entities))
+        prefix = {'section': section}
+        lines = (encode({**prefix, **record}) for record in iter_section(entities, names))
+        count = _write_lines(out, lines, '\n')
+        if count:
+            out.write('\n')
+        total += count
+    return total
+
+def write_json(save: GameSave, out: TextIO, selection: FieldSelection = None) -> int:
+    """
+    Écrit la sauvegarde en JSON (sections en tableaux écrits par tranches)
+
+    Returns:
+        Nombre d'entités écrites
+    """
+    encode = _encoder.encode
+    header = save_header(save)
+    out.write('{\n')
+    out.write(',\n'.join(f"{encode(key)}: {encode(value)}" for key, value in header.items()))
+
+    total = 0
+    for section in SECTIONS:
+        entities = getattr(save, section)
+        names = _section_fields(selection, section, _available_fields(entities))
+        out.write(f",\n{encode(section)}: [\n")
+        total += _write_chunks(out, iter_section(entities, names))
+        out.write('\n]')
+    out.write('\n}\n')
+    return total
+
+def export_save(save: GameSave, filepath: str, export_format: str = EXPORT_JSON,
+                selection: FieldSelection = None) -> int:
+    """
+    Exporte une sauvegarde dans un fichier, en flux
+
+    Args:
+        save: Sauvegarde à exporter
+        filepath: Fichier de destination
+        export_format: EXPORT_JSON ou EXPORT_NDJSON
+        selection: Champs exportés par entité (liste commune ou {section: liste})
+
+    Returns:
+        Nombre d'entités écrites
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu: {export_format}")
+
+    writer = write_ndjson if export_format == EXPORT_NDJSON else write_json
+    with open(filepath, 'w', encoding='utf-8', buffering=WRITE_BUFFER) as out:
+        count = writer(save, out, selection)
+
+    logger.info(f"Export {export_format.upper()}: {filepath} ({count} entités)")
+    return count
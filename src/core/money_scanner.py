@@ -0,0 +1,177 @@
+"""
+Recherche vectorisée des candidats pour la valeur de l'argent
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+import numpy as np
+
+# Bornes par défaut d'une valeur d'argent plausible
+MIN_MONEY = -1000000
+MAX_MONEY = 10000000000
+
+# Nombre de mots int64 traités par bloc (limite les tableaux temporaires)
+BLOCK_WORDS = 1 << 16
+
+_UINT64_MASK = (1 << 64) - 1
+
+
+@dataclass
+class MoneyCandidate:
+    """Emplacement possible de l'argent dans la sauvegarde"""
+    offset: int
+    value: int
+    score: float
+
+
+def scan_money_candidates(data, min_value: int = MIN_MONEY, max_value: int = MAX_MONEY,
+                          top_k: Optional[int] = 50,
+                          progress: Optional[Callable[[int], None]] = None,
+                          cancel: Optional[Callable[[], bool]] = None) -> List[MoneyCandidate]:
+    """
+    Cherche toutes les valeurs int64 little-endian plausibles pour l'argent
+
+    Le buffer est vu comme un tableau int64 pour chacun des 8 alignements
+    possibles (sans copie); les tests de plage et de voisinage sont appliqués
+    sous forme de masques vectoriels. Les alignements sont traités en
+    parallèle (numpy libère le GIL).
+
+    Args:
+        data: Buffer source (bytes, bytearray, mmap...)
+        min_value: Borne basse exclue
+        max_value: Borne haute exclue
+        top_k: Nombre de candidats à retourner (None pour tous)
+        progress: Appelé avec le pourcentage d'avancement
+        cancel: Retourne True pour interrompre l'analyse (résultat vide)
+
+    Returns:
+        Candidats triés par score décroissant puis par offset
+    """
+    done = [0]
+    lock = threading.Lock()
+
+    def scan(alignment):
+        part = _scan_alignment(data, alignment, min_value, max_value, cancel)
+        if progress is not None:
+            with lock:
+                done[0] += 1
+                progress(done[0] * 100 // 8)
+        return part
+
+    workers = min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        parts = list(executor.map(scan, range(8)))
+
+    if cancel is not None and cancel():
+        return []
+
+    parts = [part for part in parts if part is not None]
+    if not parts:
+        return []
+
+    offsets = np.concatenate([part[0] for part in parts])
+    values = np.concatenate([part[1] for part in parts])
+    scores = np.concatenate([part[2] for part in parts])
+
+    # Sélection partielle avant le tri complet
+    if top_k is not None and top_k < len(scores):
+        selected = np.argpartition(-scores, top_k - 1)[:top_k]
+        offsets, values, scores = offsets[selected], values[selected], scores[selected]
+
+    order = np.lexsort((offsets, -scores))
+    return [
+        MoneyCandidate(int(offsets[i]), int(values[i]), float(scores[i]))
+        for i in order
+    ]
+
+
+def _scan_alignment(data, alignment: int, min_value: int, max_value: int, cancel=None):
+    """Analyse les mots int64 commençant à alignment modulo 8"""
+    total = (len(data) - alignment) // 8
+    if total <= 0:
+        return None
+
+    # Test de plage en une seule comparaison non signée
+    low = np.uint64((min_value + 1) & _UINT64_MASK)
+    span = np.uint64(max_value - min_value - 1)
+    shifted = np.empty(BLOCK_WORDS, dtype=np.uint64)
+    in_range = np.empty(BLOCK_WORDS, dtype=bool)
+
+    offsets_parts = []
+    values_parts = []
+    scores_parts = []
+
+    for first in range(0, total, BLOCK_WORDS):
+        if cancel is not None and cancel():
+            return None
+
+        # Un mot de recouvrement de chaque côté pour les tests de voisinage
+        lo = max(first - 1, 0)
+        hi = min(first + BLOCK_WORDS + 1, total)
+        words = np.frombuffer(data, dtype='<i8', count=hi - lo, offset=alignment + 8 * lo)
+        start = first - lo
+        count = min(BLOCK_WORDS, total - first)
+
+        np.subtract(words[start:start + count].view(np.uint64), low, out=shifted[:count])
+        np.less(shifted[:count], span, out=in_range[:count])
+        if not in_range[:count].any():
+            continue
+
+        idx = np.flatnonzero(in_range[:count]) + start
+        values = words[idx]
+
+        has_next = idx + 1 < len(words)
+        next_values = words[np.minimum(idx + 1, len(words) - 1)]
+        has_prev = idx > 0
+        prev_values = words[np.maximum(idx - 1, 0)]
+
+        # Zéro et les valeurs répétées (remplissage) ne sont pas retenus
+        keep = (values != 0) & (~has_next | (next_values != values))
+        idx = idx[keep]
+        values = values[keep]
+
+        offsets_parts.append(alignment + 8 * (lo + idx.astype(np.int64)))
+        values_parts.append(values)
+        scores_parts.append(_score(
+            alignment, values,
+            has_prev[keep], prev_values[keep],
+            has_next[keep], next_values[keep]
+        ))
+
+    if not offsets_parts:
+        return None
+
+    return (
+        np.concatenate(offsets_parts),
+        np.concatenate(values_parts),
+        np.concatenate(scores_parts)
+    )
+
+
+def _score(alignment, values, has_prev, prev_values, has_next, next_values):
+    """Calcule le score de contexte de chaque candidat"""
+    scores = np.ones(len(values), dtype=np.float32)
+
+    # Les champs int64 sont normalement alignés
+    if alignment == 0:
+        scores += 2.0
+    elif alignment == 4:
+        scores += 1.0
+
+    # Valeur isolée (pas de répétition avant)
+    scores += (has_prev & (prev_values != values)).astype(np.float32)
+
+    # Montants réalistes
+    scores += (np.abs(values) >= 1000).astype(np.float32)
+    scores += 0.5 * (values > 0)
+    scores += 0.25 * (values % 100 == 0)
+
+    # Voisins qui ressemblent eux-mêmes à des champs entiers bien formés
+    well_formed = 1 << 32
+    scores += 0.5 * (has_prev & (np.abs(prev_values) < well_formed))
+    scores += 0.5 * (has_next & (np.abs(next_values) < well_formed))
+
+    return scores
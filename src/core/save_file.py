@@ -2,105 +2,483 @@
 Lecture et écriture des fichiers de sauvegarde .save
 """
 
+import os
+import mmap
 import struct
-import zlib
-import json
 from pathlib import Path
-from typing import BinaryIO, Optional
-from dataclasses import asdict
-from .data_models import GameSave, City, Vehicle, Industry
+from datetime import datetime
+from typing import Callable, List, Optional, Union
+from .data_models import GameSave
+from .dirty_ranges import DirtyRanges
+from .schema import Schema
+from .compression import (
+    CompressedLayout, find_zlib_stream, inflate_to_mapping, inflate_file,
+    load_chunk_map, save_chunk_map, write_compressed
+)
+from utils.config import load_config
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Modes de chargement des fichiers
+LOAD_MODE_MEMORY = 'memory'      # Copie complète en mémoire (bytearray)
+LOAD_MODE_READONLY = 'readonly'  # mmap en lecture seule (visualisation)
+LOAD_MODE_COW = 'cow'            # mmap copy-on-write (édition)
+LOAD_MODES = (LOAD_MODE_MEMORY, LOAD_MODE_READONLY, LOAD_MODE_COW)
+
+# Taille des lectures en mode mémoire (progression et annulation)
+READ_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Noms des champs de config.json qui correspondent à une entrée existante
+CONFIG_OFFSET_ALIASES = {'money': 'money_offset'}
+
+# Rappel de progression: (étape, pourcentage)
+ProgressCallback = Callable[[str, int], None]
+
+# Rappel d'aperçu: premiers octets décompressés, avant la fin du chargement
+PreviewCallback = Callable[[bytes], None]
+
+class LoadCancelled(Exception):
+    """Le chargement a été annulé"""
+
 class SaveFileManager:
     """Gère les opérations sur les fichiers de sauvegarde"""
     
     def __init__(self):
         self.current_save: Optional[GameSave] = None
-        self.raw_data: Optional[bytearray] = None
+        self.raw_data: Optional[Union[bytearray, mmap.mmap]] = None
+        self.filepath: Optional[str] = None
+        self.load_mode = LOAD_MODE_COW
+        self.money_candidates: List['MoneyCandidate'] = []
+        self.search_index = None
         
-        # Offsets connus (à découvrir et compléter)
+        # Organisation du fichier s'il est compressé (raw_data est alors décompressé)
+        self.compression: Optional[CompressedLayout] = None
+        
+        # Plages modifiées par rapport au fichier chargé
+        self.dirty_ranges = DirtyRanges()
+        
+        # Offsets connus (à découvrir et compléter), complétés par config.json
         self.known_offsets = {
             'file_header': {'offset': 0x00, 'size': 4, 'description': 'En-tête fichier'},
-            'game_version': {'offset': 0x10, 'size': 32, 'description': 'Version jeu'},
+            'game_version': {'offset': 0x10, 'size': 32, 'type': 'string', 'description': 'Version jeu'},
             'money_offset': {'offset': 0x1234, 'size': 8, 'type': '<q', 'description': 'Argent'},
             'map_size': {'offset': 0x200, 'size': 8, 'type': '<II', 'description': 'Taille carte'},
         }
+        self.known_offsets.update(self._config_offsets())
+        self._schema: Optional[Schema] = None
+    
+    @staticmethod
+    def _config_offsets():
+        """Offsets déclarés dans config.json (game.known_offsets)"""
+        table = load_config().get('game', {}).get('known_offsets', {})
+        return {
+            CONFIG_OFFSET_ALIASES.get(name, name): dict(info)
+            for name, info in table.items()
+        }
+    
+    @property
+    def schema(self) -> Schema:
+        """Accesseurs compilés de known_offsets (recompilés après modification)"""
+        if self._schema is None:
+            self._schema = Schema.compile(self.known_offsets)
+        return self._schema
+    
+    def invalidate_schema(self):
+        """À appeler après toute modification de known_offsets"""
+        self._schema = None
     
-    def load_save_file(self, filepath: str) -> Optional[GameSave]:
-        """Charge un fichier de sauvegarde"""
+    def get_field(self, name: str):
+        """Lit un champ connu dans raw_data (valeur typée)"""
+        return self.schema.read(self.raw_data, name)
+    
+    def set_field(self, name: str, value):
+        """
+        Écrit un champ connu dans raw_data (plage marquée comme modifiée)
+        
+        Raises:
+            ValueError: si l'offset du champ est hors du fichier
+        """
+        spec = self.schema.fields[name]
+        if not self._field_in_buffer(name):
+            raise ValueError(f"Champ {name} hors du fichier: 0x{spec.offset:08X} "
+                             f"(+{spec.size}, fichier de {len(self.raw_data or b'')} octets)")
+        self.write_bytes(spec.offset, self.schema.encode(name, value))
+        if name == 'money_offset' and self.current_save:
+            self.current_save.money = value
+    
+    def _field_in_buffer(self, name: str) -> bool:
+        spec = self.schema.fields.get(name)
+        return (spec is not None and self.raw_data is not None
+                and spec.offset >= 0 and spec.offset + spec.size <= len(self.raw_data))
+    
+    def has_money_offset(self) -> bool:
+        """True si l'offset de l'argent (config ou choisi par l'utilisateur) est dans le fichier"""
+        return self._field_in_buffer('money_offset')
+    
+    def read_fields(self, names=None):
+        """Lit tous les champs connus (ou names) en une passe"""
+        return self.schema.read_all(self.raw_data, names)
+    
+    def load_save_file(self, filepath: str, mode: str = LOAD_MODE_COW,
+                       progress: Optional[ProgressCallback] = None,
+                       cancel_event=None,
+                       preview: Optional[PreviewCallback] = None) -> Optional[GameSave]:
+        """
+        Charge un fichier de sauvegarde
+
+        Args:
+            filepath: Chemin du fichier .save
+            mode: Mode de chargement (LOAD_MODE_COW par défaut, LOAD_MODE_READONLY
+                  pour la simple visualisation, LOAD_MODE_MEMORY pour une copie
+                  complète en mémoire)
+            progress: Rappel (étape, pourcentage) pour les étapes 'read' et 'parse'
+            cancel_event: threading.Event qui interrompt le chargement
+            preview: Reçoit le début des données d'un fichier compressé dès
+                     qu'il est décompressé
+
+        Returns:
+            GameSave chargé ou None en cas d'erreur
+
+        Raises:
+            LoadCancelled: si cancel_event a été activé
+        """
+        data = None
         try:
-            logger.info(f"Chargement: {filepath}")
+            logger.info(f"Chargement: {filepath} (mode {mode})")
             
-            # Lecture du fichier binaire
-            with open(filepath, 'rb') as f:
-                self.raw_data = bytearray(f.read())
+            # Ouverture du fichier binaire (projection mémoire si possible)
+            stream_offset = find_zlib_stream(filepath) if os.path.getsize(filepath) else None
+            if stream_offset is None:
+                data = self._open_buffer(filepath, mode, progress, cancel_event)
+                layout = None
+            else:
+                data, layout = self._inflate_buffer(filepath, stream_offset, mode,
+                                                    progress, cancel_event, preview)
+            self._check_cancel(cancel_event)
+            
+            # Libérer l'ancienne projection seulement une fois la nouvelle prête
+            self.close()
+            self.raw_data = data
+            self.compression = layout
+            self.dirty_ranges.clear()
+            self.money_candidates = []
+            self.filepath = filepath
+            self.load_mode = mode
             
             # Création de l'objet GameSave
+            self._report(progress, 'parse', 0)
             self.current_save = self._parse_save_data(filepath)
             
             # Extraction basique des données
             self._extract_basic_info()
+            self._report(progress, 'parse', 100)
+            self._check_cancel(cancel_event)
             
             logger.info(f"Sauvegarde chargée: {len(self.raw_data)} octets")
             return self.current_save
             
+        except LoadCancelled:
+            logger.info(f"Chargement annulé: {filepath}")
+            if data is not None and self.raw_data is data:
+                self.close()
+            elif isinstance(data, mmap.mmap):
+                data.close()
+            raise
         except Exception as e:
             logger.error(f"Erreur chargement: {e}")
             return None
     
+    @staticmethod
+    def _report(progress: Optional[ProgressCallback], stage: str, percent: int):
+        if progress is not None:
+            progress(stage, percent)
+    
+    @staticmethod
+    def _check_cancel(cancel_event):
+        if cancel_event is not None and cancel_event.is_set():
+            raise LoadCancelled()
+    
+    def _open_buffer(self, filepath: str, mode: str,
+                     progress: Optional[ProgressCallback] = None,
+                     cancel_event=None) -> Union[bytearray, mmap.mmap]:
+        """
+        Ouvre le contenu du fichier selon le mode demandé
+        
+        En mode mmap, seules les pages réellement consultées sont lues depuis
+        le disque; en copy-on-write, les pages modifiées deviennent privées et
+        le fichier n'est jamais touché avant save_to_file.
+        """
+        if mode not in LOAD_MODES:
+            raise ValueError(f"Mode de chargement inconnu: {mode}")
+        
+        self._report(progress, 'read', 0)
+        with open(filepath, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            
+            if mode == LOAD_MODE_MEMORY:
+                # Lecture par blocs pour pouvoir suivre et annuler
+                data = bytearray(size)
+                with memoryview(data) as view:
+                    position = 0
+                    while position < size:
+                        self._check_cancel(cancel_event)
+                        read = f.readinto(view[position:position + READ_CHUNK_SIZE])
+                        if not read:
+                            break
+                        position += read
+                        self._report(progress, 'read', position * 100 // size)
+                return data
+            
+            # mmap refuse les fichiers vides
+            if size == 0:
+                return bytearray()
+            
+            access = mmap.ACCESS_READ if mode == LOAD_MODE_READONLY else mmap.ACCESS_COPY
+            data = mmap.mmap(f.fileno(), 0, access=access)
+        
+        self._report(progress, 'read', 100)
+        return data
+    
+    def _inflate_buffer(self, filepath: str, stream_offset: int, mode: str,
+                        progress: Optional[ProgressCallback] = None,
+                        cancel_event=None,
+                        preview: Optional[PreviewCallback] = None):
+        """
+        Décompresse un fichier compressé selon le mode demandé
+        
+        Hors mode mémoire, les données décompressées sont écrites dans un
+        fichier temporaire projeté en mémoire: seules les pages consultées ou
+        modifiées occupent de la mémoire.
+        
+        Returns:
+            (données décompressées, CompressedLayout)
+        """
+        if mode not in LOAD_MODES:
+            raise ValueError(f"Mode de chargement inconnu: {mode}")
+        
+        self._report(progress, 'read', 0)
+        report = lambda percent: self._report(progress, 'read', percent)
+        cancel = cancel_event.is_set if cancel_event is not None else None
+        
+        if mode == LOAD_MODE_MEMORY:
+            data = bytearray()
+            layout = inflate_file(filepath, stream_offset, data.extend, report, cancel, preview)
+            result = None if layout is None else (data, layout)
+        else:
+            # Le fichier temporaire est privé: pas besoin de copy-on-write
+            access = mmap.ACCESS_READ if mode == LOAD_MODE_READONLY else mmap.ACCESS_WRITE
+            result = inflate_to_mapping(filepath, stream_offset, access, report, cancel, preview)
+        
+        if result is None:
+            raise LoadCancelled()
+        
+        data, layout = result
+        if load_chunk_map(filepath, layout):
+            logger.debug(f"Carte des blocs compressés: {len(layout.segments)} bloc(s)")
+        self._report(progress, 'read', 100)
+        return data, layout
+    
+    @property
+    def is_read_only(self) -> bool:
+        """True si les données chargées ne peuvent pas être modifiées"""
+        return self.raw_data is not None and self.load_mode == LOAD_MODE_READONLY
+    
+    def is_mapped(self) -> bool:
+        """True si les données sont une projection mémoire du fichier"""
+        return isinstance(self.raw_data, mmap.mmap) and self.compression is None
+    
+    @property
+    def search_source_path(self) -> Optional[str]:
+        """Fichier relisible à la place de raw_data (None s'il est compressé)"""
+        return None if self.compression is not None else self.filepath
+    
+    def close(self):
+        """Libère les données chargées (et la projection mémoire éventuelle)"""
+        if self.search_index is not None:
+            self.search_index.close()
+            self.search_index = None
+        if isinstance(self.raw_data, mmap.mmap):
+            try:
+                self.raw_data.close()
+            except BufferError:
+                # Des vues (memoryview, numpy) existent encore: le GC s'en chargera
+                logger.debug("Projection mémoire encore référencée, fermeture différée")
+        self.raw_data = None
+        self.filepath = None
+        self.compression = None
+    
+    def _parse_save_data(self, filepath: str) -> GameSave:
+        """Crée l'objet GameSave à partir de l'en-tête du fichier"""
+        path = Path(filepath)
+        return GameSave(
+            filename=path.name,
+            filepath=str(path),
+            file_size=len(self.raw_data),
+            game_version=self._read_game_version(),
+            timestamp=datetime.fromtimestamp(path.stat().st_mtime)
+        )
+    
+    def _read_game_version(self) -> str:
+        """Lit la chaîne de version du jeu dans l'en-tête"""
+        try:
+            version = self.schema.read(self.raw_data, 'game_version')
+        except struct.error:
+            version = ""
+        return version.strip() or "Inconnue"
+    
     def _extract_basic_info(self):
-        """Extrait les informations de base du fichier"""
+        """Extrait les informations de base du fichier (tous les champs en une passe)"""
         if not self.current_save or not self.raw_data:
             return
         
-        # Tenter de lire l'argent si on connaît l'offset
-        try:
-            money_offset = self.known_offsets['money_offset']['offset']
-            money_data = self.raw_data[money_offset:money_offset+8]
-            self.current_save.money = struct.unpack('<q', money_data)[0]
+        self.current_save.bind_fields(self.get_field, self.set_field)
+        fields = self.read_fields()
+        
+        # Lire l'argent si son offset est dans le fichier; sinon la valeur
+        # affichée est celle du meilleur candidat (find_money_candidates),
+        # jamais écrite tant que set_money_offset n'a pas été appelé
+        if 'money_offset' in fields:
+            self.current_save.money = fields['money_offset']
             logger.info(f"Argent trouvé: {self.current_save.money}")
-        except:
-            # On cherche dynamiquement
-            self.current_save.money = self._find_money()
-    
-    def _find_money(self) -> int:
-        """Cherche automatiquement la valeur de l'argent"""
-        # Méthode 1: Cherche des valeurs qui ressemblent à de l'argent
-        patterns = [
-            (b'\x00\x00\x00\x00\x00\x00\x00\x00', 8),  # Zéro
-            (b'\xFF\xFF\xFF\xFF\xFF\xFF\xFF\xFF', 8),  # -1
-        ]
-        
-        for i in range(0, len(self.raw_data) - 8, 8):
-            chunk = bytes(self.raw_data[i:i+8])
-            # Vérifie si c'est un nombre raisonnable (entre -1M et 10B)
-            try:
-                value = struct.unpack('<q', chunk)[0]
-                if -1000000 < value < 10000000000:
-                    # Vérifie que les 8 octets suivants sont différents
-                    next_chunk = bytes(self.raw_data[i+8:i+16])
-                    if chunk != next_chunk:
-                        logger.debug(f"Candidat argent à 0x{i:08X}: {value}")
-                        return value
-            except:
-                continue
-        
-        return 0
+        else:
+            self.current_save.money = self._guess_money()
+    
+    def _guess_money(self) -> int:
+        """Valeur du meilleur candidat déjà trouvé (0 si l'analyse n'a pas eu lieu)"""
+        if not self.money_candidates:
+            return 0
+        best = self.money_candidates[0]
+        logger.debug(f"Candidat argent à 0x{best.offset:08X}: {best.value} (score {best.score:.2f})")
+        return best.value
+    
+    def find_money_candidates(self, top_k: Optional[int] = 50,
+                              progress: Optional[ProgressCallback] = None,
+                              cancel_event=None) -> List['MoneyCandidate']:
+        """
+        Liste les emplacements possibles de l'argent, du plus probable au moins probable
+        
+        Args:
+            top_k: Nombre de candidats à conserver (None pour tous)
+            progress: Rappel (étape 'scan', pourcentage)
+            cancel_event: threading.Event qui interrompt l'analyse
+            
+        Returns:
+            Liste de MoneyCandidate
+            
+        Raises:
+            LoadCancelled: si cancel_event a été activé
+        """
+        if not self.raw_data:
+            self.money_candidates = []
+            return self.money_candidates
+        
+        # Importé à la demande (numpy): hors du chemin de démarrage
+        from .money_scanner import scan_money_candidates
+        
+        candidates = scan_money_candidates(
+            self.raw_data,
+            top_k=top_k,
+            progress=(lambda percent: progress('scan', percent)) if progress else None,
+            cancel=cancel_event.is_set if cancel_event is not None else None
+        )
+        self._check_cancel(cancel_event)
+        
+        self.money_candidates = candidates
+        if self.current_save and not self.has_money_offset():
+            self.current_save.money = self._guess_money()
+        return self.money_candidates
+    
+    def set_money_offset(self, offset: int):
+        """Utilise un nouvel offset pour l'argent et relit sa valeur"""
+        self.known_offsets['money_offset']['offset'] = offset
+        self.invalidate_schema()
+        if self.current_save and self.raw_data:
+            self.current_save.money = self.get_field('money_offset')
+            logger.info(f"Offset argent: 0x{offset:08X} ({self.current_save.money})")
+    
+    def open_search_index(self):
+        """
+        Ouvre l'index de recherche existant de la sauvegarde, s'il est à jour
+        
+        Returns:
+            SearchIndex ou None
+        """
+        if not self.filepath or self.raw_data is None or self.dirty_ranges:
+            return None
+        
+        from .search_index import SearchIndex
+        self.search_index = SearchIndex.open(self.raw_data, self.filepath)
+        return self.search_index
+    
+    def build_search_index(self, progress: Optional[Callable[[int], None]] = None,
+                           cancel_event=None):
+        """
+        Construit (ou reconstruit) l'index de recherche à côté du fichier
+        
+        Les modifications non enregistrées sont exclues: l'index décrit le
+        fichier, elles sont recherchées directement dans les données.
+        
+        Returns:
+            SearchIndex construit
+            
+        Raises:
+            IndexBuildCancelled: si cancel_event a été activé
+        """
+        from .search_index import SearchIndex
+        
+        if self.compression is not None:
+            # L'index décrit les données décompressées
+            index = SearchIndex.build(self.raw_data, self.filepath, progress, cancel_event)
+        elif os.path.getsize(self.filepath) == 0:
+            index = SearchIndex.build(b'', self.filepath, progress, cancel_event)
+        else:
+            with open(self.filepath, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as file_data:
+                    index = SearchIndex.build(file_data, self.filepath, progress, cancel_event)
+        
+        if self.search_index is not None:
+            self.search_index.close()
+        self.search_index = index
+        return index
+    
+    def _update_search_index(self, ranges, filepath: str):
+        """Reporte dans l'index les plages qui viennent d'être écrites"""
+        if self.search_index is None:
+            return
+        
+        if not self.search_index.update(self.raw_data, ranges, os.stat(filepath).st_mtime_ns):
+            # Trop de modifications: l'index sera reconstruit à la demande
+            self.search_index.close()
+            self.search_index = None
     
     def save_to_file(self, filepath: str, backup: bool = True) -> bool:
         """Sauvegarde les modifications dans un fichier"""
         try:
-            if backup:
+            if backup and os.path.exists(filepath):
                 self._create_backup(filepath)
             
             # Appliquer les modifications à raw_data
             self._apply_changes()
             
             # Écrire le fichier
-            with open(filepath, 'wb') as f:
-                f.write(self.raw_data)
+            loaded_file = self._is_loaded_file(filepath)
+            if self.compression is not None:
+                # Seuls les blocs modifiés sont recompressés
+                self._write_compressed(filepath, loaded_file)
+            elif loaded_file and os.path.getsize(filepath) == len(self.raw_data):
+                # Même fichier, même taille: seules les plages modifiées sont écrites
+                self._write_dirty_ranges(filepath)
+            elif loaded_file and self.is_mapped():
+                # Ne jamais tronquer un fichier projeté en mémoire
+                self._write_replace(filepath)
+            else:
+                with open(filepath, 'wb') as f:
+                    f.write(self.raw_data)
+            
+            if loaded_file:
+                self._update_search_index(list(self.dirty_ranges), filepath)
+                self.dirty_ranges.clear()
             
             logger.info(f"Sauvegardé: {filepath}")
             return True
@@ -109,31 +487,134 @@ class SaveFileManager:
             logger.error(f"Erreur sauvegarde: {e}")
             return False
     
+    def _is_loaded_file(self, filepath: str) -> bool:
+        """True si filepath est le fichier actuellement chargé"""
+        if not self.filepath or not os.path.exists(filepath):
+            return False
+        return os.path.samefile(filepath, self.filepath)
+    
+    def _write_dirty_ranges(self, filepath: str):
+        """Écrit uniquement les plages modifiées, sur place, puis fsync"""
+        fd = os.open(filepath, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+        try:
+            with memoryview(self.raw_data) as view:
+                for start, end in self.dirty_ranges:
+                    chunk = view[start:end]
+                    written = 0
+                    while written < len(chunk):
+                        if hasattr(os, 'pwrite'):
+                            written += os.pwrite(fd, chunk[written:], start + written)
+                        else:
+                            os.lseek(fd, start + written, os.SEEK_SET)
+                            written += os.write(fd, chunk[written:])
+                    chunk.release()
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        
+        logger.info(f"Écriture partielle: {len(self.dirty_ranges)} plage(s), "
+                    f"{self.dirty_ranges.total_bytes()} octets")
+    
+    def _write_replace(self, filepath: str):
+        """Écrit le buffer complet dans un fichier temporaire puis le substitue"""
+        temp_path = f"{filepath}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(self.raw_data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+    
+    def _write_compressed(self, filepath: str, loaded_file: bool):
+        """Recompresse les données dans un fichier temporaire puis le substitue"""
+        temp_path = f"{filepath}.tmp"
+        with open(temp_path, 'wb') as f:
+            layout = write_compressed(self.compression, self.raw_data,
+                                      self.dirty_ranges, self.filepath, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+        
+        stat = os.stat(filepath)
+        layout.file_size = stat.st_size
+        layout.mtime_ns = stat.st_mtime_ns
+        save_chunk_map(filepath, layout)
+        if loaded_file:
+            self.compression = layout
+    
     def _create_backup(self, original_path: str):
-        """Crée une copie de sauvegarde"""
-        backup_path = f"{original_path}.backup_{int(time.time())}"
-        import shutil
-        shutil.copy2(original_path, backup_path)
+        """Crée une sauvegarde dédupliquée (seuls les blocs nouveaux sont écrits)"""
+        from utils.backup_manager import get_backup_manager
+        backup_manager = get_backup_manager()
+        backup_path = backup_manager.create_backup(original_path, "auto")
+        if backup_path is None:
+            raise OSError(f"Sauvegarde de sécurité impossible: {original_path}")
         logger.info(f"Backup créé: {backup_path}")
+        
+        # Les sauvegardes en trop sont supprimées hors du thread appelant
+        backup_manager.schedule_retention()
     
     def _apply_changes(self):
         """Applique toutes les modifications en attente"""
         if not self.current_save or not self.raw_data:
             return
         
-        # Mettre à jour l'argent
-        if 'money_offset' in self.known_offsets:
-            offset = self.known_offsets['money_offset']['offset']
-            money_bytes = struct.pack('<q', self.current_save.money)
-            self.raw_data[offset:offset+8] = money_bytes
+        # Mettre à jour l'argent (seulement à un offset connu, pas à un candidat)
+        spec = self.schema.fields.get('money_offset')
+        if spec is not None and self.has_money_offset():
+            offset = spec.offset
+            try:
+                money_bytes = self.schema.encode('money_offset', self.current_save.money)
+            except struct.error:
+                raise ValueError(f"Argent hors limites pour le champ "
+                                 f"({spec.accessor.format}): {self.current_save.money}")
+            if self.raw_data[offset:offset + len(money_bytes)] != money_bytes:
+                self.write_bytes(offset, money_bytes)
+        elif self.current_save.money != self._guess_money():
+            logger.warning("Argent non enregistré: offset inconnu (choisir un emplacement)")
     
-    def export_to_json(self, filepath: str):
-        """Exporte les données au format JSON (pour debug)"""
-        if not self.current_save:
-            return
+    def write_bytes(self, offset: int, data: bytes):
+        """
+        Écrit des octets dans raw_data et enregistre la plage modifiée
         
-        data = asdict(self.current_save)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, default=str)
+        Args:
+            offset: Position de départ
+            data: Octets à écrire (la taille du fichier ne change pas)
+        """
+        if self.is_read_only:
+            raise PermissionError("Sauvegarde ouverte en lecture seule")
+        if offset < 0 or offset + len(data) > len(self.raw_data):
+            raise ValueError(f"Écriture hors limites: 0x{offset:08X} (+{len(data)})")
         
-        logger.info(f"Export JSON: {filepath}")
+        self.raw_data[offset:offset + len(data)] = data
+        self.mark_dirty(offset, len(data))
+    
+    def mark_dirty(self, offset: int, length: int):
+        """Signale une modification faite directement dans raw_data (éditeurs)"""
+        self.dirty_ranges.add(offset, length)
+    
+    def export_to_json(self, filepath: str, selection=None):
+        """
+        Exporte les données au format JSON (en flux, sans copie du modèle)
+        
+        Args:
+            filepath: Fichier de destination
+            selection: Champs exportés par entité (liste commune ou {section: liste})
+        """
+        if not self.current_save:
+            return
+        from .exporter import EXPORT_JSON, export_save
+        export_save(self.current_save, filepath, EXPORT_JSON, selection)
+    
+    def export_to_ndjson(self, filepath: str, selection=None):
+        """Exporte les données au format NDJSON (une entité par ligne)"""
+        if not self.current_save:
+            return
+        from .exporter import EXPORT_NDJSON, export_save
+        export_save(self.current_save, filepath, EXPORT_NDJSON, selection)
+    
+    def export_to_columns(self, filepath: str):
+        """Exporte les tables d'entités en colonnes binaires (.npz projetable)"""
+        if not self.current_save:
+            return
+        from .columnar import export_columnar
+        export_columnar(self.current_save, filepath)
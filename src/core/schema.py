@@ -0,0 +1,196 @@
+"""
+Schéma compilé des champs connus d'une sauvegarde
+
+La table des offsets (SaveFileManager.known_offsets, config.json) est
+compilée une fois en struct.Struct: un accesseur par champ pour les lectures
+et écritures unitaires, et un Struct par groupe de champs voisins pour lire
+tous les champs d'un coup avec unpack_from.
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Types symboliques -> code struct (little-endian)
+TYPE_CODES = {
+    'int8': 'b', 'uint8': 'B',
+    'int16': 'h', 'uint16': 'H',
+    'int32': 'i', 'uint32': 'I',
+    'int64': 'q', 'uint64': 'Q',
+    'float': 'f', 'double': 'd',
+}
+
+# Écart maximal (en octets) entre deux champs lus par le même Struct
+GROUP_GAP = 4096
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """Description compilée d'un champ"""
+    name: str
+    offset: int
+    kind: str           # 'scalar', 'tuple', 'string' ou 'bytes'
+    accessor: struct.Struct
+    description: str = ""
+
+    @property
+    def size(self) -> int:
+        return self.accessor.size
+
+def _field_format(info: Mapping[str, Any]) -> Tuple[str, str]:
+    """Retourne (format struct sans boutisme, nature du champ) d'une entrée de la table"""
+    field_type = info.get('type')
+    size = int(info.get('size', 0))
+
+    if field_type in TYPE_CODES:
+        return TYPE_CODES[field_type], 'scalar'
+    if field_type == 'string':
+        return f"{size}s", 'string'
+    if field_type is None or field_type == 'bytes':
+        return f"{size}s", 'bytes'
+
+    # Format struct brut, ex. '<q' ou '<II'
+    code = field_type.lstrip('<>=!@')
+    if field_type[:1] in ('>', '!'):
+        raise ValueError(f"Boutisme non supporté: {field_type}")
+    count = struct.calcsize('<' + code)
+    items = len(struct.unpack('<' + code, bytes(count)))
+    return code, 'scalar' if items == 1 else 'tuple'
+
+class Schema:
+    """Accesseurs struct précompilés pour un ensemble de champs"""
+
+    def __init__(self, fields: Iterable[FieldSpec]):
+        self.fields: Dict[str, FieldSpec] = {spec.name: spec for spec in fields}
+        self._groups = self._compile_groups()
+
+    @classmethod
+    def compile(cls, table: Mapping[str, Mapping[str, Any]]) -> 'Schema':
+        """
+        Compile une table {nom: {'offset', 'size', 'type', 'description'}}
+
+        Args:
+            table: Table des offsets (format de known_offsets / config.json)
+        """
+        fields = []
+        for name, info in table.items():
+            code, kind = _field_format(info)
+            fields.append(FieldSpec(
+                name=name,
+                offset=int(info['offset']),
+                kind=kind,
+                accessor=struct.Struct('<' + code),
+                description=info.get('description', "")
+            ))
+        return cls(fields)
+
+    def _compile_groups(self):
+        """Regroupe les champs voisins qui ne se chevauchent pas en un seul Struct"""
+        groups = []
+        current: List[FieldSpec] = []
+
+        def flush():
+            if not current:
+                return
+            start = current[0].offset
+            parts = []
+            position = start
+            layout = []
+            index = 0
+            for spec in current:
+                if spec.offset > position:
+                    parts.append(f"{spec.offset - position}x")
+                parts.append(spec.accessor.format.lstrip('<'))
+                count = 1 if spec.kind != 'tuple' else len(spec.accessor.unpack(bytes(spec.size)))
+                layout.append((spec.name, spec.kind, index, count))
+                index += count
+                position = spec.offset + spec.size
+            simple = all(kind in ('scalar', 'bytes') and count == 1 for _, kind, _, count in layout)
+            names = tuple(entry[0] for entry in layout) if simple else None
+            groups.append((start, struct.Struct('<' + ''.join(parts)), layout, names))
+            current.clear()
+
+        for spec in sorted(self.fields.values(), key=lambda spec: spec.offset):
+            if current:
+                end = current[-1].offset + current[-1].size
+                if spec.offset < end or spec.offset - end > GROUP_GAP:
+                    flush()
+            current.append(spec)
+        flush()
+        return groups
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.fields
+
+    def field_names(self) -> List[str]:
+        return list(self.fields)
+
+    @staticmethod
+    def _decode(spec: FieldSpec, value):
+        if spec.kind == 'string':
+            return value.split(b'\x00', 1)[0].decode('utf-8', errors='ignore')
+        return value
+
+    def read(self, buffer, name: str):
+        """Lit un champ (struct.error si le buffer est trop court)"""
+        spec = self.fields[name]
+        values = spec.accessor.unpack_from(buffer, spec.offset)
+        if spec.kind == 'tuple':
+            return values
+        return self._decode(spec, values[0])
+
+    def read_all(self, buffer, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Lit tous les champs en un unpack_from par groupe de champs voisins
+
+        Les groupes hors du buffer sont ignorés (champs absents du résultat).
+        """
+        result: Dict[str, Any] = {}
+        with memoryview(buffer) as view:
+            size = len(view)
+            for start, accessor, layout, group_names in self._groups:
+                if start + accessor.size > size:
+                    continue
+                values = accessor.unpack_from(view, start)
+                if group_names is not None:
+                    result.update(zip(group_names, values))
+                    continue
+                for name, kind, index, count in layout:
+                    if kind == 'tuple':
+                        result[name] = values[index:index + count]
+                    elif kind == 'string':
+                        result[name] = self._decode(self.fields[name], values[index])
+                    else:
+                        result[name] = values[index]
+
+        if names is not None:
+            return {name: result[name] for name in names if name in result}
+        return result
+
+    def encode(self, name: str, value) -> bytes:
+        """Convertit une valeur en octets selon le type du champ"""
+        spec = self.fields[name]
+        if spec.kind == 'tuple':
+            return spec.accessor.pack(*value)
+        if spec.kind == 'string' and isinstance(value, str):
+            value = value.encode('utf-8')
+        return spec.accessor.pack(value)
+
+    def write(self, buffer, name: str, value) -> Tuple[int, int]:
+        """
+        Écrit un champ dans un buffer modifiable
+
+        Returns:
+            Plage modifiée (offset, longueur)
+        """
+        spec = self.fields[name]
+        if spec.kind == 'tuple':
+            spec.accessor.pack_into(buffer, spec.offset, *value)
+        else:
+            if spec.kind == 'string' and isinstance(value, str):
+                value = value.encode('utf-8')
+            spec.accessor.pack_into(buffer, spec.offset, value)
+        return spec.offset, spec.size
+
+    def write_all(self, buffer, values: Mapping[str, Any]) -> List[Tuple[int, int]]:
+        """Écrit plusieurs champs; retourne les plages modifiées"""
+        return [self.write(buffer, name, value) for name, value in values.items()]
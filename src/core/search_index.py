@@ -0,0 +1,499 @@
+"""
+Index de recherche persistant (postings de 4-grammes) pour une sauvegarde
+
+L'index est stocké à côté de la sauvegarde (<fichier>.tsidx) et identifié par
+une empreinte BLAKE2b du contenu. Chaque position du fichier est rangée dans
+le seau de son 4-gramme (haché sur BUCKET_BITS bits); une recherche lit le
+seau le plus petit parmi les 4-grammes du motif puis vérifie les candidats.
+
+Les petites modifications ne reconstruisent pas l'index: les plages modifiées
+sont ajoutées à une liste de recouvrement, recherchée directement dans les
+données, et seules les empreintes des blocs touchés sont recalculées.
+"""
+
+import hashlib
+import os
+import struct
+import threading
+from typing import Callable, Iterable, List, Optional, Tuple
+import numpy as np
+from core.dirty_ranges import DirtyRanges
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_SUFFIX = '.tsidx'
+INDEX_MAGIC = b'TSIDX\x00\x00\x00'
+INDEX_VERSION = 1
+
+# Longueur des n-grammes indexés (les motifs plus courts sont cherchés par balayage)
+GRAM_SIZE = 4
+BUCKET_BITS = 20
+
+# Taille des blocs d'empreinte (mise à jour incrémentale de l'empreinte globale)
+DIGEST_BLOCK_SIZE = 1024 * 1024
+DIGEST_SIZE = 16
+
+# Taille des tranches traitées pendant la construction
+BUILD_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Mémoire de travail pour ranger les positions pendant la construction
+BUILD_MEMORY = 256 * 1024 * 1024
+
+# Au-delà, vérifier les candidats coûte plus cher qu'un balayage
+MAX_CANDIDATES = 1 << 22
+
+# Candidats vérifiés à la fois par find (arrêt à la première occurrence)
+FIND_BATCH = 4096
+
+# Recouvrement maximal avant qu'une reconstruction soit nécessaire
+MAX_OVERLAY_RANGES = 4096
+MIN_OVERLAY_BYTES = 1024 * 1024
+OVERLAY_RATIO = 0.01
+
+# magic, version, bits, taille des données, mtime_ns, taille de bloc, empreinte, nb recouvrements
+HEADER = struct.Struct('<8sIIQqQ16sQ')
+RANGE = struct.Struct('<QQ')
+
+_HASH_MULTIPLIER = np.uint32(0x9E3779B1)
+
+class IndexBuildCancelled(Exception):
+    """La construction de l'index a été annulée"""
+
+def index_path(filepath: str) -> str:
+    """Chemin de l'index associé à une sauvegarde"""
+    return filepath + INDEX_SUFFIX
+
+def _gram_keys(data, start: int, end: int) -> np.ndarray:
+    """Seaux des 4-grammes qui commencent dans [start, end)"""
+    view = np.frombuffer(data, dtype=np.uint8, count=end - start + GRAM_SIZE - 1, offset=start)
+    grams = view[:-3].astype(np.uint32) << 24
+    grams |= view[1:-2].astype(np.uint32) << 16
+    grams |= view[2:-1].astype(np.uint32) << 8
+    grams |= view[3:]
+    del view
+    grams *= _HASH_MULTIPLIER
+    grams >>= 32 - BUCKET_BITS
+    return grams
+
+def _pattern_keys(pattern: bytes) -> List[int]:
+    """Seaux des 4-grammes d'un motif (même hachage que _gram_keys)"""
+    keys = []
+    for j in range(len(pattern) - GRAM_SIZE + 1):
+        gram = int.from_bytes(pattern[j:j + GRAM_SIZE], 'big')
+        keys.append(((gram * 0x9E3779B1) & 0xFFFFFFFF) >> (32 - BUCKET_BITS))
+    return keys
+
+def _stable_order(keys: np.ndarray) -> np.ndarray:
+    """Tri stable par seau (deux passes de tri par base sur 16 bits)"""
+    order = np.argsort((keys & 0xFFFF).astype(np.uint16), kind='stable')
+    high = (keys[order] >> 16).astype(np.uint16)
+    return order[np.argsort(high, kind='stable')]
+
+def _partition_buckets(starts: np.ndarray, limit: int) -> List[Tuple[int, int]]:
+    """Découpe les seaux en groupes contigus d'au plus limit positions"""
+    partitions = []
+    low = 0
+    buckets = len(starts) - 1
+    while low < buckets:
+        high = int(np.searchsorted(starts, starts[low] + limit, side='right')) - 1
+        high = min(buckets, max(high, low + 1))
+        partitions.append((low, high))
+        low = high
+    return partitions
+
+def _block_digests(data, progress=None, cancel_event=None) -> bytearray:
+    """Empreintes des blocs de DIGEST_BLOCK_SIZE octets"""
+    digests = bytearray()
+    size = len(data)
+    with memoryview(data) as view:
+        for start in range(0, size, DIGEST_BLOCK_SIZE):
+            if cancel_event is not None and cancel_event.is_set():
+                raise IndexBuildCancelled()
+            digests += hashlib.blake2b(view[start:start + DIGEST_BLOCK_SIZE],
+                                       digest_size=DIGEST_SIZE).digest()
+            if progress:
+                progress(start * 100 // size)
+    return digests
+
+def _content_digest(block_digests: bytes) -> bytes:
+    return hashlib.blake2b(bytes(block_digests), digest_size=DIGEST_SIZE).digest()
+
+class SearchIndex:
+    """Index de 4-grammes projeté en mémoire depuis le fichier .tsidx"""
+
+    def __init__(self, path: str, data_size: int, mtime_ns: int, digest: bytes,
+                 block_digests: bytearray, overlay: DirtyRanges):
+        self.path = path
+        self.data_size = data_size
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+        self.block_digests = block_digests
+        self.overlay = overlay
+
+        buckets = 1 << BUCKET_BITS
+        self._digests_offset = HEADER.size
+        self._starts_offset = self._digests_offset + len(block_digests)
+        positions_offset = self._starts_offset + (buckets + 1) * 8
+        self._position_count = max(0, data_size - GRAM_SIZE + 1)
+        self._position_dtype = np.uint32 if data_size < (1 << 32) else np.uint64
+        self._overlay_offset = positions_offset + self._position_count * np.dtype(self._position_dtype).itemsize
+
+        self._starts = np.memmap(path, dtype='<u8', mode='r',
+                                 offset=self._starts_offset, shape=(buckets + 1,))
+        self._positions = np.memmap(path, dtype=self._position_dtype, mode='r',
+                                    offset=positions_offset,
+                                    shape=(self._position_count,)) if self._position_count else None
+
+    # ------------------------------------------------------------------
+    # Construction et ouverture
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, data, filepath: str,
+              progress: Optional[Callable[[int], None]] = None,
+              cancel_event: Optional[threading.Event] = None) -> 'SearchIndex':
+        """
+        Construit l'index de data et l'écrit à côté de filepath
+
+        Args:
+            data: Contenu actuel de la sauvegarde (identique au fichier)
+            filepath: Chemin de la sauvegarde
+            progress: Appelé avec un pourcentage
+            cancel_event: Événement qui interrompt la construction
+
+        Raises:
+            IndexBuildCancelled: si cancel_event a été activé
+        """
+        def report(percent):
+            if progress:
+                progress(percent)
+
+        def check_cancel():
+            if cancel_event is not None and cancel_event.is_set():
+                raise IndexBuildCancelled()
+
+        size = len(data)
+        count = max(0, size - GRAM_SIZE + 1)
+        buckets = 1 << BUCKET_BITS
+        dtype = np.uint32 if size < (1 << 32) else np.uint64
+        chunks = [(start, min(start + BUILD_CHUNK_SIZE, count))
+                  for start in range(0, count, BUILD_CHUNK_SIZE)]
+
+        block_digests = _block_digests(data, lambda p: report(p // 5), cancel_event)
+        digest = _content_digest(block_digests)
+
+        # Passe 1: taille de chaque seau
+        counts = np.zeros(buckets, dtype=np.uint64)
+        for number, (start, end) in enumerate(chunks):
+            check_cancel()
+            counts += np.bincount(_gram_keys(data, start, end), minlength=buckets).astype(np.uint64)
+            report(20 + number * 20 // len(chunks))
+
+        starts = np.zeros(buckets + 1, dtype='<u8')
+        np.cumsum(counts, out=starts[1:])
+
+        path = index_path(filepath)
+        temp_path = path + '.tmp'
+        positions_offset = HEADER.size + len(block_digests) + starts.nbytes
+        stat = os.stat(filepath)
+
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, BUCKET_BITS, size,
+                                    stat.st_mtime_ns, DIGEST_BLOCK_SIZE, digest, 0))
+                f.write(block_digests)
+                f.write(starts.tobytes())
+                f.truncate(positions_offset + count * np.dtype(dtype).itemsize)
+
+            # Passe 2: positions rangées par seau (chaque seau reste trié par position),
+            # en mémoire par groupes de seaux puis écrites séquentiellement
+            itemsize = np.dtype(dtype).itemsize
+            partitions = _partition_buckets(starts, BUILD_MEMORY // itemsize)
+            steps = max(1, len(partitions) * len(chunks))
+            step = 0
+            with open(temp_path, 'r+b') as f:
+                for low, high in partitions:
+                    base = int(starts[low])
+                    buffer = np.empty(int(starts[high]) - base, dtype=dtype)
+                    cursor = (starts[low:high] - base).astype(np.int64)
+                    for start, end in chunks:
+                        check_cancel()
+                        keys = _gram_keys(data, start, end)
+                        offsets = None
+                        if len(partitions) > 1:
+                            offsets = np.flatnonzero((keys >= low) & (keys < high))
+                            keys = keys[offsets]
+                        keys -= low
+                        order = _stable_order(keys)
+                        chunk_counts = np.bincount(keys, minlength=high - low)
+                        # Rang dans la tranche triée -> rang dans le seau de sortie
+                        shift = cursor.copy()
+                        shift[1:] -= np.cumsum(chunk_counts)[:-1]
+                        dest = shift[keys[order]]
+                        dest += np.arange(len(order))
+                        buffer[dest] = (order if offsets is None else offsets[order]) + start
+                        cursor += chunk_counts
+                        step += 1
+                        report(40 + step * 55 // steps)
+                    f.seek(positions_offset + base * itemsize)
+                    f.write(buffer.tobytes())
+                    del buffer
+
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        report(100)
+        logger.info(f"Index de recherche construit: {path} ({size} octets indexés)")
+        return cls(path, size, stat.st_mtime_ns, digest, block_digests, DirtyRanges())
+
+    @classmethod
+    def open(cls, data, filepath: str) -> Optional['SearchIndex']:
+        """
+        Ouvre l'index existant de filepath s'il correspond au contenu de data
+
+        La date de modification évite de recalculer l'empreinte; si elle a
+        changé, l'empreinte du contenu fait foi.
+
+        Returns:
+            SearchIndex ou None si l'index est absent ou périmé
+        """
+        path = index_path(filepath)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                (magic, version, bits, size, mtime_ns,
+                 block_size, digest, overlay_count) = HEADER.unpack(f.read(HEADER.size))
+                if (magic != INDEX_MAGIC or version != INDEX_VERSION or bits != BUCKET_BITS
+                        or block_size != DIGEST_BLOCK_SIZE or size != len(data)):
+                    logger.info(f"Index ignoré (format ou taille différents): {path}")
+                    return None
+
+                block_count = (size + DIGEST_BLOCK_SIZE - 1) // DIGEST_BLOCK_SIZE
+                block_digests = bytearray(f.read(block_count * DIGEST_SIZE))
+
+                index = cls(path, size, mtime_ns, digest, block_digests, DirtyRanges())
+                f.seek(index._overlay_offset)
+                for _ in range(overlay_count):
+                    start, end = RANGE.unpack(f.read(RANGE.size))
+                    index.overlay.add(start, end - start)
+
+            stat_mtime = os.stat(filepath).st_mtime_ns
+            if stat_mtime != mtime_ns:
+                if _content_digest(_block_digests(data)) != digest:
+                    logger.info(f"Index périmé (contenu différent): {path}")
+                    index.close()
+                    return None
+                index.mtime_ns = stat_mtime
+                index._write_metadata()
+
+            logger.info(f"Index de recherche chargé: {path}")
+            return index
+
+        except Exception as e:
+            logger.error(f"Erreur lecture index: {e}")
+            return None
+
+    def close(self):
+        """Libère les projections mémoire de l'index"""
+        self._starts = None
+        self._positions = None
+
+    # ------------------------------------------------------------------
+    # Mise à jour incrémentale
+    # ------------------------------------------------------------------
+
+    def update(self, data, ranges: Iterable[Tuple[int, int]], mtime_ns: Optional[int] = None) -> bool:
+        """
+        Prend en compte des plages modifiées sans reconstruire l'index
+
+        Args:
+            data: Contenu après modification (même taille)
+            ranges: Plages (début, fin) modifiées
+            mtime_ns: Nouvelle date de modification du fichier
+
+        Returns:
+            False si les modifications sont trop importantes (reconstruire)
+        """
+        if len(data) != self.data_size:
+            return False
+
+        blocks = set()
+        for start, end in ranges:
+            self.overlay.add(start, end - start)
+            blocks.update(range(start // DIGEST_BLOCK_SIZE,
+                                (end - 1) // DIGEST_BLOCK_SIZE + 1))
+
+        if self.is_stale():
+            logger.info("Index: trop de modifications, reconstruction nécessaire")
+            return False
+
+        with memoryview(data) as view:
+            for block in blocks:
+                start = block * DIGEST_BLOCK_SIZE
+                self.block_digests[block * DIGEST_SIZE:(block + 1) * DIGEST_SIZE] = \
+                    hashlib.blake2b(view[start:start + DIGEST_BLOCK_SIZE],
+                                    digest_size=DIGEST_SIZE).digest()
+
+        self.digest = _content_digest(self.block_digests)
+        if mtime_ns is not None:
+            self.mtime_ns = mtime_ns
+        self._write_metadata()
+        return True
+
+    def is_stale(self) -> bool:
+        """True si le recouvrement est devenu trop grand pour rester efficace"""
+        limit = max(MIN_OVERLAY_BYTES, int(self.data_size * OVERLAY_RATIO))
+        return len(self.overlay) > MAX_OVERLAY_RANGES or self.overlay.total_bytes() > limit
+
+    def _write_metadata(self):
+        """Réécrit l'en-tête, les empreintes de blocs et le recouvrement"""
+        overlay = list(self.overlay)
+        with open(self.path, 'r+b') as f:
+            f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, BUCKET_BITS, self.data_size,
+                                self.mtime_ns, DIGEST_BLOCK_SIZE, self.digest, len(overlay)))
+            f.write(self.block_digests)
+            f.seek(self._overlay_offset)
+            f.truncate()
+            for start, end in overlay:
+                f.write(RANGE.pack(start, end))
+
+    # ------------------------------------------------------------------
+    # Recherche
+    # ------------------------------------------------------------------
+
+    def find_all(self, data, pattern: bytes,
+                 extra_ranges: Iterable[Tuple[int, int]] = ()) -> List[int]:
+        """
+        Retourne tous les offsets de pattern dans data, triés
+
+        Args:
+            data: Contenu actuel (l'index décrit son état sans extra_ranges)
+            pattern: Motif à chercher
+            extra_ranges: Plages modifiées depuis la dernière mise à jour
+        """
+        pattern = bytes(pattern)
+        size = len(data)
+        if not pattern or size != self.data_size:
+            return _scan(data, pattern, 0, size)
+
+        if len(pattern) < GRAM_SIZE or self._positions is None or self._starts is None:
+            return _scan(data, pattern, 0, size)
+
+        keys = _pattern_keys(pattern)
+        sizes = [int(self._starts[key + 1] - self._starts[key]) for key in keys]
+        best = min(range(len(keys)), key=sizes.__getitem__)
+        if sizes[best] > MAX_CANDIDATES:
+            return _scan(data, pattern, 0, size)
+
+        candidates = self._candidates(keys, best, size - len(pattern))
+
+        # Vérification octet par octet (collisions de hachage, modifications)
+        view = np.frombuffer(data, dtype=np.uint8)
+        hits = _verify(view, candidates, pattern).tolist()
+        del view
+
+        # Les plages modifiées sont cherchées directement dans les données
+        windows = self._windows(extra_ranges)
+        if windows:
+            extra = set()
+            for start, end in windows:
+                extra.update(_scan(data, pattern, max(0, start - len(pattern) + 1),
+                                   min(size, end + len(pattern) - 1)))
+            hits = sorted(extra.union(hits))
+
+        return hits
+
+    def find(self, data, pattern: bytes, start: int = 0,
+             extra_ranges: Iterable[Tuple[int, int]] = ()) -> int:
+        """
+        Premier offset >= start, ou -1
+
+        S'arrête à la première occurrence: les candidats de l'index sont
+        vérifiés dans l'ordre à partir de start, par lots, et seules les
+        plages modifiées situées avant cette occurrence sont parcourues.
+        """
+        pattern = bytes(pattern)
+        size = len(data)
+        start = max(0, start)
+        if not pattern:
+            return -1
+        if (size != self.data_size or len(pattern) < GRAM_SIZE
+                or self._positions is None or self._starts is None):
+            return data.find(pattern, start)
+
+        keys = _pattern_keys(pattern)
+        sizes = [int(self._starts[key + 1] - self._starts[key]) for key in keys]
+        best = min(range(len(keys)), key=sizes.__getitem__)
+        if sizes[best] > MAX_CANDIDATES:
+            return data.find(pattern, start)
+
+        key = keys[best]
+        bucket = self._positions[int(self._starts[key]):int(self._starts[key + 1])]
+        last = size - len(pattern)
+
+        found = -1
+        view = np.frombuffer(data, dtype=np.uint8)
+        for first in range(int(np.searchsorted(bucket, start + best)), len(bucket), FIND_BATCH):
+            candidates = bucket[first:first + FIND_BATCH].astype(np.int64) - best
+            hits = _verify(view, candidates[candidates <= last], pattern)
+            if len(hits):
+                found = int(hits[0])
+                break
+        del view
+
+        # Occurrences dans les plages modifiées, avant celle de l'index
+        for window_start, window_end in self._windows(extra_ranges):
+            low = max(start, window_start - len(pattern) + 1)
+            if found != -1 and low >= found:
+                break
+            high = min(size, window_end + len(pattern) - 1)
+            if found != -1:
+                high = min(high, found + len(pattern) - 1)
+            if high <= low:
+                continue
+            position = data.find(pattern, low, high)
+            if position != -1:
+                found = position
+                break
+        return found
+
+    def _candidates(self, keys: List[int], best: int, last: int) -> np.ndarray:
+        """Débuts possibles du motif (croissants) d'après le 4-gramme le plus rare"""
+        key = keys[best]
+        candidates = self._positions[int(self._starts[key]):int(self._starts[key + 1])].astype(np.int64)
+        candidates -= best
+        return candidates[(candidates >= 0) & (candidates <= last)]
+
+    def _windows(self, extra_ranges: Iterable[Tuple[int, int]]) -> DirtyRanges:
+        """Plages à chercher directement: recouvrement de l'index et modifications récentes"""
+        windows = DirtyRanges()
+        for start, end in self.overlay:
+            windows.add(start, end - start)
+        for start, end in extra_ranges:
+            windows.add(start, end - start)
+        return windows
+
+def _verify(view: np.ndarray, candidates: np.ndarray, pattern: bytes) -> np.ndarray:
+    """Candidats où le motif est effectivement présent (ordre conservé)"""
+    for k, byte in enumerate(pattern):
+        if not len(candidates):
+            break
+        candidates = candidates[view[candidates + k] == byte]
+    return candidates
+
+def _scan(data, pattern: bytes, start: int, end: int) -> List[int]:
+    """Recherche directe des occurrences entièrement comprises dans [start, end)"""
+    hits = []
+    if not pattern:
+        return hits
+    position = data.find(pattern, start, end)
+    while position != -1:
+        hits.append(position)
+        position = data.find(pattern, position + 1, end)
+    return hits
@@ -0,0 +1,413 @@
+"""
+Recherche différentielle de valeurs entre instantanés de sauvegarde
+
+Principe d'un "next scan": on prend un instantané, on change une valeur en
+jeu, on prend un nouvel instantané et on ne garde que les offsets dont la
+valeur a évolué comme attendu (modifiée, inchangée, augmentée, diminuée,
+égale à X). Chaque type (int8 à int64, float, double) est testé à chaque
+offset, donc à tous les alignements.
+
+Les candidats d'un type sont un bitmap NumPy (np.packbits, un bit par
+offset) tant qu'ils sont nombreux, puis un tableau d'offsets quand il en
+reste peu. Les conditions de changement ne sont évaluées qu'autour des
+octets qui diffèrent entre les deux instantanés.
+"""
+
+import mmap
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from core.compression import find_zlib_stream, inflate_to_mapping
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Types recherchés (little-endian)
+VALUE_TYPES = {
+    'int8': np.dtype('<i1'),
+    'int16': np.dtype('<i2'),
+    'int32': np.dtype('<i4'),
+    'int64': np.dtype('<i8'),
+    'float': np.dtype('<f4'),
+    'double': np.dtype('<f8'),
+}
+
+# Conditions de filtrage
+CONDITION_CHANGED = 'changed'
+CONDITION_UNCHANGED = 'unchanged'
+CONDITION_INCREASED = 'increased'
+CONDITION_DECREASED = 'decreased'
+CONDITION_EQUAL = 'equal'
+CONDITIONS = (CONDITION_CHANGED, CONDITION_UNCHANGED, CONDITION_INCREASED,
+              CONDITION_DECREASED, CONDITION_EQUAL)
+
+# Nombre d'éléments traités par bloc lors des balayages complets (multiple de 8)
+BLOCK_ELEMENTS = 1 << 24
+
+# En dessous de ce nombre de candidats, un type passe en tableau d'offsets
+SPARSE_LIMIT = 1 << 20
+
+# Nombre de bits à 1 de chaque octet
+_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+# Tolérance relative de l'égalité pour float et double
+FLOAT_TOLERANCE = 1e-6
+
+def open_snapshot(filepath: str):
+    """Projette un fichier de sauvegarde en lecture seule pour servir d'instantané"""
+    # Sauvegarde compressée: comparer les données décompressées
+    stream_offset = find_zlib_stream(filepath) if os.path.getsize(filepath) else None
+    if stream_offset is not None:
+        data, _ = inflate_to_mapping(filepath, stream_offset)
+        return data
+
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+@dataclass
+class HuntResult:
+    """Offset candidat d'une recherche de valeur"""
+    offset: int
+    type_name: str
+    previous: Optional[float]
+    current: float
+
+class CandidateSet:
+    """Offsets encore candidats pour un type: tous, bitmap ou tableau d'offsets"""
+
+    def __init__(self, size: int):
+        self.size = size            # nombre d'offsets possibles
+        self.bitmap: Optional[np.ndarray] = None
+        self.offsets: Optional[np.ndarray] = None
+        self.count = size
+
+    @property
+    def is_all(self) -> bool:
+        return self.bitmap is None and self.offsets is None
+
+    def contains(self, offsets: np.ndarray) -> np.ndarray:
+        """Masque des offsets (triés) encore candidats"""
+        if self.is_all:
+            return np.ones(len(offsets), dtype=bool)
+        if self.bitmap is not None:
+            return ((self.bitmap[offsets >> 3] >> (7 - (offsets & 7))) & 1).astype(bool)
+        positions = np.searchsorted(self.offsets, offsets)
+        positions[positions == len(self.offsets)] = 0
+        return self.offsets[positions] == offsets if len(self.offsets) else np.zeros(len(offsets), bool)
+
+    def alive_offsets(self) -> np.ndarray:
+        """Tous les offsets candidats (à éviter tant que le bitmap est dense)"""
+        if self.offsets is not None:
+            return self.offsets
+        if self.bitmap is not None:
+            return _bitmap_offsets(self.bitmap, np.flatnonzero(self.bitmap))
+        return np.arange(self.size, dtype=np.int64)
+
+    def set_offsets(self, offsets: np.ndarray):
+        """Remplace les candidats par une liste d'offsets triée"""
+        self.bitmap = None
+        self.offsets = offsets.astype(np.int64, copy=False)
+        self.count = len(self.offsets)
+
+    def set_bitmap(self, bitmap: np.ndarray, count: Optional[int] = None):
+        """Remplace les candidats par un bitmap (converti en offsets s'il est creux)"""
+        self.offsets = None
+        self.bitmap = bitmap
+        self.count = int(_POPCOUNT[bitmap].sum(dtype=np.int64)) if count is None else count
+        if self.count <= SPARSE_LIMIT:
+            self.set_offsets(self.alive_offsets())
+
+    def first(self, limit: int) -> np.ndarray:
+        """Les premiers offsets candidats, sans tout décompresser"""
+        if self.offsets is not None:
+            return self.offsets[:limit]
+        if self.bitmap is None:
+            return np.arange(min(limit, self.size), dtype=np.int64)
+        # Assez d'octets non nuls pour contenir limit bits
+        byte_indexes = np.flatnonzero(self.bitmap)[:limit]
+        return _bitmap_offsets(self.bitmap, byte_indexes)[:limit]
+
+def _bitmap_offsets(bitmap: np.ndarray, byte_indexes: np.ndarray) -> np.ndarray:
+    """Offsets des bits à 1 dans les octets byte_indexes du bitmap (triés)"""
+    bits = np.unpackbits(bitmap[byte_indexes]).reshape(-1, 8).astype(bool)
+    offsets = byte_indexes.astype(np.int64)[:, None] * 8 + np.arange(8)
+    return offsets[bits]
+
+def _full_bitmap(size: int) -> np.ndarray:
+    """Bitmap de size bits tous à 1 (bits de remplissage à 0)"""
+    bitmap = np.full((size + 7) // 8, 0xFF, dtype=np.uint8)
+    if size % 8:
+        bitmap[-1] = (0xFF << (8 - size % 8)) & 0xFF
+    return bitmap
+
+def _typed_view(data, dtype: np.dtype) -> np.ndarray:
+    """Vue (sans copie) de la valeur de type dtype à chaque offset de data"""
+    count = len(data) - dtype.itemsize + 1
+    if count <= 0:
+        return np.zeros(0, dtype=dtype)
+    return np.ndarray((count,), dtype=dtype, buffer=data, strides=(1,))
+
+def _bits_view(data, dtype: np.dtype) -> np.ndarray:
+    """Même vue interprétée en entiers (comparaison bit à bit des flottants)"""
+    return _typed_view(data, np.dtype(f'<i{dtype.itemsize}'))
+
+def _compare(condition: str, previous, current, value=None, dtype=None):
+    """Évalue une condition sur des valeurs déjà extraites"""
+    if condition == CONDITION_INCREASED:
+        return current > previous
+    if condition == CONDITION_DECREASED:
+        return current < previous
+    if condition == CONDITION_EQUAL:
+        if dtype.kind == 'f':
+            return np.abs(current - value) <= abs(value) * FLOAT_TOLERANCE
+        return current == value
+    raise ValueError(f"Condition inconnue: {condition}")
+
+class ValueHunter:
+    """Affine des ensembles d'offsets candidats au fil des instantanés"""
+
+    def __init__(self, types: Optional[Sequence[str]] = None):
+        """
+        Args:
+            types: Noms des types à chercher (tous ceux de VALUE_TYPES par défaut)
+        """
+        self.types = list(types or VALUE_TYPES)
+        self.snapshot = None
+        self.previous_snapshot = None
+        self.candidates: Dict[str, CandidateSet] = {}
+        self.scan_count = 0
+
+    def start(self, data):
+        """
+        Commence une recherche: tous les offsets de tous les types sont candidats
+
+        Args:
+            data: Premier instantané (bytes ou mmap, non modifié ensuite)
+        """
+        self._replace_snapshot(data, keep_previous=False)
+        self.candidates = {
+            name: CandidateSet(max(0, len(data) - VALUE_TYPES[name].itemsize + 1))
+            for name in self.types
+        }
+        self.scan_count = 0
+
+    def scan(self, condition: str, value=None, data=None) -> int:
+        """
+        Filtre les candidats
+
+        Args:
+            condition: Une des CONDITIONS
+            value: Valeur attendue pour CONDITION_EQUAL
+            data: Nouvel instantané; obligatoire pour les conditions de changement
+
+        Returns:
+            Nombre total de candidats restants
+        """
+        if condition not in CONDITIONS:
+            raise ValueError(f"Condition inconnue: {condition}")
+        if self.snapshot is None:
+            raise ValueError("Aucun instantané: appeler start() d'abord")
+        if condition == CONDITION_EQUAL and value is None:
+            raise ValueError("Valeur attendue manquante")
+
+        if data is not None:
+            if len(data) != len(self.snapshot):
+                raise ValueError("Les instantanés doivent avoir la même taille")
+            self._replace_snapshot(data, keep_previous=True)
+        elif condition != CONDITION_EQUAL:
+            raise ValueError("Un nouvel instantané est nécessaire pour comparer")
+
+        if condition == CONDITION_EQUAL:
+            prefilters = {}
+            for name in self.types:
+                self._scan_equal(name, value, prefilters)
+        else:
+            changed = self._changed_bytes()
+            for name in self.types:
+                self._scan_change(name, condition, changed)
+
+        self.scan_count += 1
+        total = self.count()
+        logger.info(f"Recherche de valeur ({condition}): {total} candidat(s)")
+        return total
+
+    def count(self, type_name: Optional[str] = None) -> int:
+        """Nombre de candidats (d'un type ou de tous)"""
+        if type_name is not None:
+            return self.candidates[type_name].count
+        return sum(candidates.count for candidates in self.candidates.values())
+
+    def results(self, limit: int = 200) -> List[HuntResult]:
+        """Premiers candidats, tous types confondus, par offset croissant"""
+        results = []
+        for name in self.types:
+            dtype = VALUE_TYPES[name]
+            offsets = self.candidates[name].first(limit)
+            current = _typed_view(self.snapshot, dtype)[offsets]
+            previous = (_typed_view(self.previous_snapshot, dtype)[offsets]
+                        if self.previous_snapshot is not None else [None] * len(offsets))
+            for offset, old, new in zip(offsets.tolist(), previous, current):
+                results.append(HuntResult(
+                    offset, name,
+                    None if old is None else old.item(),
+                    new.item()
+                ))
+        results.sort(key=lambda result: (result.offset, VALUE_TYPES[result.type_name].itemsize))
+        return results[:limit]
+
+    def close(self):
+        """Oublie les instantanés (et ferme ceux qui sont des mmap)"""
+        self._release(self.previous_snapshot)
+        self._release(self.snapshot)
+        self.previous_snapshot = None
+        self.snapshot = None
+
+    @staticmethod
+    def _release(data):
+        if isinstance(data, mmap.mmap):
+            try:
+                data.close()
+            except BufferError:
+                logger.debug("Instantané encore référencé, fermeture différée")
+
+    def _replace_snapshot(self, data, keep_previous: bool):
+        if self.previous_snapshot is not None and self.previous_snapshot is not data:
+            self._release(self.previous_snapshot)
+        if not keep_previous and self.snapshot is not None and self.snapshot is not data:
+            self._release(self.snapshot)
+        self.previous_snapshot = self.snapshot if keep_previous else None
+        self.snapshot = data
+
+    # ------------------------------------------------------------------
+    # Conditions
+    # ------------------------------------------------------------------
+
+    def _changed_bytes(self) -> np.ndarray:
+        """Offsets des octets qui diffèrent entre les deux derniers instantanés"""
+        previous = np.frombuffer(self.previous_snapshot, dtype=np.uint8)
+        current = np.frombuffer(self.snapshot, dtype=np.uint8)
+        parts = [
+            np.flatnonzero(previous[start:start + BLOCK_ELEMENTS] != current[start:start + BLOCK_ELEMENTS]) + start
+            for start in range(0, len(current), BLOCK_ELEMENTS)
+        ]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+    @staticmethod
+    def _windows(changed: np.ndarray, itemsize: int, size: int) -> np.ndarray:
+        """Offsets des valeurs de itemsize octets qui recouvrent un octet modifié"""
+        if not len(changed) or not size:
+            return np.zeros(0, dtype=np.int64)
+        # Octets modifiés, puis valeur en o modifiée si l'un de o..o+itemsize-1 l'est
+        # (un octet par octet de la sauvegarde, sans tableau len(changed) x itemsize)
+        changed_mask = np.zeros(size + itemsize - 1, dtype=bool)
+        changed_mask[changed] = True
+        windows = changed_mask[:size].copy()
+        for shift in range(1, itemsize):
+            windows |= changed_mask[shift:shift + size]
+        return np.flatnonzero(windows)
+
+    def _scan_change(self, name: str, condition: str, changed: np.ndarray):
+        """Modifiée / inchangée / augmentée / diminuée"""
+        dtype = VALUE_TYPES[name]
+        candidates = self.candidates[name]
+        windows = self._windows(changed, dtype.itemsize, candidates.size)
+
+        if condition == CONDITION_UNCHANGED:
+            if candidates.offsets is not None:
+                alive = candidates.offsets
+                keep = np.ones(len(alive), dtype=bool)
+                keep[np.isin(alive, windows, assume_unique=True)] = False
+                candidates.set_offsets(alive[keep])
+            else:
+                # Copie du bitmap (ou bitmap plein) dont on éteint les valeurs modifiées
+                if candidates.bitmap is not None:
+                    bitmap = candidates.bitmap.copy()
+                else:
+                    bitmap = _full_bitmap(candidates.size)
+                count = candidates.count - int(candidates.contains(windows).sum())
+                np.bitwise_and.at(bitmap, windows >> 3,
+                                  (~(np.uint8(0x80) >> (windows & 7).astype(np.uint8))).astype(np.uint8))
+                candidates.set_bitmap(bitmap, count)
+            return
+
+        # Les autres conditions impliquent un changement: seules les fenêtres comptent
+        offsets = windows if candidates.offsets is None else \
+            np.intersect1d(candidates.offsets, windows, assume_unique=True)
+        offsets = offsets[candidates.contains(offsets)]
+
+        if condition == CONDITION_CHANGED:
+            old = _bits_view(self.previous_snapshot, dtype)[offsets]
+            new = _bits_view(self.snapshot, dtype)[offsets]
+            keep = old != new
+        else:
+            old = _typed_view(self.previous_snapshot, dtype)[offsets]
+            new = _typed_view(self.snapshot, dtype)[offsets]
+            with np.errstate(invalid='ignore'):
+                keep = _compare(condition, old, new)
+
+        candidates.set_offsets(offsets[keep])
+
+    def _scan_equal(self, name: str, value, prefilters: Dict):
+        """
+        Égale à value dans l'instantané courant
+
+        Args:
+            prefilters: Cache des préfiltres partagés entre types pendant un scan
+        """
+        dtype = VALUE_TYPES[name]
+        candidates = self.candidates[name]
+
+        if dtype.kind == 'i':
+            info = np.iinfo(dtype)
+            if value != int(value) or not info.min <= int(value) <= info.max:
+                candidates.set_offsets(np.zeros(0, dtype=np.int64))
+                return
+            value = int(value)
+        else:
+            value = float(value)
+
+        view = _typed_view(self.snapshot, dtype)
+
+        if candidates.offsets is not None:
+            offsets = candidates.offsets
+            with np.errstate(invalid='ignore', over='ignore'):
+                candidates.set_offsets(offsets[_compare(CONDITION_EQUAL, None, view[offsets], value, dtype)])
+            return
+
+        # Préfiltre sur un octet déterminé par la valeur (poids faible des
+        # entiers, poids fort des flottants), puis vérification
+        key_index = 0 if dtype.kind == 'i' else dtype.itemsize - 1
+        key_bytes = tuple(_key_bytes(value, dtype, key_index))
+        matches = prefilters.get(key_bytes)
+        if matches is None:
+            # Positions de l'octet clé, communes aux types qui le partagent
+            data = np.frombuffer(self.snapshot, dtype=np.uint8)
+            parts = []
+            for start in range(0, len(data), BLOCK_ELEMENTS):
+                block = data[start:start + BLOCK_ELEMENTS]
+                mask = block == key_bytes[0]
+                for key_byte in key_bytes[1:]:
+                    mask |= block == key_byte
+                parts.append(np.flatnonzero(mask) + start)
+            matches = prefilters[key_bytes] = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+        offsets = matches - key_index
+        offsets = offsets[(offsets >= 0) & (offsets < candidates.size)]
+
+        with np.errstate(invalid='ignore', over='ignore'):
+            offsets = offsets[_compare(CONDITION_EQUAL, None, view[offsets], value, dtype)]
+        candidates.set_offsets(offsets[candidates.contains(offsets)])
+
+def _key_bytes(value, dtype: np.dtype, key_index: int) -> List[int]:
+    """Valeurs possibles de l'octet key_index pour les valeurs égales à value"""
+    if dtype.kind == 'i':
+        return [value & 0xFF]
+    tolerance = abs(value) * FLOAT_TOLERANCE
+    bounds = [value - tolerance, value, value + tolerance]
+    if value == 0:
+        bounds.append(-0.0)
+    with np.errstate(over='ignore'):
+        return sorted({np.array(bound, dtype=dtype).tobytes()[key_index] for bound in bounds})
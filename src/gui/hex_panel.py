@@ -3,46 +3,34 @@ Panneau d'affichage et d'édition hexadécimal
 """
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTextEdit,
-    QLabel, QPushButton, QScrollArea, QFrame,
-    QSpinBox, QComboBox, QLineEdit, QGroupBox,
-    QGridLayout, QMessageBox
+    QWidget, QVBoxLayout, QHBoxLayout,
+    QLabel, QPushButton, QFrame,
+    QComboBox, QLineEdit, QGroupBox,
+    QGridLayout, QMessageBox, QListView
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QTextCursor, QColor, QTextCharFormat, QSyntaxHighlighter
-import re
-
-class HexHighlighter(QSyntaxHighlighter):
-    """Syntax highlighter pour l'affichage hexadécimal"""
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.highlight_format = QTextCharFormat()
-        self.highlight_format.setBackground(QColor(255, 255, 200))  # Jaune clair
-        
-        self.selection_format = QTextCharFormat()
-        self.selection_format.setBackground(QColor(200, 230, 255))  # Bleu clair
-        
-        self.current_highlight = None
-    
-    def highlightBlock(self, text):
-        """Surligne le bloc de texte"""
-        if self.current_highlight is not None:
-            start, length = self.current_highlight
-            if 0 <= start < len(text):
-                end = min(start + length, len(text))
-                self.setFormat(start, end - start, self.highlight_format)
+from PyQt6.QtCore import Qt, pyqtSignal, QThread
+import struct
+from array import array
+from .hex_view import HexView
+from .search_worker import SearchResultsModel
 
 class HexPanel(QWidget):
     """Panneau d'affichage et d'édition hexadécimal"""
     
     # Signaux
     data_modified = pyqtSignal()
+    range_modified = pyqtSignal(int, int)  # offset, longueur
     offset_changed = pyqtSignal(int)
     
     def __init__(self):
         super().__init__()
         self.data = None
+        self.source_path = None
+        self.dirty_ranges = None
+        self.search_index = None
+        self.search_worker = None
+        self.find_worker = None
+        self.search_threads = []
         self.current_offset = 0
         self.selection_start = None
         self.selection_end = None
@@ -75,14 +63,23 @@ class HexPanel(QWidget):
         # Recherche
         toolbar.addWidget(QLabel("Rechercher:"))
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Hex ou texte")
-        self.search_input.setFixedWidth(150)
+        self.search_input.setPlaceholderText("Hex ou texte (; pour plusieurs)")
+        self.search_input.setFixedWidth(200)
         toolbar.addWidget(self.search_input)
         
         self.search_button = QPushButton("Rechercher")
         self.search_button.setFixedWidth(100)
         toolbar.addWidget(self.search_button)
         
+        self.find_all_button = QPushButton("Tout trouver")
+        self.find_all_button.setFixedWidth(100)
+        toolbar.addWidget(self.find_all_button)
+        
+        self.cancel_search_button = QPushButton("Annuler")
+        self.cancel_search_button.setFixedWidth(80)
+        self.cancel_search_button.setVisible(False)
+        toolbar.addWidget(self.cancel_search_button)
+        
         toolbar.addStretch()
         
         # Options d'affichage
@@ -95,47 +92,31 @@ class HexPanel(QWidget):
         
         main_layout.addLayout(toolbar)
         
-        # Zone d'affichage principale
+        # Zone d'affichage principale (offsets, hexadécimal et ASCII)
         display_frame = QFrame()
         display_frame.setFrameStyle(QFrame.Shape.StyledPanel | QFrame.Shadow.Sunken)
         display_layout = QHBoxLayout()
+        display_layout.setContentsMargins(0, 0, 0, 0)
         
-        # Colonne des offsets
-        self.offset_display = QTextEdit()
-        self.offset_display.setFont(QFont("Consolas", 10))
-        self.offset_display.setReadOnly(True)
-        self.offset_display.setMaximumWidth(100)
-        self.offset_display.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        display_layout.addWidget(self.offset_display)
-        
-        # Colonne hexadécimale
-        self.hex_display = QTextEdit()
-        self.hex_display.setFont(QFont("Consolas", 10))
-        self.hex_display.setAcceptRichText(False)
-        
-        # Highlighter
-        self.highlighter = HexHighlighter(self.hex_document())
-        
-        # Connecter les changements de sélection
-        self.hex_display.selectionChanged.connect(self.on_selection_changed)
+        self.hex_display = HexView()
         display_layout.addWidget(self.hex_display)
         
-        # Colonne ASCII
-        self.ascii_display = QTextEdit()
-        self.ascii_display.setFont(QFont("Consolas", 10))
-        self.ascii_display.setReadOnly(True)
-        self.ascii_display.setMaximumWidth(300)
-        self.ascii_display.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        display_layout.addWidget(self.ascii_display)
-        
-        # Synchroniser les scrollbars
-        self.hex_display.verticalScrollBar().valueChanged.connect(
-            self.sync_scrollbars
-        )
-        
         display_frame.setLayout(display_layout)
         main_layout.addWidget(display_frame)
         
+        # Résultats de "Tout trouver"
+        self.results_label = QLabel("")
+        self.results_label.setVisible(False)
+        main_layout.addWidget(self.results_label)
+        
+        self.results_model = SearchResultsModel(self)
+        self.results_list = QListView()
+        self.results_list.setModel(self.results_model)
+        self.results_list.setUniformItemSizes(True)
+        self.results_list.setMaximumHeight(150)
+        self.results_list.setVisible(False)
+        main_layout.addWidget(self.results_list)
+        
         # Barre d'information inférieure
         info_layout = QHBoxLayout()
         
@@ -204,6 +185,10 @@ class HexPanel(QWidget):
         """Configure les connections des signaux"""
         self.goto_button.clicked.connect(self.goto_offset)
         self.search_button.clicked.connect(self.search_data)
+        self.find_all_button.clicked.connect(self.find_all_data)
+        self.cancel_search_button.clicked.connect(self.cancel_search)
+        self.results_list.activated.connect(self.on_result_activated)
+        self.results_list.clicked.connect(self.on_result_activated)
         self.bytes_combo.currentTextChanged.connect(self.change_bytes_per_line)
         self.write_button.clicked.connect(self.write_value)
         self.fill_button.clicked.connect(self.fill_data)
@@ -214,183 +199,84 @@ class HexPanel(QWidget):
         self.search_input.returnPressed.connect(self.search_data)
         
         # Mise à jour en temps réel
-        self.hex_display.cursorPositionChanged.connect(self.update_position_info)
-    
-    def hex_document(self):
-        """Retourne le document QTextDocument"""
-        return self.hex_display.document()
+        self.hex_display.cursor_moved.connect(self.update_position_info)
+        self.hex_display.selection_changed.connect(self.on_selection_changed)
+        self.hex_display.bytes_edited.connect(self.on_bytes_edited)
     
-    def set_data(self, data):
-        """Définit les données à afficher"""
+    def set_data(self, data, read_only=False, source_path=None, dirty_ranges=None):
+        """
+        Définit les données à afficher
+        
+        Args:
+            data: Buffer à afficher
+            read_only: Interdire l'édition
+            source_path: Fichier dont data est l'image (recherche parallèle)
+            dirty_ranges: Plages modifiées de data par rapport au fichier
+        """
+        self.cancel_search()
         self.data = data
-        self.refresh_display()
+        self.source_path = source_path
+        self.dirty_ranges = dirty_ranges
+        self.search_index = None
+        self.current_offset = 0
+        self.selection_start = None
+        self.selection_end = None
+        self.hex_display.set_data(data, read_only)
+        
+        self.position_label.setText("Offset: 0x00000000 (0)")
+        self.selection_label.setText("Sélection: Aucune")
+        self.value_label.setText("Valeur: -")
         
         if data:
             self.size_label.setText(f"Taille: {len(data):,} octets")
         else:
             self.size_label.setText("Taille: 0 octets")
     
-    def refresh_display(self):
-        """Rafraîchit l'affichage"""
-        if not self.data:
-            self.offset_display.clear()
-            self.hex_display.clear()
-            self.ascii_display.clear()
-            return
-        
-        # Calculer les lignes
-        lines = []
-        offset_lines = []
-        ascii_lines = []
-        
-        for i in range(0, len(self.data), self.bytes_per_line):
-            chunk = self.data[i:i + self.bytes_per_line]
-            
-            # Ligne offset
-            offset_lines.append(f"{i:08X}")
-            
-            # Ligne hex
-            hex_parts = []
-            for j, byte in enumerate(chunk):
-                hex_parts.append(f"{byte:02X}")
-            
-            # Remplir avec espaces si ligne incomplète
-            while len(hex_parts) < self.bytes_per_line:
-                hex_parts.append("  ")
-            
-            # Grouper par 8 bytes
-            hex_line = ""
-            for k in range(0, self.bytes_per_line, 8):
-                group = hex_parts[k:k+8]
-                hex_line += ' '.join(group) + '  '
-            
-            lines.append(hex_line.strip())
-            
-            # Ligne ASCII
-            ascii_line = ""
-            for byte in chunk:
-                if 32 <= byte < 127:
-                    ascii_line += chr(byte)
-                else:
-                    ascii_line += '.'
-            
-            # Remplir avec espaces
-            ascii_line += ' ' * (self.bytes_per_line - len(chunk))
-            ascii_lines.append(ascii_line)
-        
-        # Mettre à jour les displays
-        self.offset_display.setText('\n'.join(offset_lines))
-        self.hex_display.setText('\n'.join(lines))
-        self.ascii_display.setText('\n'.join(ascii_lines))
-        
-        # Synchroniser les hauteurs
-        self.sync_display_heights()
-    
-    def sync_display_heights(self):
-        """Synchronise les hauteurs des displays"""
-        # Tous ont le même nombre de lignes, donc même hauteur
-        pass
+    def set_search_index(self, index):
+        """Utilise un SearchIndex des données pour les recherches (None pour balayer)"""
+        self.search_index = index
     
-    def sync_scrollbars(self, value):
-        """Synchronise les scrollbars des différents displays"""
-        self.offset_display.verticalScrollBar().setValue(value)
-        self.ascii_display.verticalScrollBar().setValue(value)
+    def refresh_display(self):
+        """Rafraîchit l'affichage (seules les lignes visibles sont redessinées)"""
+        self.hex_display.refresh()
     
-    def update_position_info(self):
+    def update_position_info(self, offset):
         """Met à jour les informations de position"""
-        cursor = self.hex_display.textCursor()
-        text = cursor.block().text()
-        position_in_block = cursor.positionInBlock()
-        
-        # Trouver l'offset réel
-        line_number = cursor.blockNumber()
-        byte_pos = self.find_byte_position(text, position_in_block)
-        
-        if byte_pos is not None:
-            offset = line_number * self.bytes_per_line + byte_pos
-            self.current_offset = offset
-            
-            # Mettre à jour les labels
-            self.position_label.setText(f"Offset: 0x{offset:08X} ({offset})")
-            
-            # Afficher la valeur à cette position
-            if offset < len(self.data):
-                byte_value = self.data[offset]
-                self.value_label.setText(f"Valeur: 0x{byte_value:02X} ({byte_value})")
-            
-            # Émettre le signal
-            self.offset_changed.emit(offset)
-    
-    def find_byte_position(self, line_text, cursor_pos):
-        """
-        Trouve la position du byte dans la ligne hex
-        
-        Args:
-            line_text: Texte de la ligne
-            cursor_pos: Position du curseur dans la ligne
-            
-        Returns:
-            Position du byte (0-15) ou None
-        """
-        # Supprimer les espaces multiples
-        cleaned = ' '.join(line_text.split())
-        
-        # Compter les espaces avant le curseur
-        spaces_before = line_text[:cursor_pos].count(' ')
-        
-        # Position dans le texte nettoyé
-        pos_in_cleaned = cursor_pos - spaces_before
+        self.current_offset = offset
         
-        # Chaque byte prend 2 caractères + 1 espace (sauf dernier)
-        byte_pos = pos_in_cleaned // 3
+        # Mettre à jour les labels
+        self.position_label.setText(f"Offset: 0x{offset:08X} ({offset})")
         
-        # Vérifier les limites
-        if byte_pos < 0 or byte_pos >= self.bytes_per_line:
-            return None
+        # Afficher la valeur à cette position
+        if offset < len(self.data):
+            byte_value = self.data[offset]
+            self.value_label.setText(f"Valeur: 0x{byte_value:02X} ({byte_value})")
         
-        return byte_pos
+        # Émettre le signal
+        self.offset_changed.emit(offset)
     
-    def on_selection_changed(self):
+    def on_bytes_edited(self, offset, length):
+        """Quand des octets sont tapés directement dans la vue"""
+        if offset <= self.current_offset < offset + length:
+            byte_value = self.data[self.current_offset]
+            self.value_label.setText(f"Valeur: 0x{byte_value:02X} ({byte_value})")
+        
+        self.range_modified.emit(offset, length)
+        self.data_modified.emit()
+    
+    def on_selection_changed(self, start_offset, end_offset):
         """Quand la sélection change dans l'éditeur hex"""
-        cursor = self.hex_display.textCursor()
+        self.selection_start = start_offset
+        self.selection_end = end_offset
         
-        if cursor.hasSelection():
-            start = cursor.selectionStart()
-            end = cursor.selectionEnd()
-            
-            # Convertir en offsets réels
-            start_block = self.hex_display.document().findBlock(start)
-            end_block = self.hex_display.document().findBlock(end)
-            
-            start_line = start_block.blockNumber()
-            start_pos_in_block = start - start_block.position()
-            
-            end_line = end_block.blockNumber()
-            end_pos_in_block = end - end_block.position()
-            
-            # Trouver les positions des bytes
-            start_byte = self.find_byte_position(start_block.text(), start_pos_in_block)
-            end_byte = self.find_byte_position(end_block.text(), end_pos_in_block)
-            
-            if start_byte is not None and end_byte is not None:
-                start_offset = start_line * self.bytes_per_line + start_byte
-                end_offset = end_line * self.bytes_per_line + end_byte
-                
-                # Assurer l'ordre
-                if start_offset > end_offset:
-                    start_offset, end_offset = end_offset, start_offset
-                
-                self.selection_start = start_offset
-                self.selection_end = end_offset
-                
-                size = end_offset - start_offset + 1
-                self.selection_label.setText(f"Sélection: {size} octet(s)")
-                
-                # Afficher la valeur sélectionnée
-                if size <= 8:  # Afficher seulement pour les petites sélections
-                    selected_data = self.data[start_offset:end_offset+1]
-                    hex_str = ' '.join(f"{b:02X}" for b in selected_data)
-                    self.value_label.setText(f"Sélection: {hex_str}")
+        size = end_offset - start_offset + 1
+        self.selection_label.setText(f"Sélection: {size} octet(s)")
+        
+        # Afficher la valeur sélectionnée
+        if size <= 8:  # Afficher seulement pour les petites sélections
+            selected_data = self.data[start_offset:end_offset+1]
+            hex_str = ' '.join(f"{b:02X}" for b in selected_data)
+            self.value_label.setText(f"Sélection: {hex_str}")
     
     def goto_offset(self):
         """Va à l'offset spécifié"""
@@ -412,34 +298,43 @@ class HexPanel(QWidget):
                                   f"Offset hors limites: 0x{offset:08X}")
                 return
             
-            # Calculer la ligne et la position
-            line = offset // self.bytes_per_line
-            column = offset % self.bytes_per_line
-            
-            # Convertir en position dans le texte
-            text_cursor = self.hex_display.textCursor()
-            
-            # Aller à la ligne
-            document = self.hex_display.document()
-            block = document.findBlockByLineNumber(line)
-            
-            # Position dans la ligne: 3 caractères par byte (2 hex + 1 espace)
-            text_pos = block.position() + column * 3
-            
-            # Déplacer le curseur
-            text_cursor.setPosition(text_pos)
-            self.hex_display.setTextCursor(text_cursor)
+            # Placer le curseur et centrer la vue
+            self.hex_display.set_cursor_offset(offset, center=True)
             self.hex_display.setFocus()
             
-            # Faire défiler pour rendre visible
-            self.hex_display.centerCursor()
-            
             # Mettre à jour le label
             self.position_label.setText(f"Offset: 0x{offset:08X} ({offset})")
             
         except ValueError:
             QMessageBox.warning(self, "Erreur", "Format d'offset invalide")
     
+    @staticmethod
+    def parse_search_terms(search_text):
+        """
+        Convertit le texte de recherche en motifs (séparés par ';')
+        
+        Chaque terme composé uniquement de chiffres hexadécimaux est lu comme
+        des octets, les autres comme du texte UTF-8.
+        """
+        terms = []
+        for term in search_text.split(';'):
+            term = term.strip()
+            if not term:
+                continue
+            
+            # Supprimer les espaces
+            hex_text = term.replace(' ', '')
+            
+            if all(c in '0123456789ABCDEFabcdef' for c in hex_text):
+                if len(hex_text) % 2 == 1:
+                    hex_text = '0' + hex_text
+                terms.append(bytes.fromhex(hex_text))
+            else:
+                # Traiter comme texte
+                terms.append(term.encode('utf-8'))
+        
+        return terms
+    
     def search_data(self):
         """Recherche du texte ou hex dans les données"""
         if not self.data:
@@ -449,59 +344,212 @@ class HexPanel(QWidget):
         if not search_text:
             return
         
-        # Essayer d'interpréter comme hex d'abord
-        search_bytes = None
-        
         try:
-            # Supprimer les espaces
-            hex_text = search_text.replace(' ', '')
-            
-            # Si c'est du texte clair, encoder
-            if all(c in '0123456789ABCDEFabcdef' for c in hex_text):
-                if len(hex_text) % 2 == 1:
-                    hex_text = '0' + hex_text
-                search_bytes = bytes.fromhex(hex_text)
-            else:
-                # Traiter comme texte
-                search_bytes = search_text.encode('utf-8')
-        
-        except:
+            terms = self.parse_search_terms(search_text)
+        except ValueError:
             QMessageBox.warning(self, "Erreur", "Terme de recherche invalide")
             return
         
+        if not terms:
+            return
+        
         # Rechercher à partir de la position courante + 1
         start_pos = self.current_offset + 1 if self.current_offset < len(self.data) - 1 else 0
+        self.search_next_of(terms, start_pos)
+    
+    def search_next_of(self, terms, start_pos):
+        """Va à la prochaine occurrence de l'un des motifs (en arrière-plan)"""
+        self.cancel_search()
+        
+        from .search_worker import FindNextWorker
+        worker = FindNextWorker(self.data, terms, start_pos, self.source_path,
+                                self.dirty_ranges, self.search_index)
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.on_find_progress)
+        worker.found.connect(self.on_find_found)
+        worker.failed.connect(self.on_find_failed)
+        for signal in (worker.found, worker.failed, worker.cancelled):
+            signal.connect(thread.quit)
+        thread.finished.connect(lambda: self.on_search_thread_finished(thread, worker))
+        
+        self.find_worker = worker
+        self.search_threads.append((thread, worker))
+        
+        self.results_label.setText("Recherche... 0%")
+        self.results_label.setVisible(True)
+        self.cancel_search_button.setVisible(True)
+        
+        thread.start()
+    
+    def on_find_progress(self, percent):
+        """Affiche l'avancement de la recherche de la prochaine occurrence"""
+        if self.sender() is not self.find_worker:
+            return
+        self.results_label.setText(f"Recherche... {percent}%")
+    
+    def on_find_found(self, match):
+        """Va à l'occurrence trouvée"""
+        if self.sender() is not self.find_worker:
+            return
+        self.find_worker = None
+        self.cancel_search_button.setVisible(False)
         
-        # Rechercher
-        found_pos = self.data.find(search_bytes, start_pos)
+        if match is None:
+            self.results_label.setText("Non trouvé")
+            QMessageBox.information(self, "Recherche", "Non trouvé")
+            return
         
-        if found_pos == -1 and start_pos > 0:
-            # Rechercher depuis le début
-            found_pos = self.data.find(search_bytes, 0)
+        found_pos, length = match
+        self.results_label.setText(f"Trouvé à l'offset 0x{found_pos:08X}")
+        self.show_match(found_pos, length)
+        QMessageBox.information(self, "Recherche",
+                              f"Trouvé à l'offset 0x{found_pos:08X}")
+    
+    def on_find_failed(self, message):
+        """Quand la recherche de la prochaine occurrence a échoué"""
+        if self.sender() is not self.find_worker:
+            return
+        self.find_worker = None
+        self.cancel_search_button.setVisible(False)
+        self.results_label.setText("Échec de la recherche")
+        QMessageBox.warning(self, "Erreur", f"Erreur lors de la recherche:\n{message}")
+    
+    def find_all_data(self):
+        """Liste toutes les occurrences de tous les motifs (en arrière-plan)"""
+        if not self.data:
+            return
         
-        if found_pos != -1:
-            # Aller à la position trouvée
-            self.offset_input.setText(f"0x{found_pos:08X}")
-            self.goto_offset()
-            
-            # Surligner
-            self.highlight_selection(found_pos, len(search_bytes))
-            
-            QMessageBox.information(self, "Recherche", 
-                                  f"Trouvé à l'offset 0x{found_pos:08X}")
-        else:
-            QMessageBox.information(self, "Recherche", "Non trouvé")
+        try:
+            terms = self.parse_search_terms(self.search_input.text())
+        except ValueError:
+            QMessageBox.warning(self, "Erreur", "Terme de recherche invalide")
+            return
+        
+        if not terms:
+            return
+        
+        self.cancel_search()
+        
+        if self.search_index is not None and len(terms) == 1:
+            # Réponse directe de l'index
+            hits = self.search_index.find_all(self.data, terms[0], list(self.dirty_ranges or []))
+            self.results_model.reset(terms)
+            self.results_model.append_matches((array('Q', hits), array('I', bytes(4 * len(hits)))))
+            self.results_label.setText(f"{len(hits):,} occurrence(s) (index)")
+            self.results_label.setVisible(True)
+            self.results_list.setVisible(True)
+            return
+        
+        from .search_worker import SearchWorker
+        worker = SearchWorker(self.data, terms, self.source_path, self.dirty_ranges)
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.on_search_progress)
+        worker.matches.connect(self.on_search_matches)
+        worker.finished.connect(self.on_search_finished)
+        worker.failed.connect(self.on_search_failed)
+        for signal in (worker.finished, worker.failed, worker.cancelled):
+            signal.connect(thread.quit)
+        thread.finished.connect(lambda: self.on_search_thread_finished(thread, worker))
+        
+        self.search_worker = worker
+        self.search_threads.append((thread, worker))
+        
+        self.results_model.reset(terms)
+        self.results_label.setText("Recherche... 0%")
+        self.results_label.setVisible(True)
+        self.results_list.setVisible(True)
+        self.cancel_search_button.setVisible(True)
+        
+        thread.start()
+    
+    def cancel_search(self):
+        """Annule la recherche en cours ("Rechercher" ou "Tout trouver")"""
+        if self.find_worker is not None:
+            self.find_worker.cancel()
+            self.find_worker = None
+            self.cancel_search_button.setVisible(False)
+            self.results_label.setText("Recherche annulée")
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+            self.search_worker = None
+            self.cancel_search_button.setVisible(False)
+            self.results_label.setText(
+                f"Recherche annulée: {self.results_model.total_count():,} occurrence(s)"
+            )
+    
+    def stop_searches(self):
+        """Interrompt toutes les recherches et attend leurs threads"""
+        self.cancel_search()
+        for thread, worker in list(self.search_threads):
+            worker.cancel()
+            thread.quit()
+            thread.wait()
+    
+    def on_search_progress(self, percent):
+        """Affiche l'avancement de la recherche"""
+        if self.sender() is not self.search_worker:
+            return
+        self.results_label.setText(
+            f"Recherche... {percent}% ({self.results_model.total_count():,} occurrence(s))"
+        )
+    
+    def on_search_matches(self, batch):
+        """Ajoute un lot d'occurrences à la liste"""
+        if self.sender() is not self.search_worker:
+            return
+        self.results_model.append_matches(batch)
+    
+    def on_search_finished(self, count):
+        """Quand la recherche est terminée"""
+        if self.sender() is not self.search_worker:
+            return
+        self.search_worker = None
+        self.cancel_search_button.setVisible(False)
+        self.results_label.setText(f"{count:,} occurrence(s)")
+    
+    def on_search_failed(self, message):
+        """Quand la recherche a échoué"""
+        if self.sender() is not self.search_worker:
+            return
+        self.search_worker = None
+        self.cancel_search_button.setVisible(False)
+        self.results_label.setText("Échec de la recherche")
+        QMessageBox.warning(self, "Erreur", f"Erreur lors de la recherche:\n{message}")
+    
+    def on_search_thread_finished(self, thread, worker):
+        """Libère le thread d'une recherche terminée"""
+        self.search_threads = [
+            entry for entry in self.search_threads if entry[0] is not thread
+        ]
+        worker.deleteLater()
+        thread.deleteLater()
+    
+    def on_result_activated(self, index):
+        """Va à l'occurrence choisie dans la liste des résultats"""
+        offset, length = self.results_model.match_at(index.row())
+        self.show_match(offset, length)
+    
+    def show_match(self, offset, length):
+        """Place le curseur sur une occurrence et la surligne"""
+        self.offset_input.setText(f"0x{offset:08X}")
+        self.goto_offset()
+        self.highlight_selection(offset, length)
     
     def highlight_selection(self, start, length):
         """Surligne une sélection dans l'éditeur hex"""
         self.current_highlight = (start, length)
-        self.highlighter.rehighlight()
+        self.hex_display.set_highlight(start, length)
     
     def change_bytes_per_line(self, value):
         """Change le nombre de bytes par ligne"""
         self.bytes_per_line = int(value)
-        if self.data:
-            self.refresh_display()
+        self.hex_display.set_bytes_per_line(self.bytes_per_line)
     
     def write_value(self):
         """Écrit une valeur à la position courante"""
@@ -568,10 +616,11 @@ class HexPanel(QWidget):
             # Écrire les bytes
             self.data[self.current_offset:self.current_offset + len(new_bytes)] = new_bytes
             
-            # Rafraîchir l'affichage
-            self.refresh_display()
+            # Redessiner uniquement les lignes concernées
+            self.hex_display.update_offsets(self.current_offset, len(new_bytes))
             
-            # Émettre le signal de modification
+            # Émettre les signaux de modification
+            self.range_modified.emit(self.current_offset, len(new_bytes))
             self.data_modified.emit()
             
             QMessageBox.information(self, "Succès", "Valeur écrite")
@@ -0,0 +1,521 @@
+"""
+Vue hexadécimale virtualisée: seules les lignes visibles sont formatées et dessinées
+"""
+
+from PyQt6.QtWidgets import QAbstractScrollArea
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QFont, QFontMetrics, QPainter, QColor, QPalette
+
+# Valeur maximale d'une QScrollBar (entier 32 bits signé)
+SCROLL_LIMIT = 2**31 - 1
+
+# Conversion des octets non imprimables pour la colonne ASCII
+_ASCII_TABLE = bytes(b if 32 <= b < 127 else ord('.') for b in range(256))
+
+class HexView(QAbstractScrollArea):
+    """
+    Affichage hexadécimal dessiné directement depuis le buffer
+
+    Le coût d'affichage et de défilement ne dépend que du nombre de lignes
+    visibles. La barre de défilement est mise à l'échelle lorsque le nombre
+    de lignes dépasse la plage d'une QScrollBar.
+    """
+
+    # Signaux
+    cursor_moved = pyqtSignal(int)
+    selection_changed = pyqtSignal(int, int)  # début, fin (incluse)
+    bytes_edited = pyqtSignal(int, int)       # offset, longueur
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.data = None
+        self.bytes_per_line = 16
+        self.cursor_offset = 0
+        self.selection = None  # (début, fin incluse)
+        self.highlight = None  # (début, longueur)
+        self.read_only = False
+
+        # Édition en mode refrappe: quartet courant (0 = poids fort) et colonne
+        self.nibble = 0
+        self.ascii_mode = False
+
+        self._first_row = 0
+        self._syncing_scrollbar = False
+        self._anchor = None
+
+        font = QFont("Consolas", 10)
+        font.setStyleHint(QFont.StyleHint.Monospace)
+        self.setFont(font)
+
+        self.highlight_color = QColor(255, 255, 200)  # Jaune clair
+        self.selection_color = QColor(200, 230, 255)  # Bleu clair
+        self.cursor_color = QColor(255, 200, 120)     # Orange clair
+        self.nibble_color = QColor(240, 150, 50)      # Orange
+        self.offset_color = QColor(120, 120, 120)
+
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.viewport().setCursor(Qt.CursorShape.IBeamCursor)
+
+        self.verticalScrollBar().valueChanged.connect(self._on_vertical_scroll)
+        self.horizontalScrollBar().valueChanged.connect(lambda _: self.viewport().update())
+
+        self._update_metrics()
+
+    # ------------------------------------------------------------------
+    # Données et état
+    # ------------------------------------------------------------------
+
+    def set_data(self, data, read_only: bool = False):
+        """Définit le buffer affiché (bytes, bytearray, mmap...)"""
+        self.data = data
+        self.read_only = read_only or isinstance(data, bytes)
+        self.cursor_offset = 0
+        self.nibble = 0
+        self.selection = None
+        self.highlight = None
+        self._anchor = None
+        self._first_row = 0
+        self.refresh()
+
+    def set_bytes_per_line(self, bytes_per_line: int):
+        """Change le nombre d'octets par ligne en gardant le curseur visible"""
+        self.bytes_per_line = bytes_per_line
+        self._first_row = 0
+        self.refresh()
+        self.ensure_visible(self.cursor_offset, center=True)
+
+    def set_highlight(self, start: int, length: int):
+        """Surligne une plage d'octets (résultat de recherche)"""
+        self.highlight = (start, length) if length > 0 else None
+        self.viewport().update()
+
+    def refresh(self):
+        """Recalcule les barres de défilement et redessine la zone visible"""
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def data_size(self) -> int:
+        return len(self.data) if self.data is not None else 0
+
+    def total_rows(self) -> int:
+        return (self.data_size() + self.bytes_per_line - 1) // self.bytes_per_line
+
+    def visible_rows(self) -> int:
+        return max(1, self.viewport().height() // self.line_height)
+
+    def first_row(self) -> int:
+        return self._first_row
+
+    # ------------------------------------------------------------------
+    # Curseur et navigation
+    # ------------------------------------------------------------------
+
+    def set_cursor_offset(self, offset: int, center: bool = False, nibble: int = 0):
+        """Place le curseur sur un octet (et un quartet) et le rend visible"""
+        size = self.data_size()
+        if size == 0:
+            return
+
+        offset = max(0, min(offset, size - 1))
+        previous = self.cursor_offset
+        self.cursor_offset = offset
+        self.nibble = nibble
+        self.ensure_visible(offset, center)
+        self.update_offsets(previous, 1)
+        self.update_offsets(offset, 1)
+        self.cursor_moved.emit(offset)
+
+    def ensure_visible(self, offset: int, center: bool = False):
+        """Fait défiler la vue pour que l'octet soit visible"""
+        row = offset // self.bytes_per_line
+        visible = self.visible_rows()
+
+        if center:
+            self.set_first_row(row - visible // 2)
+        elif row < self._first_row:
+            self.set_first_row(row)
+        elif row >= self._first_row + visible:
+            self.set_first_row(row - visible + 1)
+
+    def set_first_row(self, row: int):
+        """Fait défiler la vue jusqu'à la ligne donnée"""
+        row = max(0, min(row, self._row_span()))
+        if row == self._first_row:
+            return
+
+        self._first_row = row
+        self._sync_vertical_scrollbar()
+        self.viewport().update()
+
+    def update_offsets(self, offset: int, length: int):
+        """Redessine uniquement les lignes contenant la plage donnée"""
+        if length <= 0:
+            return
+
+        first = offset // self.bytes_per_line - self._first_row
+        last = (offset + length - 1) // self.bytes_per_line - self._first_row
+        first = max(first, 0)
+        last = min(last, self.visible_rows())
+        if first > last:
+            return
+
+        width = self.viewport().width()
+        self.viewport().update(0, first * self.line_height, width,
+                               (last - first + 1) * self.line_height)
+
+    # ------------------------------------------------------------------
+    # Géométrie
+    # ------------------------------------------------------------------
+
+    def _update_metrics(self):
+        """Met à jour les dimensions des caractères"""
+        metrics = QFontMetrics(self.font())
+        self.char_width = max(1, metrics.horizontalAdvance('0'))
+        self.line_height = max(1, metrics.height())
+        self.ascent = metrics.ascent()
+
+    def _offset_digits(self) -> int:
+        return 16 if self.data_size() > 0xFFFFFFFF else 8
+
+    def _hex_column(self) -> int:
+        return self._offset_digits() + 2
+
+    def _ascii_column(self) -> int:
+        bpl = self.bytes_per_line
+        return self._hex_column() + bpl * 3 - 1 + (bpl - 1) // 8 + 2
+
+    def _byte_column(self, index: int) -> int:
+        """Colonne (en caractères) du premier chiffre hexa d'un octet de la ligne"""
+        return self._hex_column() + index * 3 + index // 8
+
+    def _row_span(self) -> int:
+        """Première ligne maximale pour le défilement"""
+        return max(self.total_rows() - self.visible_rows(), 0)
+
+    def _row_to_scroll(self, row: int) -> int:
+        span = self._row_span()
+        if span <= SCROLL_LIMIT:
+            return row
+        return row * SCROLL_LIMIT // span
+
+    def _scroll_to_row(self, value: int) -> int:
+        span = self._row_span()
+        if span <= SCROLL_LIMIT:
+            return value
+        return value * span // SCROLL_LIMIT
+
+    def _update_scrollbars(self):
+        """Adapte les plages des barres de défilement au contenu"""
+        self._first_row = max(0, min(self._first_row, self._row_span()))
+
+        vertical = self.verticalScrollBar()
+        self._syncing_scrollbar = True
+        vertical.setRange(0, min(self._row_span(), SCROLL_LIMIT))
+        vertical.setPageStep(self.visible_rows())
+        vertical.setSingleStep(1)
+        self._syncing_scrollbar = False
+        self._sync_vertical_scrollbar()
+
+        content_width = (self._ascii_column() + self.bytes_per_line + 1) * self.char_width
+        horizontal = self.horizontalScrollBar()
+        horizontal.setRange(0, max(0, content_width - self.viewport().width()))
+        horizontal.setPageStep(self.viewport().width())
+
+    def _sync_vertical_scrollbar(self):
+        self._syncing_scrollbar = True
+        self.verticalScrollBar().setValue(self._row_to_scroll(self._first_row))
+        self._syncing_scrollbar = False
+
+    def _on_vertical_scroll(self, value):
+        """Quand l'utilisateur déplace la barre de défilement"""
+        if self._syncing_scrollbar:
+            return
+        self._first_row = self._scroll_to_row(value)
+        self.viewport().update()
+
+    def offset_at(self, x: int, y: int):
+        """
+        Retourne l'offset de l'octet sous un point du viewport
+
+        Returns:
+            Offset ou None si le point n'est sur aucun octet
+        """
+        hit = self.hit_test(x, y)
+        return hit[0] if hit is not None else None
+
+    def hit_test(self, x: int, y: int):
+        """
+        Localise précisément un point du viewport
+
+        Returns:
+            Tuple (offset, colonne ASCII, quartet) ou None
+        """
+        if self.data_size() == 0:
+            return None
+
+        row = self._first_row + y // self.line_height
+        column = (x + self.horizontalScrollBar().value()) / self.char_width
+        bpl = self.bytes_per_line
+
+        hex_start = self._hex_column()
+        ascii_start = self._ascii_column()
+        nibble = 0
+        in_ascii = False
+
+        if hex_start <= column < ascii_start - 2:
+            relative = int(column - hex_start)
+            group, within = divmod(relative, 25)  # 8 octets * 3 + 1 espace
+            index = group * 8 + min(within // 3, 7)
+            nibble = 1 if within % 3 == 1 else 0
+        elif ascii_start <= column < ascii_start + bpl:
+            index = int(column - ascii_start)
+            in_ascii = True
+        else:
+            return None
+
+        index = min(index, bpl - 1)
+        offset = row * bpl + index
+        if offset >= self.data_size():
+            return None
+        return offset, in_ascii, nibble
+
+    # ------------------------------------------------------------------
+    # Édition
+    # ------------------------------------------------------------------
+
+    def write_nibble(self, value: int) -> bool:
+        """
+        Remplace le quartet sous le curseur puis avance
+
+        Returns:
+            True si l'octet a été modifié
+        """
+        offset = self.cursor_offset
+        byte = self.data[offset]
+        if self.nibble == 0:
+            byte = (byte & 0x0F) | (value << 4)
+        else:
+            byte = (byte & 0xF0) | value
+
+        self._patch(offset, byte)
+
+        if self.nibble == 0:
+            self.nibble = 1
+            self.update_offsets(offset, 1)
+        elif offset + 1 < self.data_size():
+            self.set_cursor_offset(offset + 1)
+        return True
+
+    def write_char(self, char: str) -> bool:
+        """Remplace l'octet sous le curseur par un caractère (colonne ASCII)"""
+        code = ord(char)
+        if code > 0xFF:
+            return False
+
+        offset = self.cursor_offset
+        self._patch(offset, code)
+        if offset + 1 < self.data_size():
+            self.set_cursor_offset(offset + 1)
+        return True
+
+    def _patch(self, offset: int, byte: int):
+        """Écrit un octet dans le buffer et signale la plage modifiée"""
+        self.data[offset] = byte
+        self.update_offsets(offset, 1)
+        self.bytes_edited.emit(offset, 1)
+
+    # ------------------------------------------------------------------
+    # Dessin
+    # ------------------------------------------------------------------
+
+    def paintEvent(self, event):
+        """Dessine uniquement les lignes intersectant la zone à rafraîchir"""
+        painter = QPainter(self.viewport())
+        rect = event.rect()
+        painter.fillRect(rect, self.palette().color(QPalette.ColorRole.Base))
+
+        if self.data_size() == 0:
+            return
+
+        painter.setFont(self.font())
+        painter.translate(-self.horizontalScrollBar().value(), 0)
+
+        first = self._first_row + rect.top() // self.line_height
+        last = min(self.total_rows(), self._first_row + rect.bottom() // self.line_height + 1)
+
+        for row in range(first, last):
+            self._paint_row(painter, row)
+
+    def _paint_row(self, painter, row: int):
+        """Formate et dessine une ligne"""
+        bpl = self.bytes_per_line
+        start = row * bpl
+        chunk = bytes(self.data[start:start + bpl])
+
+        y = (row - self._first_row) * self.line_height
+        baseline = y + self.ascent
+
+        self._paint_marks(painter, start, len(chunk), y)
+
+        # Offset
+        painter.setPen(self.offset_color)
+        painter.drawText(0, baseline, f"{start:0{self._offset_digits()}X}")
+
+        # Hexadécimal, par groupes de 8 octets
+        painter.setPen(self.palette().color(QPalette.ColorRole.Text))
+        hex_text = '  '.join(
+            chunk[k:k + 8].hex(' ').upper() for k in range(0, len(chunk), 8)
+        )
+        painter.drawText(self._hex_column() * self.char_width, baseline, hex_text)
+
+        # ASCII
+        ascii_text = chunk.translate(_ASCII_TABLE).decode('ascii')
+        painter.drawText(self._ascii_column() * self.char_width, baseline, ascii_text)
+
+    def _paint_marks(self, painter, start: int, length: int, y: int):
+        """Dessine les fonds (surlignage, sélection, curseur) d'une ligne"""
+        end = start + length
+        marks = []
+
+        if self.highlight is not None:
+            marks.append((self.highlight[0], self.highlight[0] + self.highlight[1],
+                          self.highlight_color))
+        if self.selection is not None:
+            marks.append((self.selection[0], self.selection[1] + 1, self.selection_color))
+        marks.append((self.cursor_offset, self.cursor_offset + 1, self.cursor_color))
+
+        cw = self.char_width
+        ascii_x = self._ascii_column() * cw
+
+        for mark_start, mark_end, color in marks:
+            first = max(mark_start, start)
+            last = min(mark_end, end)
+            for offset in range(first, last):
+                index = offset - start
+                painter.fillRect(self._byte_column(index) * cw, y, 2 * cw,
+                                 self.line_height, color)
+                painter.fillRect(ascii_x + index * cw, y, cw, self.line_height, color)
+
+        # Position d'édition: quartet (colonne hexa) ou caractère (colonne ASCII)
+        if start <= self.cursor_offset < end and self.hasFocus():
+            index = self.cursor_offset - start
+            if self.ascii_mode:
+                x = ascii_x + index * cw
+            else:
+                x = (self._byte_column(index) + self.nibble) * cw
+            painter.fillRect(x, y, cw, self.line_height, self.nibble_color)
+
+    # ------------------------------------------------------------------
+    # Événements
+    # ------------------------------------------------------------------
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == event.Type.FontChange:
+            self._update_metrics()
+            self.refresh()
+
+    def wheelEvent(self, event):
+        """Défilement par lignes (indépendant de la mise à l'échelle)"""
+        rows = -event.angleDelta().y() // 40
+        if rows:
+            self.set_first_row(self._first_row + rows)
+        event.accept()
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.MouseButton.LeftButton:
+            return super().mousePressEvent(event)
+
+        position = event.position()
+        hit = self.hit_test(int(position.x()), int(position.y()))
+        if hit is None:
+            return
+
+        offset, in_ascii, nibble = hit
+        self._anchor = offset
+        if self.selection is not None or in_ascii != self.ascii_mode:
+            self.selection = None
+            self.ascii_mode = in_ascii
+            self.viewport().update()
+        self.set_cursor_offset(offset, nibble=nibble)
+
+    def mouseMoveEvent(self, event):
+        if not (event.buttons() & Qt.MouseButton.LeftButton) or self._anchor is None:
+            return super().mouseMoveEvent(event)
+
+        position = event.position()
+        offset = self.offset_at(int(position.x()), int(position.y()))
+        if offset is None or offset == self._anchor:
+            return
+
+        self.selection = (min(self._anchor, offset), max(self._anchor, offset))
+        self.viewport().update()
+        self.selection_changed.emit(*self.selection)
+
+    def mouseReleaseEvent(self, event):
+        self._anchor = None
+        super().mouseReleaseEvent(event)
+
+    def focusInEvent(self, event):
+        super().focusInEvent(event)
+        self.update_offsets(self.cursor_offset, 1)
+
+    def focusOutEvent(self, event):
+        super().focusOutEvent(event)
+        self.update_offsets(self.cursor_offset, 1)
+
+    def keyPressEvent(self, event):
+        """Navigation et édition au clavier (mode refrappe)"""
+        if self.data_size() == 0:
+            return super().keyPressEvent(event)
+
+        key = event.key()
+        bpl = self.bytes_per_line
+        ctrl = bool(event.modifiers() & Qt.KeyboardModifier.ControlModifier)
+        page = bpl * self.visible_rows()
+        offset = self.cursor_offset
+
+        moves = {
+            Qt.Key.Key_Left: offset - 1,
+            Qt.Key.Key_Right: offset + 1,
+            Qt.Key.Key_Up: offset - bpl,
+            Qt.Key.Key_Down: offset + bpl,
+            Qt.Key.Key_PageUp: offset - page,
+            Qt.Key.Key_PageDown: offset + page,
+            Qt.Key.Key_Home: 0 if ctrl else offset - offset % bpl,
+            Qt.Key.Key_End: self.data_size() - 1 if ctrl else offset - offset % bpl + bpl - 1,
+        }
+
+        if key in moves:
+            self.set_cursor_offset(moves[key])
+            event.accept()
+            return
+
+        # Tab bascule entre les colonnes hexa et ASCII
+        if key == Qt.Key.Key_Tab:
+            self.ascii_mode = not self.ascii_mode
+            self.nibble = 0
+            self.update_offsets(offset, 1)
+            event.accept()
+            return
+
+        text = event.text()
+        if text and not ctrl and not self.read_only:
+            if self.ascii_mode and text.isprintable():
+                if self.write_char(text):
+                    event.accept()
+                    return
+            elif not self.ascii_mode and text in '0123456789abcdefABCDEF':
+                self.write_nibble(int(text, 16))
+                event.accept()
+                return
+
+        super().keyPressEvent(event)
+
+    def focusNextPrevChild(self, next):
+        # Tab est utilisé pour changer de colonne
+        return False
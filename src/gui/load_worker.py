@@ -0,0 +1,142 @@
+"""
+Chargement des sauvegardes en arrière-plan (lecture, analyse, recherche, indexation)
+et recherche de l'argent à la demande
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import List, Tuple, Any
+from PyQt6.QtCore import QObject, pyqtSignal
+from core.save_file import SaveFileManager, LoadCancelled
+from core.data_models import GameSave
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Libellés des étapes pour la barre de statut
+STAGE_LABELS = {
+    'read': "Lecture",
+    'parse': "Analyse",
+    'scan': "Recherche de l'argent",
+    'index': "Indexation",
+}
+
+@dataclass
+class LoadResult:
+    """Résultat complet d'un chargement, prêt à être affiché"""
+    manager: SaveFileManager
+    save: GameSave
+    # Lignes de l'arbre: (libellé de la catégorie, [(libellé, données utilisateur)])
+    tree_sections: List[Tuple[str, List[Tuple[str, Any]]]] = field(default_factory=list)
+
+class SaveLoadWorker(QObject):
+    """Charge une sauvegarde dans un SaveFileManager neuf, hors du thread GUI"""
+
+    # Signaux
+    progress = pyqtSignal(str, int)  # étape, pourcentage
+    loaded = pyqtSignal(object)      # LoadResult
+    preview = pyqtSignal(object)     # début des données (sauvegarde compressée)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, filepath: str, mode: str):
+        super().__init__()
+        self.filepath = filepath
+        self.mode = mode
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Demande l'arrêt du chargement (pris en compte entre deux blocs)"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def run(self):
+        """Exécute toutes les étapes du chargement"""
+        manager = SaveFileManager()
+
+        try:
+            save = manager.load_save_file(
+                self.filepath, self.mode,
+                progress=self.progress.emit,
+                cancel_event=self._cancel_event,
+                preview=self.preview.emit
+            )
+            if save is None:
+                self.failed.emit("Impossible de charger le fichier")
+                return
+
+            manager.find_money_candidates(
+                top_k=100,
+                progress=self.progress.emit,
+                cancel_event=self._cancel_event
+            )
+
+            self.progress.emit('index', 0)
+            sections = build_tree_sections(save)
+            manager.open_search_index()
+            self.progress.emit('index', 100)
+
+            if self._cancel_event.is_set():
+                raise LoadCancelled()
+
+            self.loaded.emit(LoadResult(manager, save, sections))
+
+        except LoadCancelled:
+            manager.close()
+            self.cancelled.emit()
+        except Exception as e:
+            logger.error(f"Erreur chargement: {e}")
+            manager.close()
+            self.failed.emit(str(e))
+
+class MoneyScanWorker(QObject):
+    """Recherche les emplacements possibles de l'argent d'une sauvegarde chargée"""
+
+    # Signaux
+    progress = pyqtSignal(str, int)  # étape, pourcentage
+    scanned = pyqtSignal(object)     # liste de MoneyCandidate
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, manager: SaveFileManager):
+        super().__init__()
+        self.manager = manager
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Demande l'arrêt de l'analyse"""
+        self._cancel_event.set()
+
+    def run(self):
+        """Analyse les données chargées (candidats conservés dans le gestionnaire)"""
+        try:
+            candidates = self.manager.find_money_candidates(
+                top_k=100,
+                progress=self.progress.emit,
+                cancel_event=self._cancel_event
+            )
+            self.scanned.emit(candidates)
+        except LoadCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            logger.error(f"Erreur recherche de l'argent: {e}")
+            self.failed.emit(str(e))
+
+def build_tree_sections(save: GameSave):
+    """Prépare le contenu de l'arbre de navigation (sans widgets)"""
+    cities = [
+        (f"{city.name} (Pop: {city.population:,})", ("city", city.id))
+        for city in save.cities
+    ]
+    vehicles = [
+        (f"{vehicle.name} ({vehicle.vehicle_type})", ("vehicle", vehicle.id))
+        for vehicle in save.vehicles
+    ]
+
+    return [
+        (f"Villes ({len(save.cities)})", cities),
+        (f"Véhicules ({len(save.vehicles)})", vehicles),
+        (f"Industries ({len(save.industries)})", []),
+    ]
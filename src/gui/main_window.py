@@ -8,12 +8,14 @@ from PyQt6.QtWidgets import (
     QPushButton, QLabel, QFileDialog, QTreeWidget,
     QTreeWidgetItem, QSplitter, QTextEdit, QDockWidget,
     QMessageBox, QStatusBar, QTabWidget, QGroupBox,
-    QSpinBox, QLineEdit, QFormLayout, QMenuBar, QMenu
+    QLineEdit, QFormLayout, QMenuBar, QMenu,
+    QProgressBar
 )
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QThread, QTimer
 from PyQt6.QtGui import QAction, QIcon, QFont
-from core.save_file import SaveFileManager
+from core.save_file import SaveFileManager, LOAD_MODE_COW, LOAD_MODE_READONLY
 from core.data_models import GameSave
+from .money_edit import MoneyEdit
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -27,6 +29,15 @@ class MainWindow(QMainWindow):
         self.current_save: GameSave = None
         self.modified = False
         
+        # Chargement en arrière-plan: worker actif et threads encore vivants
+        self.load_worker = None
+        self.load_threads = []
+        self.index_worker = None
+        self.scan_worker = None
+        
+        # Panneau hexadécimal créé à la première ouverture de son onglet
+        self._hex_panel = None
+        
         # Initialisation UI
         self.init_ui()
         self.setup_connections()
@@ -46,7 +57,9 @@ class MainWindow(QMainWindow):
         self.create_toolbar()
         self.create_central_widget()
         self.create_status_bar()
-        self.create_dock_widgets()
+        
+        # Panneaux ancrés créés après le premier affichage de la fenêtre
+        QTimer.singleShot(0, self.create_dock_widgets)
     
     def create_menu_bar(self):
         """Crée la barre de menu"""
@@ -59,6 +72,9 @@ class MainWindow(QMainWindow):
         self.open_action.setShortcut("Ctrl+O")
         file_menu.addAction(self.open_action)
         
+        self.open_readonly_action = QAction("Ouvrir en &lecture seule...", self)
+        file_menu.addAction(self.open_readonly_action)
+        
         self.save_action = QAction("&Enregistrer", self)
         self.save_action.setShortcut("Ctrl+S")
         self.save_action.setEnabled(False)
@@ -100,8 +116,17 @@ class MainWindow(QMainWindow):
         tools_menu.addAction(self.hex_editor_action)
         
         self.find_offset_action = QAction("&Trouver offset...", self)
+        self.find_offset_action.setEnabled(False)
         tools_menu.addAction(self.find_offset_action)
         
+        self.value_hunter_action = QAction("&Chasse aux valeurs...", self)
+        self.value_hunter_action.setEnabled(False)
+        tools_menu.addAction(self.value_hunter_action)
+        
+        self.build_index_action = QAction("&Indexer pour la recherche", self)
+        self.build_index_action.setEnabled(False)
+        tools_menu.addAction(self.build_index_action)
+        
         # Menu Aide
         help_menu = menubar.addMenu("&Aide")
         
@@ -129,9 +154,8 @@ class MainWindow(QMainWindow):
         
         # Éditeur d'argent rapide
         toolbar.addWidget(QLabel("Argent:"))
-        self.money_spinbox = QSpinBox()
-        self.money_spinbox.setRange(-1000000000, 10000000000)
-        self.money_spinbox.setValue(0)
+        self.money_spinbox = MoneyEdit()
+        self.money_spinbox.setFixedWidth(160)
         self.money_spinbox.setEnabled(False)
         self.money_spinbox.valueChanged.connect(self.on_money_changed)
         toolbar.addWidget(self.money_spinbox)
@@ -185,10 +209,9 @@ class MainWindow(QMainWindow):
         self.property_editor.setPlaceholderText("Sélectionnez un élément pour éditer ses propriétés...")
         self.tab_widget.addTab(self.property_editor, "Propriétés")
         
-        # Onglet Vue hexadécimale
-        from .hex_panel import HexPanel
-        self.hex_panel = HexPanel()
-        self.tab_widget.addTab(self.hex_panel, "Hexadécimal")
+        # Onglet Vue hexadécimale (HexPanel créé à la première utilisation)
+        self.hex_placeholder = QWidget()
+        self.tab_widget.addTab(self.hex_placeholder, "Hexadécimal")
         
         # Onglet Vue carte (à implémenter)
         self.map_viewer = QWidget()
@@ -209,6 +232,18 @@ class MainWindow(QMainWindow):
         self.status_bar.showMessage("Prêt")
         self.setStatusBar(self.status_bar)
         
+        # Progression du chargement
+        self.load_progress = QProgressBar()
+        self.load_progress.setFixedWidth(200)
+        self.load_progress.setRange(0, 100)
+        self.load_progress.setVisible(False)
+        self.status_bar.addPermanentWidget(self.load_progress)
+        
+        self.cancel_load_button = QPushButton("Annuler")
+        self.cancel_load_button.setVisible(False)
+        self.cancel_load_button.clicked.connect(self.cancel_loading)
+        self.status_bar.addPermanentWidget(self.cancel_load_button)
+        
         # Indicateur de modification
         self.modified_label = QLabel("")
         self.status_bar.addPermanentWidget(self.modified_label)
@@ -225,16 +260,60 @@ class MainWindow(QMainWindow):
     def setup_connections(self):
         """Connecte les signaux et slots"""
         self.open_action.triggered.connect(self.open_file)
+        self.open_readonly_action.triggered.connect(self.open_file_readonly)
         self.save_action.triggered.connect(self.save_file)
         self.save_as_action.triggered.connect(self.save_file_as)
         self.export_json_action.triggered.connect(self.export_json)
         self.edit_money_action.triggered.connect(self.edit_money_dialog)
         self.hex_editor_action.triggered.connect(self.show_hex_editor)
+        self.find_offset_action.triggered.connect(self.find_money_offset_dialog)
+        self.build_index_action.triggered.connect(self.build_search_index)
+        self.value_hunter_action.triggered.connect(self.show_value_hunter)
         
         self.tree_widget.itemClicked.connect(self.on_tree_item_clicked)
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+    
+    @property
+    def hex_panel(self):
+        """Panneau hexadécimal (créé au premier accès)"""
+        if self._hex_panel is None:
+            self.create_hex_panel()
+        return self._hex_panel
+    
+    def create_hex_panel(self):
+        """Remplace l'onglet provisoire par le panneau hexadécimal"""
+        from .hex_panel import HexPanel
+        panel = HexPanel()
+        panel.range_modified.connect(self.on_hex_range_modified)
+        self._hex_panel = panel
+        
+        index = self.tab_widget.indexOf(self.hex_placeholder)
+        current = self.tab_widget.currentIndex()
+        self.tab_widget.blockSignals(True)
+        self.tab_widget.removeTab(index)
+        self.tab_widget.insertTab(index, panel, "Hexadécimal")
+        self.tab_widget.setCurrentIndex(current)
+        self.tab_widget.blockSignals(False)
+        self.hex_placeholder.deleteLater()
+        self.hex_placeholder = None
+        
+        self.show_hex_data()
+    
+    def on_tab_changed(self, index):
+        """Crée le panneau hexadécimal quand son onglet est ouvert"""
+        if self._hex_panel is None and self.tab_widget.widget(index) is self.hex_placeholder:
+            self.create_hex_panel()
     
     def open_file(self):
         """Ouvre un fichier de sauvegarde"""
+        self.ask_and_load(LOAD_MODE_COW)
+    
+    def open_file_readonly(self):
+        """Ouvre un fichier de sauvegarde en lecture seule (visualisation)"""
+        self.ask_and_load(LOAD_MODE_READONLY)
+    
+    def ask_and_load(self, mode):
+        """Demande un fichier à l'utilisateur et le charge dans le mode donné"""
         filepath, _ = QFileDialog.getOpenFileName(
             self,
             "Ouvrir une sauvegarde Transport Fever 2",
@@ -243,42 +322,152 @@ class MainWindow(QMainWindow):
         )
         
         if filepath:
-            self.load_save_file(filepath)
+            self.load_save_file(filepath, mode)
     
-    def load_save_file(self, filepath):
-        """Charge et affiche une sauvegarde"""
-        try:
-            self.current_save = self.save_manager.load_save_file(filepath)
-            
-            if self.current_save:
-                # Mettre à jour l'interface
-                self.update_file_info()
-                self.populate_tree()
-                self.update_money_display()
-                
-                # Activer les fonctionnalités
-                self.save_action.setEnabled(True)
-                self.save_as_action.setEnabled(True)
-                self.save_btn.setEnabled(True)
-                self.export_json_action.setEnabled(True)
-                self.edit_money_action.setEnabled(True)
-                self.unlock_all_action.setEnabled(True)
-                self.money_spinbox.setEnabled(True)
-                
-                # Charger les données hexa
-                self.hex_panel.set_data(self.save_manager.raw_data)
-                
-                self.status_bar.showMessage(f"Chargé: {os.path.basename(filepath)}")
-                self.modified = False
-                self.update_modified_indicator()
-                
-                logger.info(f"Fichier chargé avec succès: {filepath}")
-            else:
-                QMessageBox.warning(self, "Erreur", "Impossible de charger le fichier")
-                
-        except Exception as e:
-            logger.error(f"Erreur chargement: {e}")
-            QMessageBox.critical(self, "Erreur", f"Erreur lors du chargement:\n{str(e)}")
+    def load_save_file(self, filepath, mode=LOAD_MODE_COW):
+        """Charge une sauvegarde en arrière-plan (annule le chargement en cours)"""
+        self.cancel_loading()
+        
+        from .load_worker import SaveLoadWorker
+        worker = SaveLoadWorker(filepath, mode)
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.on_load_progress)
+        worker.preview.connect(self.on_load_preview)
+        worker.loaded.connect(self.on_load_finished)
+        worker.failed.connect(self.on_load_failed)
+        worker.cancelled.connect(self.on_load_cancelled)
+        for signal in (worker.loaded, worker.failed, worker.cancelled):
+            signal.connect(thread.quit)
+        thread.finished.connect(lambda: self.on_load_thread_finished(thread, worker))
+        
+        self.load_worker = worker
+        self.load_threads.append((thread, worker))
+        
+        self.load_progress.setValue(0)
+        self.load_progress.setVisible(True)
+        self.cancel_load_button.setVisible(True)
+        self.status_bar.showMessage(f"Chargement: {os.path.basename(filepath)}...")
+        
+        thread.start()
+    
+    def cancel_loading(self):
+        """Annule le chargement en cours s'il y en a un"""
+        if self.load_worker is not None:
+            self.load_worker.cancel()
+            self.load_worker = None
+            self.show_hex_data()
+            self.end_loading("Chargement annulé")
+    
+    def end_loading(self, message):
+        """Masque les indicateurs de chargement"""
+        self.load_progress.setVisible(False)
+        self.cancel_load_button.setVisible(False)
+        self.status_bar.showMessage(message)
+    
+    def on_load_progress(self, stage, percent):
+        """Affiche l'avancement d'une étape du chargement"""
+        if self.sender() is not self.load_worker:
+            return
+        
+        from .load_worker import STAGE_LABELS
+        self.load_progress.setFormat(f"{STAGE_LABELS.get(stage, stage)} %p%")
+        self.load_progress.setValue(percent)
+    
+    def on_load_preview(self, data):
+        """Affiche le début d'une sauvegarde compressée pendant sa décompression"""
+        if self.sender() is not self.load_worker:
+            return
+        if self._hex_panel is not None:
+            self._hex_panel.set_data(data, True)
+        self.status_bar.showMessage("Aperçu (décompression en cours)...")
+    
+    def show_hex_data(self):
+        """Affiche dans le panneau hexa les données de la sauvegarde courante"""
+        panel = self._hex_panel
+        if panel is None:
+            # Données transmises à la création du panneau
+            return
+        manager = self.save_manager
+        if manager.raw_data is None:
+            panel.set_data(b'', True)
+            return
+        panel.set_data(
+            manager.raw_data, manager.is_read_only,
+            manager.search_source_path, manager.dirty_ranges
+        )
+        panel.set_search_index(manager.search_index)
+    
+    def on_load_finished(self, result):
+        """Remplace atomiquement la sauvegarde affichée par celle chargée"""
+        worker = self.sender()
+        if worker is not self.load_worker:
+            # Chargement remplacé entre-temps: résultat ignoré
+            result.manager.close()
+            return
+        self.load_worker = None
+        
+        previous_manager = self.save_manager
+        self.save_manager = result.manager
+        self.current_save = result.save
+        
+        # Mettre à jour l'interface
+        self.update_file_info()
+        self.populate_tree(result.tree_sections)
+        self.update_money_display()
+        
+        # Activer les fonctionnalités
+        writable = not self.save_manager.is_read_only
+        self.save_action.setEnabled(writable)
+        self.save_as_action.setEnabled(True)
+        self.save_btn.setEnabled(writable)
+        self.export_json_action.setEnabled(True)
+        self.edit_money_action.setEnabled(writable)
+        self.unlock_all_action.setEnabled(writable)
+        self.money_spinbox.setEnabled(writable)
+        self.find_offset_action.setEnabled(True)
+        self.build_index_action.setEnabled(True)
+        self.value_hunter_action.setEnabled(True)
+        
+        # Recherche de l'argent de l'ancienne sauvegarde: résultat inutile
+        if self.scan_worker is not None:
+            self.scan_worker.cancel()
+            self.scan_worker = None
+        
+        # Charger les données hexa, puis libérer l'ancienne sauvegarde
+        self.show_hex_data()
+        previous_manager.close()
+        
+        suffix = "" if writable else " (lecture seule)"
+        self.end_loading(f"Chargé: {os.path.basename(worker.filepath)}{suffix}")
+        self.modified = False
+        self.update_modified_indicator()
+        
+        logger.info(f"Fichier chargé avec succès: {worker.filepath}")
+    
+    def on_load_failed(self, message):
+        """Quand le chargement a échoué"""
+        if self.sender() is not self.load_worker:
+            return
+        self.load_worker = None
+        
+        self.show_hex_data()
+        self.end_loading("Échec du chargement")
+        QMessageBox.warning(self, "Erreur", f"Impossible de charger le fichier:\n{message}")
+    
+    def on_load_cancelled(self):
+        """Quand un chargement a été interrompu"""
+        logger.info("Chargement interrompu")
+    
+    def on_load_thread_finished(self, thread, worker):
+        """Libère le thread d'un chargement terminé"""
+        self.load_threads = [
+            entry for entry in self.load_threads if entry[0] is not thread
+        ]
+        worker.deleteLater()
+        thread.deleteLater()
     
     def update_file_info(self):
         """Met à jour les informations du fichier"""
@@ -287,13 +476,17 @@ class MainWindow(QMainWindow):
             self.size_label.setText(f"{self.current_save.file_size:,} octets")
             self.version_label.setText(self.current_save.game_version)
     
-    def populate_tree(self):
+    def populate_tree(self, sections=None):
         """Remplit l'arbre de navigation"""
         self.tree_widget.clear()
         
         if not self.current_save:
             return
         
+        if sections is None:
+            from .load_worker import build_tree_sections
+            sections = build_tree_sections(self.current_save)
+        
         # Racine: La sauvegarde
         root = QTreeWidgetItem(self.tree_widget, [f"Sauvegarde: {self.current_save.filename}"])
         root.setData(0, Qt.ItemDataRole.UserRole, "save_root")
@@ -302,21 +495,12 @@ class MainWindow(QMainWindow):
         money_item = QTreeWidgetItem(root, [f"Argent: {self.current_save.money:,} €"])
         money_item.setData(0, Qt.ItemDataRole.UserRole, "money")
         
-        # Villes
-        cities_item = QTreeWidgetItem(root, [f"Villes ({len(self.current_save.cities)})"])
-        for city in self.current_save.cities:
-            city_item = QTreeWidgetItem(cities_item, [f"{city.name} (Pop: {city.population:,})"])
-            city_item.setData(0, Qt.ItemDataRole.UserRole, ("city", city.id))
-        
-        # Véhicules
-        vehicles_item = QTreeWidgetItem(root, [f"Véhicules ({len(self.current_save.vehicles)})"])
-        for vehicle in self.current_save.vehicles:
-            vehicle_item = QTreeWidgetItem(vehicles_item, 
-                [f"{vehicle.name} ({vehicle.vehicle_type})"])
-            vehicle_item.setData(0, Qt.ItemDataRole.UserRole, ("vehicle", vehicle.id))
-        
-        # Industries
-        industries_item = QTreeWidgetItem(root, [f"Industries ({len(self.current_save.industries)})"])
+        # Villes, véhicules, industries (préparés par le worker)
+        for title, entries in sections:
+            section_item = QTreeWidgetItem(root, [title])
+            for label, user_data in entries:
+                item = QTreeWidgetItem(section_item, [label])
+                item.setData(0, Qt.ItemDataRole.UserRole, user_data)
         
         # Développer tout
         self.tree_widget.expandAll()
@@ -328,14 +512,23 @@ class MainWindow(QMainWindow):
             self.money_spinbox.setValue(self.current_save.money)
     
     def on_money_changed(self, value):
-        """Quand l'argent est modifié via le spinbox"""
+        """Quand l'argent est modifié via le champ de la barre d'outils"""
         if self.current_save and self.current_save.money != value:
+            if not self.confirm_money_offset():
+                self.money_spinbox.setValue(self.current_save.money)
+                return
             self.current_save.money = value
             self.modified = True
             self.update_modified_indicator()
             self.update_money_display()
             logger.info(f"Argent modifié: {value}")
     
+    def on_hex_range_modified(self, offset, length):
+        """Quand des octets sont modifiés dans l'éditeur hexadécimal"""
+        self.save_manager.mark_dirty(offset, length)
+        self.modified = True
+        self.update_modified_indicator()
+    
     def save_file(self):
         """Enregistre le fichier courant"""
         if not self.current_save:
@@ -344,6 +537,9 @@ class MainWindow(QMainWindow):
         success = self.save_manager.save_to_file(self.current_save.filepath)
         
         if success:
+            # L'index a été mis à jour, ou abandonné s'il y avait trop de modifications
+            if self._hex_panel is not None:
+                self._hex_panel.set_search_index(self.save_manager.search_index)
             self.modified = False
             self.update_modified_indicator()
             self.status_bar.showMessage(f"Enregistré: {self.current_save.filename}", 3000)
@@ -373,20 +569,26 @@ class MainWindow(QMainWindow):
         if not self.current_save:
             return
         
-        filepath, _ = QFileDialog.getSaveFileName(
+        filepath, selected_filter = QFileDialog.getSaveFileName(
             self,
             "Exporter en JSON",
             f"{self.current_save.filename}.json",
-            "Fichiers JSON (*.json);;Tous les fichiers (*.*)"
+            "Fichiers JSON (*.json);;JSON par ligne (*.ndjson *.jsonl);;"
+            "Colonnes NumPy (*.npz);;Tous les fichiers (*.*)"
         )
         
         if filepath:
-            self.save_manager.export_to_json(filepath)
+            if filepath.endswith('.npz') or 'npz' in selected_filter:
+                self.save_manager.export_to_columns(filepath)
+            elif filepath.endswith(('.ndjson', '.jsonl')) or 'ndjson' in selected_filter:
+                self.save_manager.export_to_ndjson(filepath)
+            else:
+                self.save_manager.export_to_json(filepath)
             QMessageBox.information(self, "Succès", f"Export JSON réussi:\n{filepath}")
     
     def edit_money_dialog(self):
         """Ouvre une boîte de dialogue pour modifier l'argent"""
-        if not self.current_save:
+        if not self.current_save or not self.confirm_money_offset():
             return
         
         from .money_editor import MoneyEditorDialog
@@ -399,6 +601,175 @@ class MainWindow(QMainWindow):
             self.update_modified_indicator()
             self.update_money_display()
     
+    def confirm_money_offset(self) -> bool:
+        """
+        Vérifie que l'emplacement de l'argent est connu avant une modification
+        
+        Sinon l'utilisateur choisit parmi les candidats (jamais d'écriture à
+        un emplacement deviné).
+        """
+        if self.save_manager.has_money_offset():
+            return True
+        QMessageBox.information(
+            self, "Emplacement de l'argent",
+            "L'emplacement de l'argent dans ce fichier n'est pas connu.\n"
+            "Choisissez-le parmi les candidats avant de modifier la valeur.")
+        self.find_money_offset_dialog()
+        return self.save_manager.has_money_offset()
+    
+    def find_money_offset_dialog(self):
+        """Propose les emplacements possibles de l'argent"""
+        if not self.current_save:
+            return
+        
+        candidates = self.save_manager.money_candidates
+        if not candidates:
+            # Analyse en arrière-plan; le dialogue s'ouvre à la fin
+            self.scan_money_candidates()
+            return
+        self.show_money_candidates(candidates)
+    
+    def scan_money_candidates(self):
+        """Recherche les emplacements de l'argent hors du thread GUI"""
+        if self.scan_worker is not None:
+            return
+        
+        from .load_worker import MoneyScanWorker
+        worker = MoneyScanWorker(self.save_manager)
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.on_scan_progress)
+        worker.scanned.connect(self.on_scan_finished)
+        worker.failed.connect(self.on_scan_failed)
+        worker.cancelled.connect(self.on_scan_failed)
+        for signal in (worker.scanned, worker.failed, worker.cancelled):
+            signal.connect(thread.quit)
+        thread.finished.connect(lambda: self.on_load_thread_finished(thread, worker))
+        
+        self.scan_worker = worker
+        self.load_threads.append((thread, worker))
+        self.find_offset_action.setEnabled(False)
+        self.status_bar.showMessage("Recherche de l'argent...")
+        
+        thread.start()
+    
+    def on_scan_progress(self, stage, percent):
+        """Affiche l'avancement de la recherche de l'argent"""
+        if self.sender() is self.scan_worker:
+            self.status_bar.showMessage(f"Recherche de l'argent: {percent}%")
+    
+    def on_scan_finished(self, candidates):
+        """Propose les candidats trouvés (si la sauvegarde n'a pas changé entre-temps)"""
+        worker = self.sender()
+        if worker is not self.scan_worker:
+            return
+        self.scan_worker = None
+        self.find_offset_action.setEnabled(True)
+        self.status_bar.showMessage(f"{len(candidates)} emplacement(s) possible(s)", 3000)
+        
+        if worker.manager is self.save_manager:
+            self.update_money_display()
+            self.show_money_candidates(candidates)
+    
+    def on_scan_failed(self, message=None):
+        """Quand la recherche de l'argent a échoué ou a été annulée"""
+        if self.sender() is not self.scan_worker:
+            return
+        self.scan_worker = None
+        self.find_offset_action.setEnabled(True)
+        self.status_bar.showMessage("Échec de la recherche de l'argent" if message
+                                    else "Recherche de l'argent annulée")
+    
+    def show_money_candidates(self, candidates):
+        """Laisse l'utilisateur choisir l'emplacement de l'argent parmi les candidats"""
+        from .offset_finder import MoneyCandidatesDialog
+        dialog = MoneyCandidatesDialog(candidates, self)
+        
+        if dialog.exec():
+            candidate = dialog.get_selected()
+            if candidate is None:
+                return
+            
+            self.save_manager.set_money_offset(candidate.offset)
+            self.update_money_display()
+            self.populate_tree()
+            
+            # Montrer l'emplacement dans la vue hexadécimale
+            self.hex_panel.offset_input.setText(f"0x{candidate.offset:08X}")
+            self.hex_panel.goto_offset()
+            self.show_hex_editor()
+    
+    def show_value_hunter(self):
+        """Ouvre la recherche différentielle de valeurs sur la sauvegarde chargée"""
+        if not self.current_save:
+            return
+        
+        from .value_hunter_dialog import ValueHunterDialog
+        dialog = ValueHunterDialog(self.save_manager.filepath, self)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.offset_selected.connect(self.show_offset)
+        dialog.show()
+    
+    def show_offset(self, offset, length):
+        """Montre une plage d'octets dans l'éditeur hexadécimal"""
+        self.hex_panel.show_match(offset, length)
+        self.show_hex_editor()
+    
+    def build_search_index(self):
+        """Construit l'index de recherche de la sauvegarde en arrière-plan"""
+        if not self.current_save or self.index_worker is not None:
+            return
+        
+        from .search_worker import IndexBuildWorker
+        worker = IndexBuildWorker(self.save_manager)
+        thread = QThread(self)
+        worker.moveToThread(thread)
+        
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.on_index_progress)
+        worker.built.connect(self.on_index_built)
+        worker.failed.connect(self.on_index_failed)
+        worker.cancelled.connect(self.on_index_failed)
+        for signal in (worker.built, worker.failed, worker.cancelled):
+            signal.connect(thread.quit)
+        thread.finished.connect(lambda: self.on_load_thread_finished(thread, worker))
+        
+        self.index_worker = worker
+        self.load_threads.append((thread, worker))
+        self.build_index_action.setEnabled(False)
+        self.status_bar.showMessage("Indexation...")
+        
+        thread.start()
+    
+    def on_index_progress(self, percent):
+        """Affiche l'avancement de l'indexation"""
+        if self.sender() is self.index_worker:
+            self.status_bar.showMessage(f"Indexation: {percent}%")
+    
+    def on_index_built(self, index):
+        """Utilise l'index qui vient d'être construit"""
+        worker = self.sender()
+        if worker is not self.index_worker:
+            return
+        self.index_worker = None
+        self.build_index_action.setEnabled(True)
+        
+        # Sauvegarde remplacée pendant l'indexation: index ignoré
+        if worker.manager is self.save_manager:
+            if self._hex_panel is not None:
+                self._hex_panel.set_search_index(index)
+            self.status_bar.showMessage("Index de recherche prêt")
+    
+    def on_index_failed(self, message=None):
+        """Quand l'indexation a échoué ou a été annulée"""
+        if self.sender() is not self.index_worker:
+            return
+        self.index_worker = None
+        self.build_index_action.setEnabled(True)
+        self.status_bar.showMessage("Échec de l'indexation" if message else "Indexation annulée")
+    
     def show_hex_editor(self):
         """Affiche l'éditeur hexadécimal"""
         self.tab_widget.setCurrentWidget(self.hex_panel)
@@ -460,5 +831,18 @@ class MainWindow(QMainWindow):
                 event.ignore()
                 return
         
+        # Arrêter les chargements en cours
+        self.cancel_loading()
+        for thread, worker in list(self.load_threads):
+            worker.cancel()
+            thread.quit()
+            thread.wait()
+        
+        # Arrêter les recherches en cours et leurs processus
+        if self._hex_panel is not None:
+            self._hex_panel.stop_searches()
+        from utils.parallel_search import shutdown_executor
+        shutdown_executor()
+        
         logger.info("Application fermée")
         event.accept()
@@ -0,0 +1,54 @@
+"""
+Saisie d'un montant entier 64 bits (QSpinBox est limité à 32 bits)
+"""
+
+from PyQt6.QtWidgets import QLineEdit
+from PyQt6.QtCore import QRegularExpression, pyqtSignal
+from PyQt6.QtGui import QRegularExpressionValidator
+
+# Bornes d'un entier signé 64 bits (type '<q' de l'argent)
+MONEY_MIN = -(1 << 63)
+MONEY_MAX = (1 << 63) - 1
+
+class MoneyEdit(QLineEdit):
+    """Champ de saisie d'un entier signé 64 bits"""
+
+    # Signaux
+    valueChanged = pyqtSignal(object)  # nouvelle valeur (int), à la fin de la saisie
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._value = 0
+        self.setValidator(QRegularExpressionValidator(QRegularExpression(r"-?\d{0,19}"), self))
+        self.setText("0")
+        self.editingFinished.connect(self._on_editing_finished)
+
+    def value(self) -> int:
+        """Valeur saisie, ou la dernière valeur valide si la saisie est hors limites"""
+        value = self._parse()
+        return self._value if value is None else value
+
+    def setValue(self, value: int):
+        """Affiche une valeur (sans émettre valueChanged)"""
+        self._value = int(value)
+        self.setText(str(self._value))
+        # Valeur impossible à réécrire telle quelle: affichée en lecture seule
+        self.setReadOnly(not MONEY_MIN <= self._value <= MONEY_MAX)
+
+    def _parse(self):
+        """Entier saisi, ou None s'il est incomplet ou hors limites"""
+        try:
+            value = int(self.text())
+        except ValueError:
+            return None
+        return value if MONEY_MIN <= value <= MONEY_MAX else None
+
+    def _on_editing_finished(self):
+        value = self._parse()
+        if value is None:
+            # Saisie invalide: retour à la dernière valeur
+            self.setText(str(self._value))
+            return
+        if value != self._value:
+            self._value = value
+            self.valueChanged.emit(value)
@@ -4,10 +4,11 @@ Boîte de dialogue pour éditer l'argent
 
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel,
-    QSpinBox, QPushButton, QGroupBox, QFormLayout,
+    QPushButton, QGroupBox, QFormLayout,
     QRadioButton, QButtonGroup, QMessageBox
 )
 from PyQt6.QtCore import Qt
+from .money_edit import MoneyEdit
 
 class MoneyEditorDialog(QDialog):
     """Dialogue pour modifier l'argent du jeu"""
@@ -46,17 +47,13 @@ class MoneyEditorDialog(QDialog):
         manual_layout = QHBoxLayout()
         manual_layout.addWidget(QLabel("Montant:"))
         
-        self.money_spinbox = QSpinBox()
-        self.money_spinbox.setRange(-1000000000, 100000000000)
+        # Entier 64 bits: l'argent peut dépasser les limites d'un QSpinBox
+        self.money_spinbox = MoneyEdit()
         self.money_spinbox.setValue(self.current_money)
-        self.money_spinbox.setSingleStep(1000)
-        self.money_spinbox.setSuffix(" €")
         self.money_spinbox.valueChanged.connect(self.on_value_changed)
         
-        # Format avec séparateurs de milliers
-        self.money_spinbox.setDisplayIntegerBase(10)
-        
         manual_layout.addWidget(self.money_spinbox)
+        manual_layout.addWidget(QLabel("€"))
         manual_layout.addStretch()
         edit_layout.addLayout(manual_layout)
         
@@ -124,6 +121,10 @@ class MoneyEditorDialog(QDialog):
     
     def accept(self):
         """Confirme la modification"""
+        # Saisie en cours (Entrée sans quitter le champ)
+        if self.money_spinbox.value() != self.selected_value:
+            self.on_value_changed(self.money_spinbox.value())
+        
         if self.selected_value == self.current_money:
             QMessageBox.information(self, "Information", 
                                   "La valeur n'a pas changé.")
@@ -0,0 +1,83 @@
+"""
+Boîte de dialogue listant les emplacements possibles de l'argent
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+    QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QAbstractItemView
+)
+from PyQt6.QtCore import Qt
+
+class MoneyCandidatesDialog(QDialog):
+    """Dialogue pour choisir l'offset de l'argent parmi les candidats"""
+
+    def __init__(self, candidates, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Trouver l'offset de l'argent")
+        self.setModal(True)
+        self.resize(500, 400)
+
+        self.candidates = candidates
+
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialise l'interface"""
+        layout = QVBoxLayout()
+
+        layout.addWidget(QLabel(
+            f"{len(self.candidates)} candidat(s), du plus probable au moins probable:"
+        ))
+
+        # Tableau des candidats
+        self.table = QTableWidget(len(self.candidates), 3)
+        self.table.setHorizontalHeaderLabels(["Offset", "Valeur", "Score"])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+
+        for row, candidate in enumerate(self.candidates):
+            values = [
+                f"0x{candidate.offset:08X}",
+                f"{candidate.value:,} €",
+                f"{candidate.score:.2f}"
+            ]
+            for column, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+        if self.candidates:
+            self.table.selectRow(0)
+
+        self.table.doubleClicked.connect(self.accept)
+        layout.addWidget(self.table)
+
+        # Boutons
+        button_layout = QHBoxLayout()
+
+        self.cancel_button = QPushButton("Annuler")
+        self.cancel_button.clicked.connect(self.reject)
+
+        self.use_button = QPushButton("Utiliser cet offset")
+        self.use_button.clicked.connect(self.accept)
+        self.use_button.setDefault(True)
+        self.use_button.setEnabled(bool(self.candidates))
+
+        button_layout.addWidget(self.cancel_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.use_button)
+
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def get_selected(self):
+        """Retourne le candidat sélectionné ou None"""
+        row = self.table.currentRow()
+        if 0 <= row < len(self.candidates):
+            return self.candidates[row]
+        return None
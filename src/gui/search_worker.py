@@ -0,0 +1,233 @@
+"""
+Recherche "Tout trouver" en arrière-plan et liste paresseuse des résultats
+"""
+
+import threading
+from array import array
+from typing import List, Optional, Tuple
+from PyQt6.QtCore import QObject, QAbstractListModel, QModelIndex, Qt, pyqtSignal
+from utils.parallel_search import ParallelSearch
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Nombre d'occurrences transmises à l'interface par signal
+EMIT_BATCH = 5000
+
+# Nombre de lignes ajoutées à la vue à chaque défilement en bas de liste
+FETCH_BATCH = 500
+
+class SearchWorker(QObject):
+    """Exécute une ParallelSearch hors du thread GUI et transmet les occurrences par lots"""
+
+    # Signaux
+    progress = pyqtSignal(int)     # pourcentage
+    matches = pyqtSignal(object)   # (array offsets, array identifiants)
+    finished = pyqtSignal(int)     # nombre total d'occurrences
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, data, patterns: List[bytes], source_path: Optional[str] = None,
+                 dirty_ranges=None):
+        super().__init__()
+        self.search = ParallelSearch(data, source_path, list(dirty_ranges or []))
+        self.patterns = patterns
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Demande l'arrêt de la recherche (pris en compte entre deux blocs)"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def run(self):
+        """Parcourt les occurrences et les émet par lots"""
+        offsets = array('Q')
+        pattern_ids = array('I')
+        count = 0
+
+        try:
+            for pattern_id, offset in self.search.iter_matches(
+                    self.patterns, self._cancel_event, self.progress.emit):
+                offsets.append(offset)
+                pattern_ids.append(pattern_id)
+                count += 1
+                if len(offsets) >= EMIT_BATCH:
+                    self.matches.emit((offsets, pattern_ids))
+                    offsets, pattern_ids = array('Q'), array('I')
+
+            if offsets:
+                self.matches.emit((offsets, pattern_ids))
+
+            if self._cancel_event.is_set():
+                self.cancelled.emit()
+            else:
+                self.finished.emit(count)
+
+        except Exception as e:
+            logger.error(f"Erreur recherche: {e}")
+            self.failed.emit(str(e))
+
+class FindNextWorker(QObject):
+    """Cherche hors du thread GUI la prochaine occurrence de l'un des motifs"""
+
+    # Signaux
+    progress = pyqtSignal(int)     # pourcentage
+    found = pyqtSignal(object)     # (offset, longueur), ou None si non trouvé
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, data, patterns: List[bytes], start: int,
+                 source_path: Optional[str] = None, dirty_ranges=None, search_index=None):
+        """
+        Args:
+            start: Offset à partir duquel chercher (reprise au début si rien après)
+            search_index: SearchIndex des données, utilisé pour un motif unique
+        """
+        super().__init__()
+        self.data = data
+        self.patterns = patterns
+        self.start = start
+        self.dirty_ranges = list(dirty_ranges or [])
+        self.search_index = search_index
+        self.search = ParallelSearch(data, source_path, self.dirty_ranges)
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Demande l'arrêt de la recherche (pris en compte entre deux blocs)"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _find(self, start: int) -> Optional[Tuple[int, int]]:
+        """(identifiant du motif, offset) de la première occurrence à partir de start"""
+        if self.search_index is not None and len(self.patterns) == 1:
+            offset = self.search_index.find(self.data, self.patterns[0], start, self.dirty_ranges)
+            return None if offset == -1 else (0, offset)
+        return self.search.find_first(self.patterns, start, self._cancel_event, self.progress.emit)
+
+    def run(self):
+        """Cherche après start, puis depuis le début des données"""
+        try:
+            match = self._find(self.start)
+            if match is None and self.start > 0 and not self._cancel_event.is_set():
+                match = self._find(0)
+
+            if self._cancel_event.is_set():
+                self.cancelled.emit()
+            elif match is None:
+                self.found.emit(None)
+            else:
+                pattern_id, offset = match
+                self.found.emit((offset, len(self.patterns[pattern_id])))
+
+        except Exception as e:
+            logger.error(f"Erreur recherche: {e}")
+            self.failed.emit(str(e))
+
+class SearchResultsModel(QAbstractListModel):
+    """
+    Occurrences d'une recherche, stockées dans des tableaux compacts
+
+    Les lignes ne sont exposées à la vue que par tranches de FETCH_BATCH,
+    à mesure que l'utilisateur fait défiler la liste.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.patterns: List[bytes] = []
+        self._offsets = array('Q')
+        self._pattern_ids = array('I')
+        self._labels: List[str] = []
+        self._visible = 0
+
+    def reset(self, patterns: List[bytes]):
+        """Vide le modèle pour une nouvelle recherche"""
+        self.beginResetModel()
+        self.patterns = list(patterns)
+        self._offsets = array('Q')
+        self._pattern_ids = array('I')
+        self._labels = [
+            pattern.decode('ascii') if all(32 <= b < 127 for b in pattern)
+            else pattern.hex(' ').upper()
+            for pattern in self.patterns
+        ]
+        self._visible = 0
+        self.endResetModel()
+
+    def append_matches(self, batch: Tuple[array, array]):
+        """Ajoute un lot d'occurrences (affichées à la demande)"""
+        offsets, pattern_ids = batch
+        self._offsets.extend(offsets)
+        self._pattern_ids.extend(pattern_ids)
+
+        # Remplir le premier écran sans attendre un défilement
+        if self._visible < FETCH_BATCH:
+            self.fetchMore(QModelIndex())
+
+    def total_count(self) -> int:
+        """Nombre d'occurrences reçues (affichées ou non)"""
+        return len(self._offsets)
+
+    def match_at(self, row: int) -> Tuple[int, int]:
+        """Retourne (offset, longueur) de l'occurrence d'une ligne"""
+        return self._offsets[row], len(self.patterns[self._pattern_ids[row]])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._visible
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self._visible < len(self._offsets)
+
+    def fetchMore(self, parent):
+        if parent.isValid():
+            return
+        count = min(FETCH_BATCH, len(self._offsets) - self._visible)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._visible, self._visible + count - 1)
+        self._visible += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._visible:
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"0x{self._offsets[row]:08X}  {self._labels[self._pattern_ids[row]]}"
+        if role == Qt.ItemDataRole.UserRole:
+            return self.match_at(row)
+        return None
+
+class IndexBuildWorker(QObject):
+    """Construit l'index de recherche d'une sauvegarde hors du thread GUI"""
+
+    # Signaux
+    progress = pyqtSignal(int)
+    built = pyqtSignal(object)     # SearchIndex
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, manager):
+        super().__init__()
+        self.manager = manager
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Demande l'arrêt de la construction"""
+        self._cancel_event.set()
+
+    def run(self):
+        """Construit l'index à côté du fichier de la sauvegarde"""
+        from core.search_index import IndexBuildCancelled
+
+        try:
+            index = self.manager.build_search_index(self.progress.emit, self._cancel_event)
+            self.built.emit(index)
+        except IndexBuildCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            logger.error(f"Erreur indexation: {e}")
+            self.failed.emit(str(e))
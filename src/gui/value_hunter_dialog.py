@@ -0,0 +1,208 @@
+"""
+Boîte de dialogue de recherche différentielle de valeurs (instantanés successifs)
+"""
+
+import os
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+    QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QAbstractItemView, QComboBox,
+    QLineEdit, QFileDialog, QMessageBox, QApplication
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+from core.value_hunter import (
+    ValueHunter, VALUE_TYPES, open_snapshot,
+    CONDITION_CHANGED, CONDITION_UNCHANGED, CONDITION_INCREASED,
+    CONDITION_DECREASED, CONDITION_EQUAL
+)
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Libellés des conditions, dans l'ordre du menu
+CONDITION_LABELS = [
+    (CONDITION_CHANGED, "Modifiée"),
+    (CONDITION_UNCHANGED, "Inchangée"),
+    (CONDITION_INCREASED, "Augmentée"),
+    (CONDITION_DECREASED, "Diminuée"),
+    (CONDITION_EQUAL, "Égale à"),
+]
+
+# Nombre de candidats affichés dans le tableau
+MAX_DISPLAYED = 200
+
+class ValueHunterDialog(QDialog):
+    """Affine les offsets candidats d'une valeur au fil de sauvegardes successives"""
+
+    # Signaux
+    offset_selected = pyqtSignal(int, int)  # offset, taille
+
+    def __init__(self, filepath, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Chasse aux valeurs")
+        self.resize(600, 500)
+
+        self.filepath = filepath
+        self.hunter = ValueHunter()
+
+        self.init_ui()
+        self.start_hunt()
+
+    def init_ui(self):
+        """Initialise l'interface"""
+        layout = QVBoxLayout()
+
+        self.snapshot_label = QLabel("")
+        layout.addWidget(self.snapshot_label)
+
+        # Condition de filtrage
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Valeur:"))
+
+        self.condition_combo = QComboBox()
+        for condition, label in CONDITION_LABELS:
+            self.condition_combo.addItem(label, condition)
+        filter_layout.addWidget(self.condition_combo)
+
+        self.value_input = QLineEdit()
+        self.value_input.setPlaceholderText("Valeur attendue")
+        filter_layout.addWidget(self.value_input)
+
+        self.compare_button = QPushButton("Comparer avec...")
+        self.compare_button.setToolTip("Choisir la sauvegarde suivante et filtrer")
+        self.compare_button.clicked.connect(self.compare_with_file)
+        filter_layout.addWidget(self.compare_button)
+
+        self.filter_button = QPushButton("Filtrer")
+        self.filter_button.setToolTip("Filtrer l'instantané courant (Égale à)")
+        self.filter_button.clicked.connect(self.filter_current)
+        filter_layout.addWidget(self.filter_button)
+
+        layout.addLayout(filter_layout)
+
+        self.count_label = QLabel("")
+        layout.addWidget(self.count_label)
+
+        # Tableau des candidats
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Offset", "Type", "Précédente", "Actuelle"])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.doubleClicked.connect(self.on_row_activated)
+        layout.addWidget(self.table)
+
+        # Boutons
+        button_layout = QHBoxLayout()
+
+        self.restart_button = QPushButton("Nouvelle recherche")
+        self.restart_button.clicked.connect(self.start_hunt)
+
+        self.close_button = QPushButton("Fermer")
+        self.close_button.clicked.connect(self.close)
+
+        button_layout.addWidget(self.restart_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.close_button)
+
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def start_hunt(self):
+        """Prend la sauvegarde chargée comme premier instantané"""
+        try:
+            self.hunter.start(open_snapshot(self.filepath))
+        except Exception as e:
+            logger.error(f"Erreur instantané: {e}")
+            QMessageBox.warning(self, "Erreur", f"Impossible de lire la sauvegarde:\n{e}")
+            return
+
+        self.snapshot_label.setText(f"Instantané: {os.path.basename(self.filepath)}")
+        self.update_results()
+
+    def compare_with_file(self):
+        """Prend une nouvelle sauvegarde comme instantané et filtre"""
+        filepath, _ = QFileDialog.getOpenFileName(
+            self,
+            "Sauvegarde suivante",
+            os.path.dirname(self.filepath),
+            "Sauvegardes TF2 (*.save);;Tous les fichiers (*.*)"
+        )
+        if not filepath:
+            return
+
+        try:
+            snapshot = open_snapshot(filepath)
+        except Exception as e:
+            logger.error(f"Erreur instantané: {e}")
+            QMessageBox.warning(self, "Erreur", f"Impossible de lire la sauvegarde:\n{e}")
+            return
+
+        if self.run_scan(snapshot):
+            self.snapshot_label.setText(
+                f"Instantané n°{self.hunter.scan_count + 1}: {os.path.basename(filepath)}"
+            )
+
+    def filter_current(self):
+        """Filtre l'instantané courant sur une valeur exacte"""
+        self.condition_combo.setCurrentIndex(self.condition_combo.findData(CONDITION_EQUAL))
+        self.run_scan(None)
+
+    def run_scan(self, snapshot) -> bool:
+        """Applique la condition choisie; retourne False en cas d'erreur"""
+        condition = self.condition_combo.currentData()
+        value = None
+        if condition == CONDITION_EQUAL:
+            try:
+                text = self.value_input.text().strip().replace(',', '.')
+                value = float(text) if any(c in text for c in '.eE') else int(text, 0)
+            except ValueError:
+                QMessageBox.warning(self, "Erreur", "Valeur invalide")
+                return False
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            self.hunter.scan(condition, value, snapshot)
+        except ValueError as e:
+            QMessageBox.warning(self, "Erreur", str(e))
+            return False
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        self.update_results()
+        return True
+
+    def update_results(self):
+        """Affiche le nombre de candidats et les premiers d'entre eux"""
+        counts = ", ".join(
+            f"{name}: {self.hunter.count(name):,}" for name in self.hunter.types
+        )
+        self.count_label.setText(f"{self.hunter.count():,} candidat(s) ({counts})")
+
+        results = self.hunter.results(MAX_DISPLAYED) if self.hunter.scan_count else []
+        self.results = results
+        self.table.setRowCount(len(results))
+        for row, result in enumerate(results):
+            values = [
+                f"0x{result.offset:08X}",
+                result.type_name,
+                "-" if result.previous is None else f"{result.previous:,}",
+                f"{result.current:,}"
+            ]
+            for column, text in enumerate(values):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+    def on_row_activated(self, index):
+        """Montre le candidat dans l'éditeur hexadécimal"""
+        result = self.results[index.row()]
+        self.offset_selected.emit(result.offset, VALUE_TYPES[result.type_name].itemsize)
+
+    def closeEvent(self, event):
+        """Libère les instantanés"""
+        self.hunter.close()
+        event.accept()
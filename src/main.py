@@ -7,13 +7,23 @@ Version: 1.0.0
 
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QIcon
-from gui.main_window import MainWindow
-from utils.logger import setup_logger
+import time
+import multiprocessing
+
+# Origine des mesures de démarrage (le lancement de l'interpréteur n'est pas compté)
+START_TIME = time.perf_counter()
+
+# Sous-commandes traitées sans interface graphique (voir cli.py)
+CLI_COMMANDS = ('batch',)
 
 def main():
     """Point d'entrée principal de l'application"""
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QIcon
+    from gui.main_window import MainWindow
+    from utils.logger import setup_logger
+    
     # Configuration des logs
     logger = setup_logger()
     logger.info("=== TS_Tool_Routier Démarrage ===")
@@ -32,9 +42,33 @@ def main():
     
     window.show()
     
+    # Premier passage de la boucle d'événements: fenêtre affichée
+    QTimer.singleShot(0, report_startup)
+    
     # Exécution de l'application
     logger.info("Application lancée avec succès")
     sys.exit(app.exec())
 
+def report_startup():
+    """Journalise le temps jusqu'à la première fenêtre (et les imports si tracés)"""
+    from utils.import_trace import check_budget
+    check_budget("première fenêtre", time.perf_counter() - START_TIME)
+
 if __name__ == "__main__":
+    # Nécessaire pour les processus de recherche dans un exécutable figé
+    multiprocessing.freeze_support()
+    
+    # Trace des imports: à activer avant tout import de Qt ou de core
+    from utils import import_trace
+    if import_trace.requested():
+        import_trace.install()
+        sys.argv = [arg for arg in sys.argv if arg != '--trace-imports']
+    
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS:
+        # Mode ligne de commande: Qt n'est jamais importé
+        from cli import main as cli_main
+        code = cli_main(sys.argv[1:])
+        for line in import_trace.report():
+            print(line, file=sys.stderr)
+        sys.exit(code)
     main()
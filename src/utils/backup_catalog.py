@@ -0,0 +1,244 @@
+"""
+Catalogue SQLite des sauvegardes (backups/.store/catalog.db)
+
+Une ligne par sauvegarde (fichier source, taille, empreinte, date, chaîne
+de deltas) et, pour le magasin de blocs, le nombre de manifestes qui
+référencent chaque bloc. Les listes, statistiques et choix de suppression
+sont des requêtes indexées: aucun parcours des dossiers de sauvegarde.
+
+Le catalogue est reconstruit à partir des fichiers s'il est absent ou d'une
+version antérieure (BackupManager.rebuild_catalog).
+
+Chaque opération ouvre sa propre connexion: le catalogue est utilisable
+depuis plusieurs threads et plusieurs processus (mode WAL).
+"""
+
+import sqlite3
+from contextlib import closing, contextmanager
+from dataclasses import astuple, dataclass, fields
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+CATALOG_VERSION = 1
+
+# Attente maximale d'un verrou tenu par un autre processus (secondes)
+LOCK_TIMEOUT = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS backups (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    source TEXT,
+    format TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    digest TEXT,
+    source_mtime_ns INTEGER,
+    created REAL NOT NULL,
+    day TEXT NOT NULL,
+    base TEXT,
+    depth INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS backups_name ON backups (name, created);
+CREATE INDEX IF NOT EXISTS backups_source ON backups (source, format, created);
+CREATE INDEX IF NOT EXISTS backups_created ON backups (created);
+CREATE INDEX IF NOT EXISTS backups_base ON backups (base);
+CREATE TABLE IF NOT EXISTS chunks (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    refs INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS restores (
+    id INTEGER PRIMARY KEY,
+    backup TEXT NOT NULL,
+    target TEXT NOT NULL,
+    restored REAL NOT NULL
+);
+"""
+
+@dataclass
+class BackupRecord:
+    """Une sauvegarde du catalogue (path et base: relatifs au dossier des sauvegardes)"""
+    path: str
+    name: str
+    source: Optional[str]
+    format: str
+    size: int
+    stored_size: int
+    digest: Optional[str]
+    source_mtime_ns: Optional[int]
+    created: float
+    day: str
+    base: Optional[str] = None
+    depth: int = 0
+
+_COLUMNS = ', '.join(spec.name for spec in fields(BackupRecord))
+_PLACEHOLDERS = ', '.join('?' for _ in fields(BackupRecord))
+
+def _record(row) -> BackupRecord:
+    return BackupRecord(*row)
+
+class BackupCatalog:
+    """Accès au catalogue SQLite"""
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path: Fichier de la base (créé au premier accès)
+        """
+        self.db_path = Path(db_path)
+
+    def exists(self) -> bool:
+        """True si la base existe et a le schéma courant"""
+        if not self.db_path.exists():
+            return False
+        with self._connect() as db:
+            return db.execute("PRAGMA user_version").fetchone()[0] == CATALOG_VERSION
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connexion dédiée; la transaction est validée en sortie (annulée sur erreur)"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(str(self.db_path), timeout=LOCK_TIMEOUT)) as db:
+            with db:
+                yield db
+
+    def reset(self, records: Iterable[BackupRecord],
+              chunk_refs: Dict[str, Tuple[int, int]]):
+        """
+        Recrée le catalogue
+
+        Args:
+            records: Toutes les sauvegardes présentes sur le disque
+            chunk_refs: {empreinte: (taille, nombre de manifestes)} des blocs utilisés
+        """
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript("DROP TABLE IF EXISTS backups; DROP TABLE IF EXISTS chunks;"
+                             "DROP TABLE IF EXISTS restores;" + SCHEMA)
+            db.executemany(f"INSERT INTO backups ({_COLUMNS}) VALUES ({_PLACEHOLDERS})",
+                           (astuple(record) for record in records))
+            db.executemany("INSERT INTO chunks (digest, size, refs) VALUES (?, ?, ?)",
+                           ((digest, size, refs) for digest, (size, refs) in chunk_refs.items()))
+            db.execute(f"PRAGMA user_version = {CATALOG_VERSION}")
+
+    def add(self, record: BackupRecord, chunks: Sequence[Tuple[str, int]] = ()):
+        """
+        Enregistre une sauvegarde (et les blocs de son manifeste)
+
+        Args:
+            chunks: [(empreinte, taille)] des blocs référencés
+        """
+        distinct = dict(chunks)
+        with self._connect() as db:
+            known = db.execute("SELECT 1 FROM backups WHERE path = ?", (record.path,)).fetchone()
+            db.execute(f"INSERT OR REPLACE INTO backups ({_COLUMNS}) VALUES ({_PLACEHOLDERS})",
+                       astuple(record))
+            if known:
+                # Déjà inscrite (reconstruction): ses blocs sont déjà comptés
+                return
+            db.executemany(
+                "INSERT INTO chunks (digest, size, refs) VALUES (?, ?, 1) "
+                "ON CONFLICT (digest) DO UPDATE SET refs = refs + 1",
+                distinct.items())
+
+    def remove(self, paths: Sequence[str],
+               chunks_by_path: Optional[Dict[str, Iterable[str]]] = None) -> List[str]:
+        """
+        Retire des sauvegardes du catalogue
+
+        Args:
+            paths: Chemins relatifs des sauvegardes supprimées
+            chunks_by_path: Empreintes des blocs de chaque manifeste supprimé
+
+        Returns:
+            Empreintes des blocs qui ne sont plus référencés (à supprimer du magasin)
+        """
+        with self._connect() as db:
+            db.executemany("DELETE FROM backups WHERE path = ?", ((path,) for path in paths))
+            for digests in (chunks_by_path or {}).values():
+                db.executemany("UPDATE chunks SET refs = refs - 1 WHERE digest = ?",
+                               ((digest,) for digest in set(digests)))
+            orphans = [digest for (digest,) in db.execute(
+                "SELECT digest FROM chunks WHERE refs <= 0")]
+            db.execute("DELETE FROM chunks WHERE refs <= 0")
+        return orphans
+
+    def add_restore(self, backup: str, target: str, restored: float):
+        with self._connect() as db:
+            db.execute("INSERT INTO restores (backup, target, restored) VALUES (?, ?, ?)",
+                       (backup, target, restored))
+
+    def get(self, path: str) -> Optional[BackupRecord]:
+        with self._connect() as db:
+            row = db.execute(f"SELECT {_COLUMNS} FROM backups WHERE path = ?", (path,)).fetchone()
+        return _record(row) if row else None
+
+    def for_name(self, name: str) -> List[BackupRecord]:
+        """Sauvegardes d'un fichier (nom sans extension), la plus récente d'abord"""
+        with self._connect() as db:
+            rows = db.execute(f"SELECT {_COLUMNS} FROM backups WHERE name = ? "
+                              "ORDER BY created DESC, id DESC", (name,)).fetchall()
+        return [_record(row) for row in rows]
+
+    def latest(self, source: str, backup_format: str) -> Optional[BackupRecord]:
+        """Sauvegarde la plus récente d'un fichier source dans un format"""
+        with self._connect() as db:
+            row = db.execute(f"SELECT {_COLUMNS} FROM backups WHERE source = ? AND format = ? "
+                             "ORDER BY created DESC, id DESC LIMIT 1",
+                             (source, backup_format)).fetchone()
+        return _record(row) if row else None
+
+    def all(self) -> List[BackupRecord]:
+        with self._connect() as db:
+            rows = db.execute(f"SELECT {_COLUMNS} FROM backups ORDER BY created").fetchall()
+        return [_record(row) for row in rows]
+
+    def expired(self, cutoff: float) -> List[BackupRecord]:
+        """Sauvegardes créées avant cutoff et dont aucun delta plus récent ne dépend"""
+        with self._connect() as db:
+            rows = db.execute(f"""
+                WITH RECURSIVE needed(path) AS (
+                    SELECT base FROM backups WHERE created >= ? AND base IS NOT NULL
+                    UNION
+                    SELECT backups.base FROM backups JOIN needed ON backups.path = needed.path
+                    WHERE backups.base IS NOT NULL
+                )
+                SELECT {_COLUMNS} FROM backups
+                WHERE created < ? AND path NOT IN (SELECT path FROM needed)
+                ORDER BY created""", (cutoff, cutoff)).fetchall()
+        return [_record(row) for row in rows]
+
+    def store_bytes(self) -> int:
+        """Octets occupés par les blocs référencés du magasin"""
+        with self._connect() as db:
+            return db.execute("SELECT COALESCE(SUM(size), 0) FROM chunks").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Comptes et tailles: total, par jour, plus ancienne et plus récente"""
+        with self._connect() as db:
+            count, size, stored = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) "
+                "FROM backups").fetchone()
+            chunk_bytes = db.execute("SELECT COALESCE(SUM(size), 0) FROM chunks").fetchone()[0]
+            by_day = {
+                day: {'count': day_count, 'size': day_size}
+                for day, day_count, day_size in db.execute(
+                    "SELECT day, COUNT(*), SUM(size) FROM backups GROUP BY day ORDER BY day")
+            }
+            oldest = db.execute("SELECT created, path FROM backups "
+                                "ORDER BY created LIMIT 1").fetchone()
+            newest = db.execute("SELECT created, path FROM backups "
+                                "ORDER BY created DESC LIMIT 1").fetchone()
+        return {
+            'total_backups': count,
+            'total_size': size,
+            'stored_size': stored + chunk_bytes,
+            'by_date': by_day,
+            'oldest': tuple(oldest) if oldest else None,
+            'newest': tuple(newest) if newest else None,
+        }
@@ -1,33 +1,117 @@
 """
 Gestionnaire de sauvegardes automatiques
+
+Les sauvegardes sont dédupliquées: chaque fichier est découpé en blocs
+définis par le contenu, stockés une seule fois dans backups/.store
+(voir chunk_store.py). Une sauvegarde est un manifeste qui liste ses blocs:
+    backups/YYYY-MM-DD/HH-MM-SS_originalname_suffix.save.manifest
+Avec le format "delta" (editor.backup_format), chaque sauvegarde est une
+différence binaire avec la précédente du même fichier (voir delta_store.py):
+    backups/YYYY-MM-DD/HH-MM-SS_originalname_suffix.save.delta
+Le format "copy" garde des copies complètes, faites par clonage (btrfs/xfs)
+ou dans le noyau quand c'est possible (voir fast_copy.py); avec
+editor.backup_compression ("zlib" ou "lzma"), ces copies sont compressées
+par blocs indépendants (voir pack_store.py):
+    backups/YYYY-MM-DD/HH-MM-SS_originalname_suffix.save.pack
+Les anciennes sauvegardes (copies complètes) restent lisibles.
+
+Toutes les sauvegardes sont inscrites dans un catalogue SQLite
+(backups/.store/catalog.db, voir backup_catalog.py): listes, statistiques
+et nettoyage l'interrogent au lieu de parcourir les dossiers. Le catalogue
+est reconstruit à partir des fichiers s'il est absent.
+
+Après chaque sauvegarde automatique, la politique de conservation
+(editor.backup_retention, voir retention.py) est appliquée dans un thread
+en arrière-plan.
+
+Plusieurs processus (interface, traitements en lot de cli.py) peuvent
+partager le même dossier: l'écriture d'une sauvegarde et son inscription,
+comme chaque passe de nettoyage, se font sous un verrou de fichier
+(backups/.store/store.lock, voir file_lock.py).
 """
 
 import os
-import shutil
-import hashlib
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
+from .backup_catalog import BackupCatalog, BackupRecord
+from .chunk_store import MANIFEST_SUFFIX, BackupManifest, ChunkStore, file_hasher, is_manifest
+from .delta_store import DELTA_SUFFIX, DeltaBackup, is_delta, write_delta
+from .digest_cache import DigestCache
+from .fast_copy import copy_file
+from .file_lock import FileLock
+from .pack_store import CODECS, PACK_SUFFIX, PackedBackup, is_pack, write_pack
+from .retention import RetentionPolicy, plan_retention
 from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Sous-répertoire du magasin de blocs (ignoré lors des parcours par date)
+STORE_DIR_NAME = '.store'
+
+# Formats des nouvelles sauvegardes
+BACKUP_FORMAT_CHUNKS = 'chunks'   # blocs dédupliqués + manifeste
+BACKUP_FORMAT_DELTA = 'delta'     # différence avec la sauvegarde précédente
+BACKUP_FORMAT_COPY = 'copy'       # copie complète (clonée si le système de fichiers le permet)
+BACKUP_FORMATS = (BACKUP_FORMAT_CHUNKS, BACKUP_FORMAT_DELTA, BACKUP_FORMAT_COPY)
+
+# Compression des copies complètes: aucune, ou un codec de pack_store.CODECS
+BACKUP_COMPRESSION_NONE = 'none'
+
+# Lecture en flux pour les empreintes
+HASH_READ_SIZE = 1024 * 1024
+
 class BackupManager:
     """Gère les sauvegardes automatiques des fichiers modifiés"""
     
-    def __init__(self, backup_dir: str = "backups"):
+    def __init__(self, backup_dir: str = "backups", backup_format: Optional[str] = None,
+                 compression: Optional[str] = None):
         """
         Initialise le gestionnaire de sauvegardes
         
         Args:
             backup_dir: Répertoire pour les sauvegardes
+            backup_format: BACKUP_FORMAT_CHUNKS, BACKUP_FORMAT_DELTA ou BACKUP_FORMAT_COPY
+                           (editor.backup_format de la config par défaut)
+            compression: Compression des copies complètes, BACKUP_COMPRESSION_NONE,
+                         "zlib" ou "lzma" (editor.backup_compression par défaut)
         """
+        from .config import get_setting
+        if backup_format is None:
+            backup_format = get_setting('editor', 'backup_format', BACKUP_FORMAT_CHUNKS)
+        if backup_format not in BACKUP_FORMATS:
+            raise ValueError(f"Format de sauvegarde inconnu: {backup_format}")
+        if compression is None:
+            compression = get_setting('editor', 'backup_compression', BACKUP_COMPRESSION_NONE)
+        if compression != BACKUP_COMPRESSION_NONE and compression not in CODECS:
+            raise ValueError(f"Compression de sauvegarde inconnue: {compression}")
+        
         self.backup_dir = Path(backup_dir)
-        self.backup_dir.mkdir(exist_ok=True)
+        self.backup_format = backup_format
+        self.compression = compression
         
-        # Structure: backups/YYYY-MM-DD/HH-MM-SS_originalname.save
+        # Structure: backups/YYYY-MM-DD/HH-MM-SS_originalname_suffix.save.manifest
+        # (répertoires créés à la première sauvegarde)
         self.today_dir = self.backup_dir / datetime.now().strftime("%Y-%m-%d")
-        self.today_dir.mkdir(exist_ok=True)
+        self.store = ChunkStore(self.backup_dir / STORE_DIR_NAME)
+        
+        # Empreintes des fichiers sauvegardés: un fichier inchangé n'est pas relu
+        self.digests = DigestCache(self.backup_dir / STORE_DIR_NAME / 'digests.json')
+        
+        # Catalogue des sauvegardes (vérifié, voire reconstruit, au premier accès)
+        self.catalog = BackupCatalog(self.backup_dir / STORE_DIR_NAME / 'catalog.db')
+        self._catalog_ready = False
+        
+        # Écriture et inscription d'une sauvegarde / nettoyage, entre threads
+        # et entre processus qui partagent le dossier
+        self._store_lock = FileLock(self.backup_dir / STORE_DIR_NAME / 'store.lock')
+        
+        # Thread de conservation (une exécution à la fois, demandes regroupées)
+        self._retention_lock = threading.Lock()
+        self._retention_thread: Optional[threading.Thread] = None
+        self._retention_again = False
         
         logger.info(f"Gestionnaire de sauvegardes initialisé: {self.backup_dir}")
     
@@ -40,7 +124,8 @@ class BackupManager:
             suffix: Suffixe pour le nom de sauvegarde
             
         Returns:
-            Chemin de la sauvegarde créée ou None
+            Chemin de la sauvegarde créée (ou de la précédente si le fichier
+            n'a pas changé depuis) ou None
         """
         try:
             source_path = Path(filepath)
@@ -48,30 +133,226 @@ class BackupManager:
                 logger.error(f"Fichier source inexistant: {filepath}")
                 return None
             
-            # Générer un nom unique
-            timestamp = datetime.now().strftime("%H-%M-%S")
-            original_name = source_path.stem
-            backup_name = f"{timestamp}_{original_name}_{suffix}{source_path.suffix}"
+            # Catalogue reconstruit avant d'écrire la nouvelle sauvegarde
+            self._get_catalog()
             
-            backup_path = self.today_dir / backup_name
+            # Fichier inchangé depuis sa dernière sauvegarde: ni copie ni relecture
+            unchanged = self._unchanged_backup(source_path)
+            if unchanged is not None:
+                logger.info(f"Fichier inchangé, sauvegarde existante: {unchanged}")
+                return unchanged
             
-            # Copier le fichier
-            shutil.copy2(source_path, backup_path)
+            # Écriture et inscription sous le verrou: un nettoyage (même d'un
+            # autre processus) ne libère ni un bloc déjà présent, ni la base
+            # d'un delta, ni le dossier du jour avant que la sauvegarde qui
+            # les utilise soit au catalogue
+            with self._store_lock:
+                # Générer un nom unique
+                if self.backup_format == BACKUP_FORMAT_DELTA:
+                    return self._create_delta_backup(source_path, self._backup_path(source_path, suffix, DELTA_SUFFIX))
+                if self.backup_format == BACKUP_FORMAT_COPY and self.compression != BACKUP_COMPRESSION_NONE:
+                    return self._create_pack_backup(source_path, self._backup_path(source_path, suffix, PACK_SUFFIX))
+                if self.backup_format == BACKUP_FORMAT_COPY:
+                    return self._create_copy_backup(source_path, self._backup_path(source_path, suffix))
+                
+                backup_path = self._backup_path(source_path, suffix, MANIFEST_SUFFIX)
+                
+                # Seuls les blocs absents du magasin sont écrits
+                manifest, written = self.store.store_file(source_path)
+                
+                # Vérifier que tous les blocs sont présents avant d'écrire le manifeste
+                missing = self.store.missing_chunks(manifest)
+                if missing:
+                    logger.error(f"Échec vérification sauvegarde: {len(missing)} bloc(s) manquant(s)")
+                    return None
+                manifest.save(backup_path)
+                self._record(backup_path, BACKUP_FORMAT_CHUNKS, manifest.source, manifest.size,
+                             manifest.digest, manifest.mtime_ns, chunks=manifest.chunks)
+            self.digests.put(source_path, manifest.size, manifest.mtime_ns, manifest.digest)
             
-            # Vérifier la copie
-            if self.verify_backup(source_path, backup_path):
-                logger.info(f"Sauvegarde créée: {backup_path}")
-                return str(backup_path)
-            else:
-                logger.error("Échec vérification sauvegarde")
-                if backup_path.exists():
-                    backup_path.unlink()
-                return None
+            logger.info(f"Sauvegarde créée: {backup_path} "
+                        f"({len(manifest.chunks)} blocs, {written} octets nouveaux "
+                        f"sur {manifest.size})")
+            return str(backup_path)
                 
         except Exception as e:
             logger.error(f"Erreur création sauvegarde: {e}")
             return None
     
+    def _backup_path(self, source_path: Path, suffix: str, extension: str = '') -> Path:
+        """Nom unique HH-MM-SS_originalname_suffix.ext (compteur si la seconde est déjà prise)"""
+        timestamp = datetime.now().strftime("%H-%M-%S")
+        name = f"{source_path.stem}_{suffix}{source_path.suffix}{extension}"
+        backup_path = self.today_dir / f"{timestamp}_{name}"
+        counter = 1
+        while backup_path.exists():
+            backup_path = self.today_dir / f"{timestamp}-{counter}_{name}"
+            counter += 1
+        return backup_path
+    
+    def _create_delta_backup(self, source_path: Path, backup_path: Path) -> Optional[str]:
+        """Différence avec la sauvegarde précédente du même fichier (ou image clé)"""
+        base = None
+        latest = self._latest_backup(source_path, BACKUP_FORMAT_DELTA)
+        if latest is not None:
+            try:
+                base = DeltaBackup.open(self._absolute(latest.path))
+            except Exception as e:
+                logger.warning(f"Version de base ignorée {latest.path}: {e}")
+        backup, inserted = write_delta(source_path, backup_path, base, self.store.chunker)
+        self.digests.put(source_path, backup.size, backup.header['mtime_ns'], backup.digest)
+        self._record(backup_path, BACKUP_FORMAT_DELTA, backup.source, backup.size, backup.digest,
+                     backup.header['mtime_ns'], base=backup.base_path, depth=backup.depth)
+        
+        kind = "image clé" if backup.header['base'] is None else f"delta, profondeur {backup.depth}"
+        logger.info(f"Sauvegarde créée: {backup_path} ({kind}, {inserted} octets nouveaux "
+                    f"sur {backup.size})")
+        return str(backup_path)
+    
+    def _create_copy_backup(self, source_path: Path, backup_path: Path) -> Optional[str]:
+        """Copie complète (clone, copie noyau, ou tampons en dernier recours)"""
+        backup_path.parent.mkdir(parents=True, exist_ok=True)
+        stat = source_path.stat()
+        
+        # Empreinte connue (taille et date inchangées): copie sans relecture;
+        # sinon elle est calculée pendant la copie, en une seule lecture
+        digest = self.digests.get(source_path, stat)
+        hasher = file_hasher() if digest is None else None
+        method = copy_file(source_path, backup_path, hasher=hasher)
+        
+        current = source_path.stat()
+        if (backup_path.stat().st_size != stat.st_size or current.st_size != stat.st_size
+                or current.st_mtime_ns != stat.st_mtime_ns):
+            logger.error("Échec vérification sauvegarde (fichier modifié pendant la copie)")
+            backup_path.unlink()
+            return None
+        if hasher is not None:
+            digest = hasher.hexdigest()
+            self.digests.put(source_path, stat.st_size, stat.st_mtime_ns, digest)
+        
+        self._record(backup_path, BACKUP_FORMAT_COPY, str(source_path.resolve()), stat.st_size,
+                     digest, stat.st_mtime_ns)
+        
+        logger.info(f"Sauvegarde créée: {backup_path} (copie {method})")
+        return str(backup_path)
+    
+    def _create_pack_backup(self, source_path: Path, backup_path: Path) -> Optional[str]:
+        """Copie complète compressée par blocs (en parallèle)"""
+        backup = write_pack(source_path, backup_path, self.compression)
+        self.digests.put(source_path, backup.size, backup.header['mtime_ns'], backup.digest)
+        self._record(backup_path, BACKUP_FORMAT_COPY, backup.source, backup.size, backup.digest,
+                     backup.header['mtime_ns'])
+        
+        stored = backup_path.stat().st_size
+        logger.info(f"Sauvegarde créée: {backup_path} ({self.compression}, {backup.block_count} "
+                    f"blocs, {stored} octets pour {backup.size})")
+        return str(backup_path)
+    
+    def _latest_backup(self, source_path: Path, backup_format: str) -> Optional[BackupRecord]:
+        """Sauvegarde la plus récente de ce fichier précis dans un format"""
+        return self._get_catalog().latest(str(source_path.resolve()), backup_format)
+    
+    def _unchanged_backup(self, source_path: Path) -> Optional[str]:
+        """Dernière sauvegarde du fichier si son empreinte en cache est la même"""
+        digest = self.digests.get(source_path)
+        if digest is None:
+            return None
+        latest = self._latest_backup(source_path, self.backup_format)
+        if latest is None or latest.digest != digest:
+            return None
+        path = self._absolute(latest.path)
+        return str(path) if path.exists() else None
+    
+    # --- Catalogue ---
+    
+    def _relative(self, path) -> str:
+        """Chemin d'une sauvegarde relatif au dossier des sauvegardes (clé du catalogue)"""
+        return Path(os.path.relpath(Path(path).resolve(), self.backup_dir.resolve())).as_posix()
+    
+    def _absolute(self, relative: str) -> Path:
+        return self.backup_dir / relative
+    
+    def _get_catalog(self) -> BackupCatalog:
+        """Catalogue, reconstruit à partir des fichiers s'il est absent ou périmé"""
+        if not self._catalog_ready:
+            with self._store_lock:
+                if not self.catalog.exists():
+                    self.rebuild_catalog()
+            self._catalog_ready = True
+        return self.catalog
+    
+    def _record(self, backup_path: Path, backup_format: str, source: Optional[str], size: int,
+                digest: Optional[str], mtime_ns: Optional[int], base: Optional[Path] = None,
+                depth: int = 0, chunks=()):
+        """Inscrit une nouvelle sauvegarde au catalogue"""
+        self._get_catalog().add(
+            self._build_record(backup_path, backup_format, source, size, digest, mtime_ns,
+                               base, depth),
+            chunks)
+    
+    def _build_record(self, backup_path: Path, backup_format: str, source: Optional[str],
+                      size: int, digest: Optional[str], mtime_ns: Optional[int],
+                      base: Optional[Path] = None, depth: int = 0) -> BackupRecord:
+        stat = backup_path.stat()
+        if source is not None:
+            name = Path(source).stem
+        else:
+            # Ancienne copie: HH-MM-SS_originalname_suffix.ext
+            name = Path(backup_path.name).stem.split('_', 1)[-1].rsplit('_', 1)[0]
+        return BackupRecord(
+            path=self._relative(backup_path), name=name, source=source, format=backup_format,
+            size=size, stored_size=stat.st_size, digest=digest, source_mtime_ns=mtime_ns,
+            created=stat.st_mtime, day=backup_path.parent.name,
+            base=self._relative(base) if base is not None else None, depth=depth,
+        )
+    
+    def rebuild_catalog(self) -> int:
+        """
+        Recrée le catalogue en relisant toutes les sauvegardes présentes
+        
+        Returns:
+            Nombre de sauvegardes inscrites
+        """
+        with self._store_lock:
+            return self._rebuild_catalog()
+    
+    def _rebuild_catalog(self) -> int:
+        records = []
+        chunk_refs: Dict[str, Tuple[int, int]] = {}
+        for date_dir in self._date_dirs():
+            for path in date_dir.iterdir():
+                if not path.is_file() or path.name.endswith('.tmp'):
+                    continue
+                try:
+                    if is_manifest(path):
+                        manifest = BackupManifest.load(path)
+                        records.append(self._build_record(
+                            path, BACKUP_FORMAT_CHUNKS, manifest.source, manifest.size,
+                            manifest.digest, manifest.mtime_ns))
+                        for digest, size in dict(manifest.chunks).items():
+                            refs = chunk_refs.get(digest, (size, 0))[1]
+                            chunk_refs[digest] = (size, refs + 1)
+                    elif is_delta(path):
+                        delta = DeltaBackup.open(path)
+                        records.append(self._build_record(
+                            path, BACKUP_FORMAT_DELTA, delta.source, delta.size, delta.digest,
+                            delta.header['mtime_ns'], delta.base_path, delta.depth))
+                    elif is_pack(path):
+                        pack = PackedBackup.open(path)
+                        records.append(self._build_record(
+                            path, BACKUP_FORMAT_COPY, pack.source, pack.size, pack.digest,
+                            pack.header['mtime_ns']))
+                    else:
+                        records.append(self._build_record(
+                            path, BACKUP_FORMAT_COPY, None, path.stat().st_size, None, None))
+                except Exception as e:
+                    logger.error(f"Sauvegarde illisible {path}: {e}")
+        
+        self.catalog.reset(records, chunk_refs)
+        self._catalog_ready = True
+        logger.info(f"Catalogue des sauvegardes reconstruit: {len(records)} sauvegarde(s)")
+        return len(records)
+    
     def verify_backup(self, original: Path, backup: Path) -> bool:
         """
         Vérifie qu'une sauvegarde est identique à l'original
@@ -84,24 +365,80 @@ class BackupManager:
             True si identique, False sinon
         """
         try:
+            original, backup = Path(original), Path(backup)
             if not original.exists() or not backup.exists():
                 return False
             
+            if is_manifest(backup):
+                manifest = BackupManifest.load(backup)
+                if original.stat().st_size != manifest.size or self.store.missing_chunks(manifest):
+                    return False
+                return self._source_digest(original) == manifest.digest
+            
+            if is_delta(backup):
+                delta = DeltaBackup.open(backup)
+                if original.stat().st_size != delta.size:
+                    return False
+                if not all(path.exists() for path in delta.chain()):
+                    return False
+                return self._source_digest(original) == delta.digest
+            
+            if is_pack(backup):
+                pack = PackedBackup.open(backup)
+                if original.stat().st_size != pack.size:
+                    return False
+                return self._source_digest(original) == pack.digest
+            
             # Comparer les tailles
             if original.stat().st_size != backup.stat().st_size:
                 return False
             
-            # Comparer les contenus (hash)
-            with open(original, 'rb') as f1, open(backup, 'rb') as f2:
-                hash1 = hashlib.md5(f1.read()).hexdigest()
-                hash2 = hashlib.md5(f2.read()).hexdigest()
-                
-                return hash1 == hash2
+            # Comparer les contenus (empreintes calculées en flux)
+            return self._source_digest(original) == self._file_digest(backup)
                 
         except Exception as e:
             logger.error(f"Erreur vérification: {e}")
             return False
     
+    @staticmethod
+    def _file_digest(path: Path) -> str:
+        """Empreinte BLAKE2b d'un fichier, lu en flux"""
+        hasher = file_hasher()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_READ_SIZE), b''):
+                hasher.update(block)
+        return hasher.hexdigest()
+    
+    def _source_digest(self, path: Path) -> str:
+        """Empreinte d'un fichier source (cache si taille et date inchangées)"""
+        stat = path.stat()
+        digest = self.digests.get(path, stat)
+        if digest is None:
+            digest = self._file_digest(path)
+            self.digests.put(path, stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+    
+    def _date_dirs(self) -> List[Path]:
+        """Sous-dossiers de sauvegarde par date (hors magasin de blocs)"""
+        if not self.backup_dir.is_dir():
+            return []
+        return [path for path in self.backup_dir.iterdir()
+                if path.is_dir() and path.name != STORE_DIR_NAME]
+    
+    def _iter_manifests(self):
+        """Tous les manifestes conservés"""
+        for date_dir in self._date_dirs():
+            for path in date_dir.glob(f"*{MANIFEST_SUFFIX}"):
+                try:
+                    yield BackupManifest.load(path)
+                except Exception as e:
+                    logger.error(f"Manifeste illisible {path}: {e}")
+    
+    def collect_garbage(self):
+        """Supprime du magasin les blocs qui ne sont plus référencés"""
+        with self._store_lock:
+            return self.store.collect_garbage(self._iter_manifests())
+    
     def get_backups_for_file(self, original_path: str) -> List[str]:
         """
         Retourne la liste des sauvegardes pour un fichier
@@ -110,54 +447,123 @@ class BackupManager:
             original_path: Chemin du fichier original
             
         Returns:
-            Liste des chemins de sauvegarde
+            Liste des chemins de sauvegarde (le plus récent d'abord)
         """
-        original_name = Path(original_path).stem
-        backups = []
-        
-        # Chercher dans tous les sous-dossiers de backup
-        for date_dir in self.backup_dir.iterdir():
-            if date_dir.is_dir():
-                for backup_file in date_dir.glob(f"*_{original_name}_*"):
-                    if backup_file.is_file():
-                        backups.append(str(backup_file))
-        
-        # Trier par date (le plus récent d'abord)
-        backups.sort(key=lambda x: Path(x).stat().st_mtime, reverse=True)
-        
-        return backups
+        try:
+            records = self._get_catalog().for_name(Path(original_path).stem)
+        except Exception as e:
+            logger.error(f"Erreur lecture catalogue: {e}")
+            return []
+        return [str(self._absolute(record.path)) for record in records]
     
     def cleanup_old_backups(self, days_to_keep: int = 7):
         """
         Supprime les sauvegardes trop anciennes
         
+        Les versions dont dépend un delta conservé restent sur le disque.
+        
         Args:
             days_to_keep: Nombre de jours à conserver
         """
         try:
             cutoff_time = datetime.now().timestamp() - (days_to_keep * 86400)
-            
-            for date_dir in self.backup_dir.iterdir():
-                if date_dir.is_dir():
-                    # Vérifier si le dossier est trop vieux
-                    dir_time = date_dir.stat().st_mtime
-                    
-                    if dir_time < cutoff_time:
-                        # Supprimer tout le dossier
-                        shutil.rmtree(date_dir)
-                        logger.info(f"Dossier supprimé: {date_dir}")
-                    else:
-                        # Vérifier les fichiers individuels
-                        for backup_file in date_dir.iterdir():
-                            if backup_file.is_file():
-                                file_time = backup_file.stat().st_mtime
-                                if file_time < cutoff_time:
-                                    backup_file.unlink()
-                                    logger.info(f"Sauvegarde supprimée: {backup_file}")
-                                    
+            with self._store_lock:
+                self.remove_backups(self._get_catalog().expired(cutoff_time))
         except Exception as e:
             logger.error(f"Erreur nettoyage sauvegardes: {e}")
     
+    def remove_backups(self, records: List[BackupRecord]) -> int:
+        """
+        Supprime des sauvegardes: catalogue (une transaction), fichiers,
+        blocs devenus inutiles et dossiers vides
+        
+        Returns:
+            Nombre de sauvegardes supprimées
+        """
+        if not records:
+            return 0
+        
+        # Blocs libérés par les manifestes supprimés
+        chunks_by_path = {}
+        for record in records:
+            if record.format == BACKUP_FORMAT_CHUNKS:
+                try:
+                    manifest = BackupManifest.load(self._absolute(record.path))
+                    chunks_by_path[record.path] = [digest for digest, _ in manifest.chunks]
+                except Exception as e:
+                    logger.warning(f"Manifeste illisible {record.path}: {e}")
+        
+        with self._store_lock:
+            orphans = self._get_catalog().remove([record.path for record in records], chunks_by_path)
+            self.store.remove_chunks(orphans)
+        
+            date_dirs = set()
+            for record in records:
+                backup_file = self._absolute(record.path)
+                try:
+                    backup_file.unlink()
+                    logger.info(f"Sauvegarde supprimée: {backup_file}")
+                except FileNotFoundError:
+                    pass
+                date_dirs.add(backup_file.parent)
+        
+            for date_dir in date_dirs:
+                if date_dir.is_dir() and not any(date_dir.iterdir()):
+                    date_dir.rmdir()
+                    logger.info(f"Dossier supprimé: {date_dir}")
+        
+        return len(records)
+    
+    def apply_retention(self, policy: Optional[RetentionPolicy] = None) -> int:
+        """
+        Applique la politique de conservation
+        
+        Args:
+            policy: Politique (editor.backup_retention de la config par défaut)
+            
+        Returns:
+            Nombre de sauvegardes supprimées
+        """
+        try:
+            if policy is None:
+                from .config import get_setting
+                policy = RetentionPolicy.from_config(get_setting('editor', 'backup_retention'))
+            catalog = self._get_catalog()
+            # Plan et suppressions sans sauvegarde concurrente (autre processus compris)
+            with self._store_lock:
+                plan = plan_retention(catalog.all(), policy, time.time(), catalog.store_bytes())
+                removed = self.remove_backups(plan.remove)
+            logger.info(f"Conservation: {removed} sauvegarde(s) supprimée(s), {plan.kept} conservée(s), "
+                        f"{self._human_readable_size(plan.usage_before)} -> "
+                        f"{self._human_readable_size(plan.usage_after)}")
+            return removed
+        except Exception as e:
+            logger.error(f"Erreur conservation sauvegardes: {e}")
+            return 0
+    
+    def schedule_retention(self):
+        """
+        Applique la politique de conservation dans un thread en arrière-plan
+        
+        Une demande reçue pendant l'exécution relance une seule passe à la fin.
+        """
+        with self._retention_lock:
+            if self._retention_thread is not None:
+                self._retention_again = True
+                return
+            self._retention_thread = threading.Thread(
+                target=self._retention_loop, name="backup-retention")
+            self._retention_thread.start()
+    
+    def _retention_loop(self):
+        while True:
+            self.apply_retention()
+            with self._retention_lock:
+                if not self._retention_again:
+                    self._retention_thread = None
+                    return
+                self._retention_again = False
+    
     def restore_backup(self, backup_path: str, target_path: str) -> bool:
         """
         Restaure une sauvegarde
@@ -182,8 +588,17 @@ class BackupManager:
                 self.create_backup(str(target), "prerestore")
             
             # Restaurer
-            shutil.copy2(backup, target)
+            if is_manifest(backup):
+                self._restore_manifest(BackupManifest.load(backup), target)
+            elif is_delta(backup):
+                self._restore_delta(DeltaBackup.open(backup), target)
+            elif is_pack(backup):
+                self._restore_pack(PackedBackup.open(backup), target)
+            else:
+                self._restore_copy(backup, target)
             
+            self._get_catalog().add_restore(self._relative(backup), str(target.resolve()),
+                                            time.time())
             logger.info(f"Restauration: {backup_path} -> {target_path}")
             return True
             
@@ -191,52 +606,85 @@ class BackupManager:
             logger.error(f"Erreur restauration: {e}")
             return False
     
+    def _restore_manifest(self, manifest: BackupManifest, target: Path):
+        """Reconstitue le fichier bloc par bloc, puis remplace la cible"""
+        self._restore_stream(lambda f: self.store.restore_to(manifest, f),
+                             manifest.digest, manifest.mtime_ns, target)
+    
+    def _restore_delta(self, delta: DeltaBackup, target: Path):
+        """Reconstitue le fichier en lisant la chaîne de deltas en flux"""
+        self._restore_stream(delta.restore_to, delta.digest, delta.header['mtime_ns'], target)
+    
+    def _restore_pack(self, pack: PackedBackup, target: Path):
+        """Décompresse les blocs en flux (en parallèle, dans l'ordre)"""
+        self._restore_stream(pack.restore_to, pack.digest, pack.header['mtime_ns'], target)
+    
+    @staticmethod
+    def _restore_copy(backup: Path, target: Path):
+        """Copie complète vers un fichier temporaire, puis remplacement de la cible"""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(target.name + '.restore.tmp')
+        try:
+            copy_file(backup, temp_path)
+            os.replace(temp_path, target)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+    
+    @staticmethod
+    def _restore_stream(write, digest: str, mtime_ns: int, target: Path):
+        """
+        Écrit le contenu restauré dans un fichier temporaire, vérifie son
+        empreinte, puis remplace la cible
+        
+        Args:
+            write: Écrit le contenu dans un fichier ouvert et retourne son empreinte
+        """
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(target.name + '.restore.tmp')
+        try:
+            with open(temp_path, 'wb') as f:
+                written_digest = write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            if written_digest != digest:
+                raise IOError("Empreinte du fichier restauré incorrecte")
+            os.replace(temp_path, target)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        if mtime_ns:
+            os.utime(target, ns=(mtime_ns, mtime_ns))
+    
     def get_backup_stats(self) -> dict:
         """
         Retourne des statistiques sur les sauvegardes
         
         Returns:
-            Dictionnaire de statistiques
+            Dictionnaire de statistiques (total_size: taille des fichiers
+            sauvegardés; stored_size: place réellement occupée sur disque)
         """
         stats = {
             'total_backups': 0,
             'total_size': 0,
+            'stored_size': 0,
             'by_date': {},
             'oldest': None,
             'newest': None
         }
         
         try:
-            for date_dir in self.backup_dir.iterdir():
-                if date_dir.is_dir():
-                    date_stats = {
-                        'count': 0,
-                        'size': 0
-                    }
-                    
-                    for backup_file in date_dir.iterdir():
-                        if backup_file.is_file():
-                            date_stats['count'] += 1
-                            date_stats['size'] += backup_file.stat().st_size
-                            
-                            # Mettre à jour les plus anciens/récents
-                            file_time = backup_file.stat().st_mtime
-                            if (stats['oldest'] is None or 
-                                file_time < stats['oldest'][0]):
-                                stats['oldest'] = (file_time, str(backup_file))
-                            if (stats['newest'] is None or 
-                                file_time > stats['newest'][0]):
-                                stats['newest'] = (file_time, str(backup_file))
-                    
-                    stats['by_date'][date_dir.name] = date_stats
-                    stats['total_backups'] += date_stats['count']
-                    stats['total_size'] += date_stats['size']
-                    
+            stats.update(self._get_catalog().stats())
+            for key in ('oldest', 'newest'):
+                if stats[key] is not None:
+                    file_time, path = stats[key]
+                    stats[key] = (file_time, str(self._absolute(path)))
         except Exception as e:
             logger.error(f"Erreur calcul stats: {e}")
         
         # Convertir la taille en format lisible
         stats['total_size_human'] = self._human_readable_size(stats['total_size'])
+        stats['stored_size_human'] = self._human_readable_size(stats['stored_size'])
         
         return stats
     
@@ -249,5 +697,19 @@ class BackupManager:
             size_bytes /= 1024.0
         return f"{size_bytes:.2f} TB"
 
-# Instance globale
-backup_manager = BackupManager()
+# Instance globale, créée à la première utilisation (aucun effet à l'import)
+_backup_manager: Optional[BackupManager] = None
+
+def get_backup_manager() -> BackupManager:
+    """Retourne le gestionnaire global (répertoire paths.backup_dir de la config)"""
+    global _backup_manager
+    if _backup_manager is None:
+        from .config import get_setting
+        _backup_manager = BackupManager(get_setting('paths', 'backup_dir', 'backups'))
+    return _backup_manager
+
+def __getattr__(name):
+    # Compatibilité: "from utils.backup_manager import backup_manager"
+    if name == 'backup_manager':
+        return get_backup_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,339 @@
+"""
+Stockage dédupliqué des sauvegardes (blocs adressés par leur contenu)
+
+Les fichiers sont découpés en blocs de taille variable dont les limites
+dépendent du contenu: une limite est posée après un octet quand le hachage
+polynomial glissant des 32 derniers octets passe sous un seuil. Une
+modification locale ne déplace donc que les limites voisines; les autres
+blocs restent identiques d'une sauvegarde à l'autre, même si des octets
+ont été insérés ou supprimés plus haut dans le fichier.
+
+Chaque bloc est stocké une seule fois, sous son empreinte BLAKE2b:
+    <racine>/chunks/ab/abcdef...
+Une sauvegarde est un manifeste JSON: taille, empreinte du fichier et liste
+ordonnée des blocs. Seuls les blocs absents du magasin sont écrits.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Set, Tuple
+import numpy as np
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_SUFFIX = '.manifest'
+MANIFEST_VERSION = 1
+
+# Tailles des blocs: minimum, moyenne visée, maximum
+CHUNK_MIN = 16 * 1024
+CHUNK_AVG = 64 * 1024
+CHUNK_MAX = 256 * 1024
+
+# Fenêtre du hachage glissant et seuil de coupure (une position sur CHUNK_AVG - CHUNK_MIN)
+WINDOW = 32
+HASH_MULTIPLIER = 0x9E3779B1
+CUT_THRESHOLD = np.uint32(2 ** 32 // (CHUNK_AVG - CHUNK_MIN))
+
+# Lecture du fichier source et taille des tranches hachées (tiennent en cache)
+READ_SIZE = 8 * 1024 * 1024
+HASH_BLOCK = 64 * 1024
+
+# Empreintes: blocs (nom de fichier) et fichier complet
+CHUNK_DIGEST_SIZE = 20
+FILE_DIGEST_SIZE = 32
+
+def file_hasher():
+    """Empreinte d'un fichier complet (BLAKE2b)"""
+    return hashlib.blake2b(digest_size=FILE_DIGEST_SIZE)
+
+def chunk_digest(data) -> str:
+    return hashlib.blake2b(data, digest_size=CHUNK_DIGEST_SIZE).hexdigest()
+
+class ContentChunker:
+    """Découpage d'un flux en blocs définis par le contenu"""
+
+    def __init__(self, min_size: int = CHUNK_MIN, max_size: int = CHUNK_MAX):
+        self.min_size = min_size
+        self.max_size = max_size
+        self._hash = np.empty(HASH_BLOCK + WINDOW, dtype=np.uint32)
+        self._shifted = np.empty_like(self._hash)
+
+    def candidates(self, data: np.ndarray) -> np.ndarray:
+        """
+        Fins de bloc possibles de data (positions après l'octet qui déclenche la coupure)
+
+        Le hachage de la position i couvre data[i - 31:i + 1]; data doit
+        commencer à une limite de bloc (les positions sans fenêtre complète
+        sont en deçà de la taille minimale).
+        """
+        found = []
+        for start in range(0, len(data), HASH_BLOCK):
+            # Chaque tranche reprend les WINDOW - 1 octets précédents
+            first = max(0, start - (WINDOW - 1))
+            segment = data[first:start + HASH_BLOCK]
+            size = len(segment)
+            h = self._hash[:size]
+            shifted = self._shifted[:size]
+            h[:] = segment
+
+            # h[i] = somme des data[i - k] * M^k, k < WINDOW, par doublements de la fenêtre
+            width, factor = 1, HASH_MULTIPLIER
+            while width < WINDOW:
+                np.multiply(h[:-width], np.uint32(factor), out=shifted[width:])
+                h[width:] += shifted[width:]
+                factor = factor * factor % 2 ** 32
+                width *= 2
+
+            hits = np.flatnonzero(h[start - first:] < CUT_THRESHOLD)
+            if len(hits):
+                found.append(hits + (start + 1))
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(found)
+
+    def cut_points(self, data: np.ndarray, final: bool) -> List[int]:
+        """
+        Limites des blocs complets de data (qui commence à une limite)
+
+        Args:
+            data: Octets (uint8)
+            final: Fin du flux: le dernier bloc peut être plus court que le minimum
+
+        Returns:
+            Positions de fin des blocs, croissantes
+        """
+        size = len(data)
+        candidates = self.candidates(data)
+        cuts = []
+        start = 0
+        while start < size:
+            lowest = start + self.min_size
+            highest = start + self.max_size
+            index = np.searchsorted(candidates, lowest)
+            if index < len(candidates) and candidates[index] <= min(highest, size):
+                cut = int(candidates[index])
+            elif highest <= size:
+                cut = highest
+            elif final:
+                cut = size
+            else:
+                # Bloc incomplet: il faut la suite du flux
+                break
+            cuts.append(cut)
+            start = cut
+        return cuts
+
+    def split(self, f: BinaryIO, read_size: int = READ_SIZE) -> Iterator[bytes]:
+        """Lit f jusqu'au bout et produit ses blocs"""
+        pending = b''
+        while True:
+            block = f.read(read_size)
+            final = not block
+            data = pending + block if pending else block
+            cuts = self.cut_points(np.frombuffer(data, dtype=np.uint8), final)
+            start = 0
+            for cut in cuts:
+                yield data[start:cut]
+                start = cut
+            pending = data[start:]
+            if final:
+                return
+
+@dataclass
+class BackupManifest:
+    """Contenu d'une sauvegarde: fichier source et liste ordonnée des blocs"""
+    source: str
+    size: int
+    digest: str
+    mtime_ns: int = 0
+    created: str = ''
+    chunks: List[Tuple[str, int]] = field(default_factory=list)
+    version: int = MANIFEST_VERSION
+
+    @classmethod
+    def load(cls, path) -> 'BackupManifest':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"Version de manifeste non supportée: {data.get('version')}")
+        data['chunks'] = [(digest, size) for digest, size in data['chunks']]
+        return cls(**data)
+
+    def save(self, path):
+        """Écriture atomique (fichier temporaire puis remplacement)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+def is_manifest(path) -> bool:
+    return str(path).endswith(MANIFEST_SUFFIX)
+
+class ChunkStore:
+    """Magasin de blocs adressés par leur empreinte"""
+
+    def __init__(self, root):
+        """
+        Args:
+            root: Répertoire du magasin (créé à la première écriture)
+        """
+        self.root = Path(root)
+        self.chunks_dir = self.root / 'chunks'
+        self.chunker = ContentChunker()
+
+    def chunk_path(self, digest: str) -> Path:
+        return self.chunks_dir / digest[:2] / digest
+
+    def has_chunk(self, digest: str, size: int) -> bool:
+        try:
+            return self.chunk_path(digest).stat().st_size == size
+        except FileNotFoundError:
+            return False
+
+    def put_chunk(self, digest: str, data) -> bool:
+        """
+        Écrit un bloc s'il n'est pas déjà présent
+
+        Returns:
+            True si le bloc a été écrit
+        """
+        if self.has_chunk(digest, len(data)):
+            return False
+        path = self.chunk_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Nom temporaire unique: plusieurs processus peuvent écrire le même bloc
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return True
+
+    def read_chunk(self, digest: str, size: int) -> bytes:
+        with open(self.chunk_path(digest), 'rb') as f:
+            data = f.read()
+        if len(data) != size:
+            raise IOError(f"Bloc tronqué: {digest}")
+        return data
+
+    def store_file(self, filepath) -> Tuple[BackupManifest, int]:
+        """
+        Découpe un fichier et écrit ses blocs nouveaux
+
+        Returns:
+            (manifeste, octets nouvellement écrits)
+        """
+        source = Path(filepath)
+        stat = source.stat()
+        hasher = file_hasher()
+        chunks = []
+        size = written = 0
+
+        with open(source, 'rb') as f:
+            for data in self.chunker.split(f):
+                hasher.update(data)
+                digest = chunk_digest(data)
+                if self.put_chunk(digest, data):
+                    written += len(data)
+                chunks.append((digest, len(data)))
+                size += len(data)
+
+        manifest = BackupManifest(
+            source=str(source.resolve()), size=size, digest=hasher.hexdigest(),
+            mtime_ns=stat.st_mtime_ns, created=datetime.now().isoformat(timespec='seconds'),
+            chunks=chunks,
+        )
+        return manifest, written
+
+    def missing_chunks(self, manifest: BackupManifest) -> List[str]:
+        """Blocs du manifeste absents ou de mauvaise taille"""
+        return [digest for digest, size in manifest.chunks if not self.has_chunk(digest, size)]
+
+    def iter_content(self, manifest: BackupManifest) -> Iterator[bytes]:
+        """Contenu de la sauvegarde, bloc par bloc"""
+        for digest, size in manifest.chunks:
+            yield self.read_chunk(digest, size)
+
+    def restore_to(self, manifest: BackupManifest, out: BinaryIO) -> str:
+        """
+        Écrit le contenu d'une sauvegarde dans un fichier ouvert
+
+        Returns:
+            Empreinte du contenu écrit (à comparer à manifest.digest)
+        """
+        hasher = file_hasher()
+        for data in self.iter_content(manifest):
+            hasher.update(data)
+            out.write(data)
+        return hasher.hexdigest()
+
+    def iter_chunk_files(self) -> Iterator[Path]:
+        if not self.chunks_dir.is_dir():
+            return
+        for fanout in self.chunks_dir.iterdir():
+            if fanout.is_dir():
+                yield from (path for path in fanout.iterdir() if not path.name.startswith('.'))
+
+    def stored_size(self) -> int:
+        """Octets occupés par les blocs"""
+        return sum(path.stat().st_size for path in self.iter_chunk_files())
+
+    def remove_chunks(self, digests: Iterable[str]) -> Tuple[int, int]:
+        """
+        Supprime des blocs connus pour ne plus être référencés
+
+        Returns:
+            (blocs supprimés, octets libérés)
+        """
+        removed = freed = 0
+        for digest in digests:
+            path = self.chunk_path(digest)
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            removed += 1
+            freed += size
+        if removed:
+            logger.info(f"Blocs libérés: {removed} ({freed} octets)")
+        return removed, freed
+
+    def collect_garbage(self, manifests: Iterable[BackupManifest]) -> Tuple[int, int]:
+        """
+        Supprime les blocs qui ne sont référencés par aucun manifeste
+
+        Args:
+            manifests: Tous les manifestes encore conservés
+
+        Returns:
+            (blocs supprimés, octets libérés)
+        """
+        live: Set[str] = set()
+        for manifest in manifests:
+            live.update(digest for digest, _ in manifest.chunks)
+
+        removed = freed = 0
+        for path in list(self.iter_chunk_files()):
+            if path.name not in live:
+                freed += path.stat().st_size
+                path.unlink()
+                removed += 1
+        if removed:
+            logger.info(f"Blocs orphelins supprimés: {removed} ({freed} octets)")
+        return removed, freed
@@ -0,0 +1,42 @@
+"""
+Lecture de la configuration (resources/config.json)
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Fichier de configuration livré avec l'application
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / "resources" / "config.json"
+
+_cache: Dict[str, Dict[str, Any]] = {}
+
+def load_config(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Charge la configuration JSON (mise en cache après la première lecture)
+    
+    Args:
+        path: Chemin du fichier (resources/config.json par défaut)
+        
+    Returns:
+        Dictionnaire de configuration (vide si le fichier est absent ou invalide)
+    """
+    config_path = str(path or DEFAULT_CONFIG_PATH)
+    if config_path not in _cache:
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                _cache[config_path] = json.load(f)
+        except FileNotFoundError:
+            logger.warning(f"Configuration absente: {config_path}")
+            _cache[config_path] = {}
+        except Exception as e:
+            logger.error(f"Erreur lecture configuration: {e}")
+            _cache[config_path] = {}
+    return _cache[config_path]
+
+def get_setting(section: str, key: str, default: Any = None) -> Any:
+    """Retourne config[section][key] ou default"""
+    return load_config().get(section, {}).get(key, default)
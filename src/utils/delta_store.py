@@ -0,0 +1,263 @@
+"""
+Sauvegardes différentielles (delta binaire par rapport à la version précédente)
+
+Chaque sauvegarde .delta décrit le fichier comme une suite d'instructions:
+- copie: plage de la version précédente (offset, longueur)
+- insertion: octets stockés dans la sauvegarde elle-même
+Les correspondances sont trouvées avec les blocs définis par le contenu de
+chunk_store.py (hachage glissant): un bloc dont l'empreinte existe dans la
+version précédente devient une copie, les copies contiguës sont fusionnées.
+Une sauvegarde isolée (image clé) est écrite tous les KEYFRAME_INTERVAL
+versions pour borner la longueur des chaînes.
+
+Format: MAGIC, données insérées, en-tête JSON, puis longueur de l'en-tête
+(uint64) et MAGIC. L'en-tête contient les empreintes des blocs (signature),
+utilisées par la sauvegarde suivante sans relire celle-ci.
+
+La restauration lit la chaîne en flux: une plage copiée est lue dans la
+version précédente, récursivement, par tranches de RESTORE_BLOCK octets.
+"""
+
+import json
+import os
+import struct
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from .chunk_store import ContentChunker, chunk_digest, file_hasher
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+DELTA_SUFFIX = '.delta'
+DELTA_VERSION = 1
+MAGIC = b'TSDELTA1'
+TRAILER = struct.Struct('<Q8s')
+
+# Une image clé toutes les KEYFRAME_INTERVAL sauvegardes d'un même fichier
+KEYFRAME_INTERVAL = 24
+
+# Taille des lectures pendant la restauration
+RESTORE_BLOCK = 1024 * 1024
+
+OP_COPY = 'c'
+OP_INSERT = 'i'
+
+def is_delta(path) -> bool:
+    return str(path).endswith(DELTA_SUFFIX)
+
+class DeltaBackup:
+    """Sauvegarde différentielle ouverte en lecture"""
+
+    def __init__(self, path, header: dict):
+        self.path = Path(path)
+        self.header = header
+        self._file: Optional[BinaryIO] = None
+
+        # Position de chaque instruction dans le fichier reconstruit
+        self._starts = []
+        position = 0
+        for _, _, length in header['instructions']:
+            self._starts.append(position)
+            position += length
+
+    @classmethod
+    def open(cls, path) -> 'DeltaBackup':
+        """Lit l'en-tête (en fin de fichier)"""
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Pas une sauvegarde différentielle: {path}")
+            f.seek(-TRAILER.size, os.SEEK_END)
+            header_size, magic = TRAILER.unpack(f.read(TRAILER.size))
+            if magic != MAGIC:
+                raise ValueError(f"Sauvegarde différentielle incomplète: {path}")
+            f.seek(-(TRAILER.size + header_size), os.SEEK_END)
+            header = json.loads(f.read(header_size).decode('utf-8'))
+        if header.get('version') != DELTA_VERSION:
+            raise ValueError(f"Version de delta non supportée: {header.get('version')}")
+        return cls(path, header)
+
+    @property
+    def source(self) -> str:
+        return self.header['source']
+
+    @property
+    def size(self) -> int:
+        return self.header['size']
+
+    @property
+    def digest(self) -> str:
+        return self.header['digest']
+
+    @property
+    def depth(self) -> int:
+        """Nombre de versions à remonter jusqu'à l'image clé"""
+        return self.header['depth']
+
+    @property
+    def base_path(self) -> Optional[Path]:
+        base = self.header.get('base')
+        return (self.path.parent / base).resolve() if base else None
+
+    def signature(self) -> Dict[str, int]:
+        """{empreinte de bloc: offset de sa première occurrence}"""
+        offsets = {}
+        position = 0
+        for digest, size in self.header['chunks']:
+            offsets.setdefault(digest, position)
+            position += size
+        return offsets
+
+    def chain(self) -> List[Path]:
+        """Fichiers nécessaires à la restauration (celui-ci d'abord)"""
+        paths = [self.path]
+        backup = self
+        while backup.base_path is not None:
+            paths.append(backup.base_path)
+            backup = DeltaBackup.open(backup.base_path)
+        return paths
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read_payload(self, offset: int, length: int) -> Iterator[bytes]:
+        if self._file is None:
+            self._file = open(self.path, 'rb')
+        self._file.seek(len(MAGIC) + offset)
+        while length > 0:
+            data = self._file.read(min(length, RESTORE_BLOCK))
+            if not data:
+                raise IOError(f"Sauvegarde tronquée: {self.path}")
+            length -= len(data)
+            yield data
+
+    def iter_range(self, offset: int, length: int, bases: Dict[Path, 'DeltaBackup']) -> Iterator[bytes]:
+        """
+        Produit les octets [offset, offset + length) de cette version
+
+        Args:
+            bases: Versions précédentes déjà ouvertes (partagées le long de la chaîne)
+        """
+        instructions = self.header['instructions']
+        index = bisect_right(self._starts, offset) - 1
+        while length > 0:
+            if index >= len(instructions):
+                raise IOError(f"Plage hors du fichier: {self.path}")
+            op, source, size = instructions[index]
+            skip = offset - self._starts[index]
+            count = min(size - skip, length)
+            if op == OP_INSERT:
+                yield from self._read_payload(source + skip, count)
+            else:
+                yield from self._base(bases).iter_range(source + skip, count, bases)
+            offset += count
+            length -= count
+            index += 1
+
+    def _base(self, bases: Dict[Path, 'DeltaBackup']) -> 'DeltaBackup':
+        path = self.base_path
+        if path is None:
+            raise IOError(f"Copie sans version de base: {self.path}")
+        if path not in bases:
+            bases[path] = DeltaBackup.open(path)
+        return bases[path]
+
+    def restore_to(self, out: BinaryIO) -> str:
+        """
+        Écrit le contenu de cette version dans un fichier ouvert
+
+        Returns:
+            Empreinte du contenu écrit (à comparer à self.digest)
+        """
+        hasher = file_hasher()
+        bases: Dict[Path, DeltaBackup] = {}
+        try:
+            for data in self.iter_range(0, self.size, bases):
+                hasher.update(data)
+                out.write(data)
+        finally:
+            self.close()
+            for base in bases.values():
+                base.close()
+        return hasher.hexdigest()
+
+def _append(instructions: List[list], op: str, source: int, length: int):
+    """Ajoute une instruction en la fusionnant avec la précédente si elles se suivent"""
+    if instructions:
+        last = instructions[-1]
+        if last[0] == op and last[1] + last[2] == source:
+            last[2] += length
+            return
+    instructions.append([op, source, length])
+
+def write_delta(filepath, target, base: Optional[DeltaBackup] = None,
+                chunker: Optional[ContentChunker] = None) -> Tuple[DeltaBackup, int]:
+    """
+    Écrit la sauvegarde différentielle d'un fichier
+
+    Args:
+        filepath: Fichier à sauvegarder
+        target: Fichier .delta à créer
+        base: Version précédente (None ou chaîne trop longue: image clé)
+        chunker: Découpeur de blocs (ContentChunker par défaut)
+
+    Returns:
+        (sauvegarde écrite, octets insérés)
+    """
+    source = Path(filepath)
+    target = Path(target)
+    chunker = chunker or ContentChunker()
+    stat = source.stat()
+
+    keyframe = base is None or base.depth + 1 >= KEYFRAME_INTERVAL
+    signature = {} if keyframe else base.signature()
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = target.with_name(target.name + '.tmp')
+    hasher = file_hasher()
+    chunks, instructions = [], []
+    size = inserted = 0
+
+    try:
+        with open(source, 'rb') as f, open(temp_path, 'wb') as out:
+            out.write(MAGIC)
+            for data in chunker.split(f):
+                digest = chunk_digest(data)
+                hasher.update(data)
+                chunks.append((digest, len(data)))
+                size += len(data)
+
+                base_offset = signature.get(digest)
+                if base_offset is not None:
+                    _append(instructions, OP_COPY, base_offset, len(data))
+                else:
+                    _append(instructions, OP_INSERT, inserted, len(data))
+                    out.write(data)
+                    inserted += len(data)
+
+            header = {
+                'version': DELTA_VERSION,
+                'source': str(source.resolve()),
+                'size': size,
+                'digest': hasher.hexdigest(),
+                'mtime_ns': stat.st_mtime_ns,
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'base': None if keyframe else os.path.relpath(base.path, target.parent),
+                'depth': 0 if keyframe else base.depth + 1,
+                'chunks': chunks,
+                'instructions': instructions,
+            }
+            encoded = json.dumps(header, separators=(',', ':')).encode('utf-8')
+            out.write(encoded)
+            out.write(TRAILER.pack(len(encoded), MAGIC))
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(temp_path, target)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+    return DeltaBackup(target, header), inserted
@@ -0,0 +1,104 @@
+"""
+Cache des empreintes de fichiers, indexé par (chemin, taille, mtime_ns)
+
+Évite de relire un fichier inchangé pour le sauvegarder ou le vérifier.
+Une empreinte calculée moins de RACY_WINDOW_NS après la dernière
+modification du fichier n'est pas réutilisée: une écriture dans la même
+unité de temps que la lecture laisserait (taille, mtime) inchangés.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_VERSION = 1
+
+# Nombre d'entrées conservées (les plus anciennes sont oubliées)
+MAX_ENTRIES = 10000
+
+# Marge entre la modification du fichier et le calcul de l'empreinte
+RACY_WINDOW_NS = 2 * 1_000_000_000
+
+class DigestCache:
+    """Empreintes BLAKE2b connues, persistées dans un fichier JSON"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Fichier du cache (créé au premier enregistrement)
+        """
+        self.path = Path(path)
+        self._entries: Optional[Dict[str, list]] = None
+
+    def _load(self) -> Dict[str, list]:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self._entries = data['entries']
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Cache d'empreintes ignoré ({self.path}): {e}")
+        return self._entries
+
+    @staticmethod
+    def _key(filepath) -> str:
+        return os.path.abspath(filepath)
+
+    def get(self, filepath, stat: Optional[os.stat_result] = None) -> Optional[str]:
+        """
+        Empreinte connue du fichier, si sa taille et sa date n'ont pas changé
+
+        Args:
+            filepath: Fichier
+            stat: Résultat de os.stat() déjà disponible
+        """
+        entry = self._load().get(self._key(filepath))
+        if entry is None:
+            return None
+        stat = stat or os.stat(filepath)
+        size, mtime_ns, hashed_ns, digest = entry
+        if size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+            return None
+        if hashed_ns - mtime_ns < RACY_WINDOW_NS:
+            return None
+        return digest
+
+    def put(self, filepath, size: int, mtime_ns: int, digest: str, save: bool = True):
+        """
+        Enregistre l'empreinte d'un fichier
+
+        Args:
+            size, mtime_ns: os.stat() pris avant la lecture qui a produit digest
+            save: Écrire le cache sur le disque immédiatement
+        """
+        entries = self._load()
+        key = self._key(filepath)
+        entries.pop(key, None)
+        entries[key] = [size, mtime_ns, time.time_ns(), digest]
+        while len(entries) > MAX_ENTRIES:
+            del entries[next(iter(entries))]
+        if save:
+            self.save()
+
+    def save(self):
+        """Écriture atomique du cache"""
+        if self._entries is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': self._entries}, f,
+                          separators=(',', ':'))
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.error(f"Erreur écriture cache d'empreintes: {e}")
@@ -0,0 +1,184 @@
+"""
+Copie de fichiers sans passer les données par Python
+
+Méthodes essayées dans l'ordre, la suivante prenant le relais dès que le
+système ou le système de fichiers refuse la précédente:
+1. clone (ioctl FICLONE, btrfs/xfs): partage des blocs, quasi instantané
+2. os.copy_file_range: copie dans le noyau (côté serveur sur NFS/SMB)
+3. os.sendfile: copie dans le noyau
+4. lecture/écriture par tampons
+La méthode utilisée est retournée et journalisée.
+
+Si une empreinte est demandée, elle est calculée pendant la copie: les
+données passent alors par des tampons (sauf clonage, où seule la source
+est lue).
+"""
+
+import errno
+import os
+import shutil
+from typing import Tuple
+from .logger import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = get_logger(__name__)
+
+COPY_REFLINK = 'reflink'
+COPY_FILE_RANGE = 'copy_file_range'
+COPY_SENDFILE = 'sendfile'
+COPY_BUFFERED = 'buffered'
+
+# _IOW(0x94, 9, int): clone d'un fichier complet (linux/fs.h)
+FICLONE = 0x40049409
+
+# Taille maximale d'un appel système de copie, et des tampons du dernier recours
+SYSCALL_CHUNK = 1024 * 1024 * 1024
+BUFFER_SIZE = 1024 * 1024
+
+# Erreurs signifiant « méthode non disponible ici » (on passe à la suivante)
+UNSUPPORTED_ERRNOS = {
+    errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTTY,
+    errno.EBADF, errno.ETXTBSY, getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP),
+}
+
+# Méthodes absentes du noyau (ENOSYS): inutile de les réessayer
+_missing = set()
+
+def _unsupported(error: OSError, method: str) -> bool:
+    if error.errno == errno.ENOSYS:
+        _missing.add(method)
+    return error.errno in UNSUPPORTED_ERRNOS
+
+def _clone(src_fd: int, dst_fd: int) -> bool:
+    """Clone le fichier complet (la destination doit être vide)"""
+    if fcntl is None or COPY_REFLINK in _missing:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError as e:
+        if _unsupported(e, COPY_REFLINK):
+            return False
+        raise
+
+def _interrupted(error: OSError, copied: int) -> OSError:
+    """Échec après une copie partielle: pas de repli possible (position de destination modifiée)"""
+    return IOError(f"Copie interrompue après {copied} octets: {error}")
+
+def _copy_file_range(src_fd: int, dst_fd: int, offset: int, length: int) -> int:
+    copied = 0
+    while copied < length:
+        try:
+            count = os.copy_file_range(src_fd, dst_fd, min(length - copied, SYSCALL_CHUNK),
+                                       offset + copied)
+        except OSError as e:
+            if copied:
+                raise _interrupted(e, copied) from e
+            raise
+        if count == 0:
+            break
+        copied += count
+    return copied
+
+def _sendfile(src_fd: int, dst_fd: int, offset: int, length: int) -> int:
+    copied = 0
+    while copied < length:
+        try:
+            count = os.sendfile(dst_fd, src_fd, offset + copied, min(length - copied, SYSCALL_CHUNK))
+        except OSError as e:
+            if copied:
+                raise _interrupted(e, copied) from e
+            raise
+        if count == 0:
+            break
+        copied += count
+    return copied
+
+def _buffered(src_fd: int, dst_fd: int, offset: int, length: int, hasher=None) -> int:
+    copied = 0
+    while copied < length:
+        size = min(length - copied, BUFFER_SIZE)
+        if hasattr(os, 'pread'):
+            block = os.pread(src_fd, size, offset + copied)
+        else:
+            os.lseek(src_fd, offset + copied, os.SEEK_SET)
+            block = os.read(src_fd, size)
+        if not block:
+            break
+        if hasher is not None:
+            hasher.update(block)
+        if dst_fd is not None:
+            view = memoryview(block)
+            while view:
+                view = view[os.write(dst_fd, view):]
+        copied += len(block)
+    return copied
+
+# Méthodes de copie d'une plage, dans l'ordre de préférence
+_RANGE_METHODS = [
+    (COPY_FILE_RANGE, _copy_file_range, hasattr(os, 'copy_file_range')),
+    (COPY_SENDFILE, _sendfile, hasattr(os, 'sendfile')),
+    (COPY_BUFFERED, _buffered, True),
+]
+
+def copy_range(src_fd: int, dst_fd: int, offset: int, length: int) -> Tuple[str, int]:
+    """
+    Copie [offset, offset + length) de src_fd à la position courante de dst_fd
+
+    Returns:
+        (méthode de la dernière portion copiée, octets copiés: moins que
+        length seulement si la source est plus courte)
+    """
+    copied = 0
+    method = COPY_BUFFERED
+    for method, copy, available in _RANGE_METHODS:
+        if not available or method in _missing:
+            continue
+        try:
+            copied += copy(src_fd, dst_fd, offset + copied, length - copied)
+            break
+        except OSError as e:
+            # Refusée dès le premier appel: la position de dst_fd n'a pas changé
+            if not _unsupported(e, method):
+                raise
+    return method, copied
+
+def copy_file(src, dst, metadata: bool = True, hasher=None) -> str:
+    """
+    Copie un fichier par la méthode la plus rapide disponible
+
+    Args:
+        src: Fichier source
+        dst: Fichier de destination (remplacé s'il existe)
+        metadata: Copier aussi dates et permissions (comme shutil.copy2)
+        hasher: Objet hashlib mis à jour avec le contenu copié (une seule lecture)
+
+    Returns:
+        Méthode utilisée (COPY_REFLINK, COPY_FILE_RANGE, COPY_SENDFILE ou COPY_BUFFERED)
+
+    Raises:
+        IOError: si la source change de taille pendant la copie
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(src_fd).st_size
+        if _clone(src_fd, dst_fd):
+            method, copied = COPY_REFLINK, size
+            if hasher is not None:
+                # Rien n'a été lu: la source est lue une fois pour l'empreinte
+                copied = _buffered(src_fd, None, 0, size, hasher)
+        elif hasher is not None:
+            method, copied = COPY_BUFFERED, _buffered(src_fd, dst_fd, 0, size, hasher)
+        else:
+            method, copied = copy_range(src_fd, dst_fd, 0, size)
+    if copied != size:
+        raise IOError(f"Copie incomplète de {src}: {copied}/{size} octets")
+
+    if metadata:
+        shutil.copystat(src, dst)
+    logger.info(f"Copie {src} -> {dst}: {method} ({size} octets)")
+    return method
@@ -0,0 +1,94 @@
+"""
+Verrou exclusif partagé entre threads et entre processus
+
+Le verrou inter-processus est posé sur un fichier dédié (fcntl.flock sous
+Unix, msvcrt.locking sous Windows); il est libéré par le système si le
+processus qui le tient se termine. Un verrou de thread réentrant le
+complète: le même thread peut le reprendre sans se bloquer, et le fichier
+n'est verrouillé qu'au premier niveau.
+"""
+
+import os
+import threading
+from pathlib import Path
+from .logger import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # Unix
+    msvcrt = None
+
+logger = get_logger(__name__)
+
+def _lock_file(fd: int):
+    """Attend le verrou exclusif du fichier"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    while True:
+        try:
+            # LK_LOCK abandonne après 10 secondes: on recommence
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            logger.warning("Verrou des sauvegardes occupé, nouvelle tentative")
+
+def _unlock_file(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return
+    os.lseek(fd, 0, os.SEEK_SET)
+    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+class FileLock:
+    """Verrou exclusif réentrant, utilisable avec "with" """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Fichier verrou (créé à la première acquisition)
+        """
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    _lock_file(fd)
+                except BaseException:
+                    os.close(fd)
+                    raise
+            except BaseException:
+                self._thread_lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            try:
+                _unlock_file(fd)
+            finally:
+                os.close(fd)
+        self._thread_lock.release()
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -4,8 +4,27 @@ Utilitaires pour la manipulation hexadécimale
 
 import struct
 import binascii
+from bisect import bisect_left
 from typing import Union, List, Tuple, Optional
 
+# Structs précompilés des entiers: (taille, signé, little-endian) -> struct.Struct
+_INT_CODES = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}
+_INT_STRUCTS = {
+    (size, signed, little_endian): struct.Struct(
+        ('<' if little_endian else '>') + (code if signed else code.upper())
+    )
+    for size, code in _INT_CODES.items()
+    for signed in (False, True)
+    for little_endian in (False, True)
+}
+
+def _int_struct(size: int, signed: bool, little_endian: bool) -> struct.Struct:
+    """Struct précompilé d'un entier"""
+    try:
+        return _INT_STRUCTS[size, bool(signed), bool(little_endian)]
+    except KeyError:
+        raise ValueError(f"Taille non supportée: {size}") from None
+
 class HexUtils:
     """Classe utilitaire pour les opérations hexadécimales"""
     
@@ -85,7 +104,8 @@ class HexUtils:
         return '\n'.join(result)
     
     @staticmethod
-    def find_pattern(data: bytes, pattern: bytes, start_offset: int = 0) -> List[int]:
+    def find_pattern(data: bytes, pattern: bytes, start_offset: int = 0,
+                     index=None, dirty_ranges=()) -> List[int]:
         """
         Trouve toutes les occurrences d'un pattern dans des bytes
         
@@ -93,10 +113,16 @@ class HexUtils:
             data: Bytes dans lesquels chercher
             pattern: Pattern à trouver
             start_offset: Offset de départ pour la recherche
+            index: SearchIndex de data (optionnel) pour éviter un balayage complet
+            dirty_ranges: Plages modifiées depuis la dernière mise à jour de l'index
             
         Returns:
             Liste des offsets où le pattern a été trouvé
         """
+        if index is not None:
+            hits = index.find_all(data, pattern, dirty_ranges)
+            return hits[bisect_left(hits, start_offset):]
+        
         offsets = []
         pos = data.find(pattern, start_offset)
         
@@ -106,6 +132,22 @@ class HexUtils:
         
         return offsets
     
+    @staticmethod
+    def find_patterns(data: bytes, patterns: List[bytes], start_offset: int = 0) -> List[Tuple[int, int]]:
+        """
+        Trouve toutes les occurrences de plusieurs patterns en une seule passe
+        
+        Args:
+            data: Bytes dans lesquels chercher
+            patterns: Patterns à trouver (leur indice sert d'identifiant)
+            start_offset: Offset de départ pour la recherche
+            
+        Returns:
+            Liste de tuples (indice du pattern, offset) triée par offset
+        """
+        from .pattern_search import MultiPatternSearch
+        return MultiPatternSearch(patterns).find_all(data, start_offset)
+    
     @staticmethod
     def read_int(data: bytes, offset: int, size: int = 4, signed: bool = False, 
                  little_endian: bool = True) -> int:
@@ -122,20 +164,7 @@ class HexUtils:
         Returns:
             Entier lu
         """
-        endian = '<' if little_endian else '>'
-        
-        fmt_map = {
-            1: 'b' if signed else 'B',
-            2: 'h' if signed else 'H',
-            4: 'i' if signed else 'I',
-            8: 'q' if signed else 'Q'
-        }
-        
-        if size not in fmt_map:
-            raise ValueError(f"Taille non supportée: {size}")
-        
-        fmt = endian + fmt_map[size]
-        return struct.unpack_from(fmt, data, offset)[0]
+        return _int_struct(size, signed, little_endian).unpack_from(data, offset)[0]
     
     @staticmethod
     def write_int(value: int, size: int = 4, signed: bool = False, 
@@ -152,20 +181,7 @@ class HexUtils:
         Returns:
             Bytes représentant l'entier
         """
-        endian = '<' if little_endian else '>'
-        
-        fmt_map = {
-            1: 'b' if signed else 'B',
-            2: 'h' if signed else 'H',
-            4: 'i' if signed else 'I',
-            8: 'q' if signed else 'Q'
-        }
-        
-        if size not in fmt_map:
-            raise ValueError(f"Taille non supportée: {size}")
-        
-        fmt = endian + fmt_map[size]
-        return struct.pack(fmt, value)
+        return _int_struct(size, signed, little_endian).pack(value)
     
     @staticmethod
     def read_string(data: bytes, offset: int, encoding: str = 'utf-8', 
@@ -0,0 +1,178 @@
+"""
+Trace du coût d'import des modules (diagnostic du démarrage)
+
+Activée par l'option --trace-imports de main.py ou la variable
+d'environnement TS_TOOL_IMPORT_TRACE=1. Chaque module importé ensuite est
+chronométré: temps propre (exécution du module seul) et temps cumulé
+(avec les modules qu'il importe). report() liste les plus coûteux.
+
+Sert à tenir le budget de démarrage (temps jusqu'à la première fenêtre,
+ui.startup_budget_ms dans config.json).
+"""
+
+import importlib.abc
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+ENV_VAR = 'TS_TOOL_IMPORT_TRACE'
+DEFAULT_BUDGET_MS = 300
+
+@dataclass
+class ImportRecord:
+    """Coût d'import d'un module (en secondes)"""
+    name: str
+    self_time: float
+    cumulative: float
+    depth: int
+
+class _TimedLoader:
+    """Enveloppe un loader pour chronométrer la création et l'exécution du module"""
+
+    def __init__(self, tracer: '_ImportTracer', loader):
+        self._tracer = tracer
+        self._loader = loader
+
+    def create_module(self, spec):
+        create = getattr(self._loader, 'create_module', None)
+        if create is None:
+            return None
+        # Modules d'extension: le code natif est chargé ici
+        return self._tracer.timed(spec.name, create, spec, record=False)
+
+    def exec_module(self, module):
+        # Le module garde son vrai loader (importlib.resources, pkgutil...)
+        spec = module.__spec__
+        spec.loader = self._loader
+        module.__loader__ = self._loader
+        self._tracer.timed(spec.name, self._loader.exec_module, module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+class _ImportTracer(importlib.abc.MetaPathFinder):
+    """Finder placé en tête de sys.meta_path, qui délègue aux suivants"""
+
+    def __init__(self):
+        self.records: List[ImportRecord] = []
+        self._stack: List[float] = []    # temps des imports enfants, par niveau
+        self._pending = {}               # temps de create_module par module
+        self._finding = set()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname in self._finding:
+            return None
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                        spec.loader = _TimedLoader(self, spec.loader)
+                    return spec
+            return None
+        finally:
+            self._finding.discard(fullname)
+
+    def timed(self, name: str, func, arg, record: bool = True):
+        depth = len(self._stack)
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return func(arg)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            if record:
+                created = self._pending.pop(name, 0.0)
+                self.records.append(ImportRecord(name, elapsed - children + created,
+                                                 elapsed + created, depth))
+            else:
+                self._pending[name] = self._pending.get(name, 0.0) + elapsed - children
+
+_tracer: Optional[_ImportTracer] = None
+
+def requested(argv=None) -> bool:
+    """True si la trace est demandée (option --trace-imports ou variable d'environnement)"""
+    argv = sys.argv if argv is None else argv
+    return '--trace-imports' in argv or os.environ.get(ENV_VAR, '') not in ('', '0')
+
+def install():
+    """Active la trace pour tous les imports suivants"""
+    global _tracer
+    if _tracer is None:
+        _tracer = _ImportTracer()
+        sys.meta_path.insert(0, _tracer)
+
+def uninstall():
+    """Arrête la trace (les mesures déjà faites sont conservées)"""
+    if _tracer is not None and _tracer in sys.meta_path:
+        sys.meta_path.remove(_tracer)
+
+def is_active() -> bool:
+    return _tracer is not None and _tracer in sys.meta_path
+
+def records() -> List[ImportRecord]:
+    """Mesures dans l'ordre de fin d'import"""
+    return list(_tracer.records) if _tracer is not None else []
+
+def report(top: int = 25) -> List[str]:
+    """
+    Résumé des imports les plus coûteux (temps propre décroissant)
+
+    Args:
+        top: Nombre de modules listés
+
+    Returns:
+        Lignes de texte (vide si la trace n'est pas active)
+    """
+    measured = records()
+    if not measured:
+        return []
+
+    # Seuls les imports de premier niveau s'additionnent au temps total
+    total = sum(record.cumulative for record in measured if record.depth == 0)
+    lines = [f"Imports: {len(measured)} modules, {total * 1000:.1f} ms",
+             f"{'propre (ms)':>12}{'cumulé (ms)':>13}  module"]
+    for record in sorted(measured, key=lambda r: r.self_time, reverse=True)[:top]:
+        lines.append(f"{record.self_time * 1000:>12.1f}{record.cumulative * 1000:>13.1f}  "
+                     f"{record.name}")
+    return lines
+
+def check_budget(label: str, elapsed: float, budget_ms: Optional[float] = None) -> bool:
+    """
+    Journalise un temps de démarrage et le compare au budget
+
+    Args:
+        label: Étape mesurée (ex. "première fenêtre")
+        elapsed: Durée en secondes
+        budget_ms: Budget en ms (ui.startup_budget_ms de la config par défaut)
+
+    Returns:
+        True si le budget est respecté
+    """
+    from .config import get_setting
+    from .logger import get_logger
+
+    logger = get_logger(__name__)
+    if budget_ms is None:
+        budget_ms = get_setting('ui', 'startup_budget_ms', DEFAULT_BUDGET_MS)
+
+    elapsed_ms = elapsed * 1000
+    if elapsed_ms > budget_ms:
+        logger.warning(f"Démarrage: {label} en {elapsed_ms:.0f} ms "
+                       f"(budget {budget_ms:.0f} ms dépassé)")
+        for line in report():
+            logger.warning(line)
+        return False
+
+    logger.info(f"Démarrage: {label} en {elapsed_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+    for line in report():
+        logger.info(line)
+    return True
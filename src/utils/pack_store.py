@@ -0,0 +1,248 @@
+"""
+Sauvegardes compressées par blocs indépendants (zlib ou lzma)
+
+Le fichier est découpé en blocs de PACK_BLOCK_SIZE octets compressés
+séparément, en parallèle (zlib et lzma libèrent le GIL), par fenêtre bornée
+de blocs. Un bloc que la compression n'a pas réduit est stocké tel quel.
+
+Format: MAGIC, blocs, en-tête JSON, puis longueur de l'en-tête (uint64) et
+MAGIC. L'en-tête contient l'index des blocs (position, taille stockée,
+taille d'origine, compressé ou non): la restauration se fait en flux et un
+bloc isolé se lit sans décompresser le reste du fichier.
+"""
+
+import json
+import lzma
+import os
+import struct
+import zlib
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, Optional, Tuple
+from .chunk_store import file_hasher
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PACK_SUFFIX = '.pack'
+PACK_VERSION = 1
+MAGIC = b'TSPACK01'
+TRAILER = struct.Struct('<Q8s')
+
+# Taille d'un bloc avant compression (unité d'accès direct)
+PACK_BLOCK_SIZE = 1024 * 1024
+
+CODEC_ZLIB = 'zlib'
+CODEC_LZMA = 'lzma'
+
+# Codec: (compression, décompression). lzma preset 1: presque le taux du
+# preset 6 pour une fraction du temps (sauvegardes faites à l'enregistrement)
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    CODEC_ZLIB: (lambda data: zlib.compress(data, 6), zlib.decompress),
+    CODEC_LZMA: (lambda data: lzma.compress(data, preset=1), lzma.decompress),
+}
+
+def is_pack(path) -> bool:
+    return str(path).endswith(PACK_SUFFIX)
+
+def _compress_block(codec: str, data: bytes) -> Tuple[bytes, bool]:
+    """Bloc compressé, ou le bloc d'origine si la compression ne le réduit pas"""
+    compressed = CODECS[codec][0](data)
+    if len(compressed) < len(data):
+        return compressed, True
+    return data, False
+
+class PackedBackup:
+    """Sauvegarde compressée ouverte en lecture"""
+
+    def __init__(self, path, header: dict):
+        self.path = Path(path)
+        self.header = header
+
+        # Position de chaque bloc dans le fichier d'origine
+        self._starts = []
+        position = 0
+        for _, _, raw_size, _ in header['blocks']:
+            self._starts.append(position)
+            position += raw_size
+
+    @classmethod
+    def open(cls, path) -> 'PackedBackup':
+        """Lit l'en-tête (en fin de fichier)"""
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Pas une sauvegarde compressée: {path}")
+            f.seek(-TRAILER.size, os.SEEK_END)
+            header_size, magic = TRAILER.unpack(f.read(TRAILER.size))
+            if magic != MAGIC:
+                raise ValueError(f"Sauvegarde compressée incomplète: {path}")
+            f.seek(-(TRAILER.size + header_size), os.SEEK_END)
+            header = json.loads(f.read(header_size).decode('utf-8'))
+        if header.get('version') != PACK_VERSION:
+            raise ValueError(f"Version de sauvegarde compressée non supportée: {header.get('version')}")
+        if header.get('codec') not in CODECS:
+            raise ValueError(f"Codec inconnu: {header.get('codec')}")
+        return cls(path, header)
+
+    @property
+    def source(self) -> str:
+        return self.header['source']
+
+    @property
+    def size(self) -> int:
+        return self.header['size']
+
+    @property
+    def digest(self) -> str:
+        return self.header['digest']
+
+    @property
+    def block_count(self) -> int:
+        return len(self.header['blocks'])
+
+    def _decode(self, stored: bytes, index: int) -> bytes:
+        _, _, raw_size, compressed = self.header['blocks'][index]
+        data = CODECS[self.header['codec']][1](stored) if compressed else stored
+        if len(data) != raw_size:
+            raise IOError(f"Bloc {index} corrompu: {self.path}")
+        return data
+
+    def _read_stored(self, f: BinaryIO, index: int) -> bytes:
+        offset, length, _, _ = self.header['blocks'][index]
+        f.seek(offset)
+        stored = f.read(length)
+        if len(stored) != length:
+            raise IOError(f"Sauvegarde tronquée: {self.path}")
+        return stored
+
+    def read_block(self, index: int) -> bytes:
+        """Contenu d'origine d'un bloc (seul ce bloc est lu et décompressé)"""
+        with open(self.path, 'rb') as f:
+            return self._decode(self._read_stored(f, index), index)
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Octets [offset, offset + length) du fichier d'origine"""
+        length = max(0, min(length, self.size - offset))
+        parts = []
+        index = bisect_right(self._starts, offset) - 1
+        with open(self.path, 'rb') as f:
+            while length > 0:
+                data = self._decode(self._read_stored(f, index), index)
+                skip = offset - self._starts[index]
+                part = data[skip:skip + length]
+                parts.append(part)
+                offset += len(part)
+                length -= len(part)
+                index += 1
+        return b''.join(parts)
+
+    def iter_blocks(self, workers: Optional[int] = None) -> Iterator[bytes]:
+        """Contenu d'origine, bloc par bloc, décompressé en parallèle"""
+        workers = workers or os.cpu_count() or 1
+        count = self.block_count
+        with open(self.path, 'rb') as f, ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            next_block = 0
+            while next_block < count or pending:
+                # Fenêtre bornée: au plus 2 blocs par thread en mémoire
+                while next_block < count and len(pending) < workers * 2:
+                    stored = self._read_stored(f, next_block)
+                    pending.append(executor.submit(self._decode, stored, next_block))
+                    next_block += 1
+                yield pending.popleft().result()
+
+    def restore_to(self, out: BinaryIO) -> str:
+        """
+        Écrit le contenu d'origine dans un fichier ouvert
+
+        Returns:
+            Empreinte du contenu écrit (à comparer à self.digest)
+        """
+        hasher = file_hasher()
+        for data in self.iter_blocks():
+            hasher.update(data)
+            out.write(data)
+        return hasher.hexdigest()
+
+def write_pack(filepath, target, codec: str = CODEC_ZLIB, block_size: int = PACK_BLOCK_SIZE,
+               workers: Optional[int] = None) -> PackedBackup:
+    """
+    Écrit la sauvegarde compressée d'un fichier
+
+    Args:
+        filepath: Fichier à sauvegarder
+        target: Fichier .pack à créer
+        codec: CODEC_ZLIB ou CODEC_LZMA
+        block_size: Taille des blocs avant compression
+        workers: Nombre de threads de compression
+
+    Returns:
+        Sauvegarde écrite
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Codec inconnu: {codec}")
+    source = Path(filepath)
+    target = Path(target)
+    workers = workers or os.cpu_count() or 1
+    stat = source.stat()
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = target.with_name(target.name + '.tmp')
+    hasher = file_hasher()
+    blocks = []
+    size = 0
+
+    try:
+        with open(source, 'rb') as f, open(temp_path, 'wb') as out, \
+                ThreadPoolExecutor(max_workers=workers) as executor:
+            out.write(MAGIC)
+            position = len(MAGIC)
+            pending = deque()
+            exhausted = False
+
+            while not exhausted or pending:
+                # Fenêtre bornée: au plus 2 blocs par thread en mémoire
+                while not exhausted and len(pending) < workers * 2:
+                    data = f.read(block_size)
+                    if not data:
+                        exhausted = True
+                        break
+                    hasher.update(data)
+                    size += len(data)
+                    pending.append((executor.submit(_compress_block, codec, data), len(data)))
+                if not pending:
+                    break
+
+                future, raw_size = pending.popleft()
+                stored, compressed = future.result()
+                out.write(stored)
+                blocks.append([position, len(stored), raw_size, compressed])
+                position += len(stored)
+
+            if os.stat(source).st_mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+                raise IOError(f"Fichier modifié pendant la sauvegarde: {source}")
+
+            header = {
+                'version': PACK_VERSION,
+                'codec': codec,
+                'source': str(source.resolve()),
+                'size': size,
+                'digest': hasher.hexdigest(),
+                'mtime_ns': stat.st_mtime_ns,
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'blocks': blocks,
+            }
+            encoded = json.dumps(header, separators=(',', ':')).encode('utf-8')
+            out.write(encoded)
+            out.write(TRAILER.pack(len(encoded), MAGIC))
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(temp_path, target)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+    return PackedBackup(target, header)
@@ -0,0 +1,303 @@
+"""
+Recherche parallèle par blocs sur plusieurs cœurs
+
+Le buffer est découpé en blocs qui se chevauchent de (longueur du plus long
+motif - 1) octets. Chaque bloc est cherché dans un processus du pool; les
+processus ouvrent eux-mêmes le fichier source en mmap, les données ne sont
+donc jamais sérialisées. Les octets modifiés en mémoire (plages sales) sont
+recherchés dans le processus appelant et fusionnés avec le reste.
+"""
+
+import heapq
+import mmap
+import multiprocessing
+import os
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+from utils.pattern_search import MultiPatternSearch
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Taille d'un bloc confié à un processus
+CHUNK_SIZE = 16 * 1024 * 1024
+
+# En dessous de cette taille, la recherche se fait directement (sans pool)
+PARALLEL_THRESHOLD = 2 * CHUNK_SIZE
+
+# Pool partagé entre les recherches (créé à la première utilisation)
+_executor = None
+_executor_lock = threading.Lock()
+
+# Caches propres à chaque processus du pool
+_worker_mapping = None  # ((chemin, inode, taille), fichier, mmap)
+_worker_matchers = {}
+
+def get_executor(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Retourne le pool de processus de recherche (créé à la demande)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # "spawn": pas de fork d'un processus qui fait tourner des threads Qt
+            _executor = ProcessPoolExecutor(
+                max_workers=workers or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _executor
+
+def shutdown_executor():
+    """Arrête le pool de processus de recherche"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+def _open_worker_mapping(path: str):
+    """Ouvre (ou réutilise) la projection mémoire du fichier dans un processus du pool"""
+    global _worker_mapping
+    stat = os.stat(path)
+    key = (path, stat.st_ino, stat.st_size)
+
+    if _worker_mapping is not None:
+        if _worker_mapping[0] == key:
+            return _worker_mapping[2]
+        _worker_mapping[2].close()
+        _worker_mapping[1].close()
+        _worker_mapping = None
+
+    file = open(path, 'rb')
+    mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    _worker_mapping = (key, file, mapped)
+    return mapped
+
+def _get_matcher(patterns: Tuple[bytes, ...]) -> MultiPatternSearch:
+    """Automate en cache pour les motifs de la recherche en cours"""
+    matcher = _worker_matchers.get(patterns)
+    if matcher is None:
+        _worker_matchers.clear()
+        matcher = _worker_matchers[patterns] = MultiPatternSearch(patterns)
+    return matcher
+
+def search_range(data, patterns: Sequence[bytes], start: int, end: int) -> List[Tuple[int, int]]:
+    """
+    Cherche les occurrences qui commencent dans [start, end)
+
+    Les données sont lues jusqu'à end + longueur du motif - 1 pour trouver les
+    occurrences à cheval sur la fin du bloc.
+
+    Returns:
+        Liste de tuples (offset, identifiant du motif) triée
+    """
+    size = len(data)
+    end = min(end, size)
+    if start >= end:
+        return []
+
+    if len(patterns) == 1:
+        pattern = patterns[0]
+        limit = min(size, end + len(pattern) - 1)
+        hits = []
+        position = data.find(pattern, start, limit)
+        while position != -1:
+            hits.append((position, 0))
+            position = data.find(pattern, position + 1, limit)
+        return hits
+
+    limit = min(size, end + max(len(pattern) for pattern in patterns) - 1)
+    hits = [
+        (offset, pattern_id)
+        for pattern_id, offset in _get_matcher(tuple(patterns)).iter_matches(data, start, limit)
+        if offset < end
+    ]
+    hits.sort()
+    return hits
+
+def _search_file_chunk(path: str, patterns: Tuple[bytes, ...], start: int, end: int):
+    """Tâche exécutée dans un processus du pool"""
+    hits = search_range(_open_worker_mapping(path), patterns, start, end)
+    # Tableaux compacts: beaucoup plus rapides à transmettre que des tuples
+    offsets = array('Q', (offset for offset, _ in hits))
+    pattern_ids = array('I', (pattern_id for _, pattern_id in hits))
+    return offsets, pattern_ids
+
+class ParallelSearch:
+    """
+    Recherche de motifs répartie sur un pool de processus
+
+    Si aucun fichier source n'est fourni, les blocs sont cherchés dans des
+    threads sur le buffer lui-même (sans gain de vitesse, mais avec le même
+    ordre de résultats et la même annulation).
+    """
+
+    def __init__(self, data, source_path: Optional[str] = None,
+                 dirty_ranges: Optional[Iterable[Tuple[int, int]]] = None,
+                 chunk_size: int = CHUNK_SIZE, workers: Optional[int] = None):
+        """
+        Args:
+            data: Buffer affiché (bytes, bytearray, mmap...)
+            source_path: Fichier dont data est une image, modifications exceptées
+            dirty_ranges: Plages (début, fin) de data qui diffèrent du fichier
+            chunk_size: Taille des blocs
+            workers: Nombre de processus (nombre de cœurs par défaut)
+        """
+        self.data = data
+        self.source_path = source_path
+        self.dirty_ranges = sorted(dirty_ranges or [])
+        self.chunk_size = max(1, chunk_size)
+        self.workers = workers or os.cpu_count() or 1
+
+    def _can_use_file(self) -> bool:
+        """Les processus peuvent-ils relire le fichier source ?"""
+        if not self.source_path:
+            return False
+        try:
+            return os.path.getsize(self.source_path) == len(self.data)
+        except OSError:
+            return False
+
+    def iter_matches(self, patterns: Sequence[bytes],
+                     cancel_event: Optional[threading.Event] = None,
+                     progress: Optional[Callable[[int], None]] = None,
+                     start: int = 0) -> Iterator[Tuple[int, int]]:
+        """
+        Produit les occurrences par offset croissant, au fil des blocs terminés
+
+        Args:
+            patterns: Motifs à chercher; leur indice sert d'identifiant
+            cancel_event: Événement qui interrompt la recherche
+            progress: Appelé avec le pourcentage de blocs terminés
+            start: Offset à partir duquel chercher
+
+        Yields:
+            Tuples (identifiant du motif, offset)
+        """
+        patterns = tuple(bytes(pattern) for pattern in patterns)
+        if not patterns or any(not pattern for pattern in patterns):
+            raise ValueError("Motif vide")
+
+        size = len(self.data)
+        start = max(0, start)
+        if size < PARALLEL_THRESHOLD:
+            for offset, pattern_id in search_range(self.data, patterns, start, size):
+                yield pattern_id, offset
+            if progress:
+                progress(100)
+            return
+
+        if self._can_use_file():
+            chunks = self._iter_file_chunks(patterns, cancel_event, progress, start)
+            dirty_hits = [hit for hit in self._search_dirty(patterns) if hit[0] >= start]
+            merged = heapq.merge(self._skip_dirty(chunks, patterns), dirty_hits)
+        else:
+            merged = self._iter_thread_chunks(patterns, cancel_event, progress, start)
+
+        for offset, pattern_id in merged:
+            yield pattern_id, offset
+
+    def find_first(self, patterns: Sequence[bytes], start: int = 0,
+                   cancel_event: Optional[threading.Event] = None,
+                   progress: Optional[Callable[[int], None]] = None) -> Optional[Tuple[int, int]]:
+        """
+        Première occurrence à partir de start
+
+        Les blocs suivants ne sont pas attendus: la recherche s'arrête au
+        premier bloc qui contient une occurrence.
+
+        Returns:
+            (identifiant du motif, offset), ou None si aucune occurrence
+            (ou si la recherche a été annulée)
+        """
+        matches = self.iter_matches(patterns, cancel_event, progress, start)
+        try:
+            return next(matches, None)
+        finally:
+            matches.close()
+
+    def _chunk_bounds(self, first: int = 0) -> List[Tuple[int, int]]:
+        size = len(self.data)
+        return [
+            (start, min(start + self.chunk_size, size))
+            for start in range(first, size, self.chunk_size)
+        ]
+
+    def _iter_ordered(self, executor, submit, cancel_event, progress, first: int = 0):
+        """Soumet les blocs par fenêtre bornée et restitue leurs résultats dans l'ordre"""
+        bounds = self._chunk_bounds(first)
+        pending = []
+        next_chunk = 0
+        done = 0
+
+        try:
+            while next_chunk < len(bounds) or pending:
+                while next_chunk < len(bounds) and len(pending) < self.workers * 2:
+                    start, end = bounds[next_chunk]
+                    pending.append(submit(executor, start, end))
+                    next_chunk += 1
+
+                result = pending.pop(0).result()
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+
+                done += 1
+                if progress:
+                    progress(done * 100 // len(bounds))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _iter_file_chunks(self, patterns, cancel_event, progress, first: int = 0):
+        """Blocs cherchés par le pool de processus sur le fichier source"""
+        path = self.source_path
+
+        def submit(executor, start, end):
+            return executor.submit(_search_file_chunk, path, patterns, start, end)
+
+        for offsets, pattern_ids in self._iter_ordered(
+                get_executor(self.workers), submit, cancel_event, progress, first):
+            yield from zip(offsets, pattern_ids)
+
+    def _iter_thread_chunks(self, patterns, cancel_event, progress, first: int = 0):
+        """Blocs cherchés par des threads directement dans le buffer"""
+        data = self.data
+
+        def submit(executor, start, end):
+            return executor.submit(search_range, data, patterns, start, end)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for chunk_hits in self._iter_ordered(executor, submit, cancel_event, progress, first):
+                yield from chunk_hits
+
+    @staticmethod
+    def _touches(ranges, offset: int, length: int) -> bool:
+        """L'occurrence [offset, offset + length) recouvre-t-elle une plage ?"""
+        for start, end in ranges:
+            if start >= offset + length:
+                return False
+            if end > offset:
+                return True
+        return False
+
+    def _skip_dirty(self, hits, patterns):
+        """Écarte les occurrences du fichier qui recouvrent des octets modifiés"""
+        if not self.dirty_ranges:
+            yield from hits
+            return
+
+        for offset, pattern_id in hits:
+            if not self._touches(self.dirty_ranges, offset, len(patterns[pattern_id])):
+                yield offset, pattern_id
+
+    def _search_dirty(self, patterns) -> List[Tuple[int, int]]:
+        """Cherche, dans le buffer, les occurrences qui recouvrent des octets modifiés"""
+        longest = max(len(pattern) for pattern in patterns)
+        hits = set()
+        for start, end in self.dirty_ranges:
+            for offset, pattern_id in search_range(
+                    self.data, patterns, max(0, start - longest + 1), end):
+                if self._touches([(start, end)], offset, len(patterns[pattern_id])):
+                    hits.add((offset, pattern_id))
+        return sorted(hits)
@@ -0,0 +1,126 @@
+"""
+Recherche simultanée de plusieurs motifs (automate d'Aho-Corasick)
+"""
+
+import re
+from array import array
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+class MultiPatternSearch:
+    """
+    Automate d'Aho-Corasick construit une fois pour un ensemble de motifs
+
+    La recherche parcourt les données en une seule passe linéaire et trouve
+    toutes les occurrences (y compris chevauchantes) de tous les motifs.
+    Tant que l'automate est à la racine, les octets qui ne peuvent commencer
+    aucun motif sont sautés par une recherche de classe de caractères (C).
+    """
+
+    def __init__(self, patterns: Sequence[bytes]):
+        """
+        Construit l'automate
+
+        Args:
+            patterns: Motifs à chercher; leur indice sert d'identifiant
+        """
+        self.patterns = [bytes(pattern) for pattern in patterns]
+        if any(not pattern for pattern in self.patterns):
+            raise ValueError("Motif vide")
+
+        self._delta: List[array] = []
+        self._outputs: List[Tuple[Tuple[int, int], ...]] = []
+        self._build()
+
+        first_bytes = sorted({pattern[0] for pattern in self.patterns})
+        self._skip = re.compile(
+            b'[' + b''.join(re.escape(bytes([b])) for b in first_bytes) + b']'
+        ) if first_bytes else None
+
+    def _build(self):
+        """Construit le trie, les liens d'échec puis la table de transitions complète"""
+        goto: List[Dict[int, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for byte in pattern:
+                next_state = goto[state].get(byte)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][byte] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(pattern_id)
+
+        # Parcours en largeur: chaque état hérite des transitions de son lien d'échec
+        fail = [0] * len(goto)
+        delta = [array('I', [0]) * 256 for _ in goto]
+        for byte, child in goto[0].items():
+            delta[0][byte] = child
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state].extend(outputs[fail[state]])
+            row = delta[state]
+            row[:] = delta[fail[state]]
+            for byte, child in goto[state].items():
+                fail[child] = delta[fail[state]][byte]
+                row[byte] = child
+                queue.append(child)
+
+        self._delta = delta
+        self._outputs = [
+            tuple((pattern_id, len(self.patterns[pattern_id])) for pattern_id in output)
+            for output in outputs
+        ]
+
+    def iter_matches(self, data, start: int = 0,
+                     end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """
+        Parcourt les données et produit les occurrences au fil de l'eau
+
+        Args:
+            data: Buffer source (bytes, bytearray, mmap...)
+            start: Offset de départ
+            end: Offset de fin (exclu), fin des données par défaut
+
+        Yields:
+            Tuples (identifiant du motif, offset de l'occurrence), dans l'ordre
+            des fins d'occurrence
+        """
+        if self._skip is None:
+            return
+
+        end = len(data) if end is None else min(end, len(data))
+        delta = self._delta
+        outputs = self._outputs
+        skip = self._skip.search
+
+        state = 0
+        position = start
+        while position < end:
+            if state == 0:
+                found = skip(data, position, end)
+                if found is None:
+                    return
+                position = found.start()
+
+            state = delta[state][data[position]]
+            position += 1
+
+            for pattern_id, length in outputs[state]:
+                match_start = position - length
+                if match_start >= start:
+                    yield pattern_id, match_start
+
+    def find_all(self, data, start: int = 0, end: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Retourne toutes les occurrences triées par offset
+
+        Returns:
+            Liste de tuples (identifiant du motif, offset)
+        """
+        return sorted(self.iter_matches(data, start, end), key=lambda match: (match[1], match[0]))
@@ -0,0 +1,169 @@
+"""
+Politique de conservation des sauvegardes
+
+Pour chaque fichier sauvegardé, en partant de la sauvegarde la plus récente:
+- les keep_last plus récentes sont conservées;
+- puis la plus récente de chaque heure sur hourly_hours heures, de chaque
+  jour sur daily_days jours, de chaque semaine sur weekly_weeks semaines;
+- les autres sont supprimées.
+Les versions dont dépend un delta conservé sont conservées avec lui.
+
+Si un budget total (max_total_bytes) est fixé, les sauvegardes conservées
+les plus anciennes sont ensuite supprimées jusqu'à le respecter, avec les
+deltas qui en dépendent; la plus récente de chaque fichier n'est jamais
+supprimée.
+
+La décision est prise en une passe sur les lignes du catalogue, sans accès
+aux fichiers.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from .backup_catalog import BackupRecord
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Format des sauvegardes dont les données sont dans le magasin de blocs
+CHUNKS_FORMAT = 'chunks'
+
+@dataclass
+class RetentionPolicy:
+    """Nombre et âge des sauvegardes conservées pour chaque fichier"""
+    keep_last: int = 10
+    hourly_hours: int = 24
+    daily_days: int = 7
+    weekly_weeks: int = 4
+    max_total_bytes: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, settings: Optional[dict]) -> 'RetentionPolicy':
+        """
+        Politique décrite dans la config (editor.backup_retention)
+
+        Args:
+            settings: keep_last, hourly_hours, daily_days, weekly_weeks,
+                      max_total_mb (0 ou absent: pas de budget)
+        """
+        settings = settings or {}
+        defaults = cls()
+        max_total_mb = settings.get('max_total_mb') or 0
+        return cls(
+            keep_last=int(settings.get('keep_last', defaults.keep_last)),
+            hourly_hours=int(settings.get('hourly_hours', defaults.hourly_hours)),
+            daily_days=int(settings.get('daily_days', defaults.daily_days)),
+            weekly_weeks=int(settings.get('weekly_weeks', defaults.weekly_weeks)),
+            max_total_bytes=int(max_total_mb * 1024 * 1024) or None,
+        )
+
+@dataclass
+class RetentionPlan:
+    """Résultat de plan_retention"""
+    remove: List[BackupRecord] = field(default_factory=list)
+    kept: int = 0
+    # Place occupée estimée avant et après suppression (octets)
+    usage_before: int = 0
+    usage_after: int = 0
+
+def _bucket(record: BackupRecord, now: float, policy: RetentionPolicy):
+    """Période (heure, jour ou semaine) représentée par la sauvegarde, selon son âge"""
+    age = now - record.created
+    created = datetime.fromtimestamp(record.created)
+    if age < policy.hourly_hours * 3600:
+        return 'h', created.strftime('%Y-%m-%d %H')
+    if age < policy.daily_days * 86400:
+        return 'd', created.strftime('%Y-%m-%d')
+    if age < policy.weekly_weeks * 7 * 86400:
+        year, week, _ = created.isocalendar()
+        return 'w', f"{year}-{week:02d}"
+    return None
+
+def plan_retention(records: List[BackupRecord], policy: RetentionPolicy, now: float,
+                   store_bytes: int = 0) -> RetentionPlan:
+    """
+    Choisit les sauvegardes à supprimer
+
+    Args:
+        records: Toutes les sauvegardes du catalogue
+        policy: Politique de conservation
+        now: Date de référence (secondes depuis l'epoch)
+        store_bytes: Taille du magasin de blocs, répartie entre les
+                     sauvegardes "chunks" au prorata de leur taille
+
+    Returns:
+        Plan de suppression
+    """
+    by_path = {record.path: record for record in records}
+
+    # Sauvegardes de chaque fichier, la plus récente d'abord
+    groups: Dict[str, List[BackupRecord]] = {}
+    for record in sorted(records, key=lambda r: r.created, reverse=True):
+        groups.setdefault(record.source or record.name, []).append(record)
+
+    keep: Set[str] = set()
+    newest: Set[str] = set()
+    for group in groups.values():
+        newest.add(group[0].path)
+        seen = set()
+        for position, record in enumerate(group):
+            bucket = _bucket(record, now, policy)
+            if position < policy.keep_last:
+                keep.add(record.path)
+            elif bucket is not None and bucket not in seen:
+                keep.add(record.path)
+            if bucket is not None:
+                seen.add(bucket)
+
+    # Versions nécessaires aux deltas conservés
+    for path in list(keep):
+        base = by_path[path].base
+        while base is not None and base in by_path and base not in keep:
+            keep.add(base)
+            base = by_path[base].base
+
+    # Place occupée: fichier de sauvegarde, plus la part du magasin de blocs
+    chunked = sum(record.size for record in records if record.format == CHUNKS_FORMAT)
+    ratio = store_bytes / chunked if chunked else 0.0
+
+    def cost(record: BackupRecord) -> int:
+        if record.format == CHUNKS_FORMAT:
+            return record.stored_size + int(record.size * ratio)
+        return record.stored_size
+
+    plan = RetentionPlan(usage_before=sum(cost(record) for record in records))
+    usage = sum(cost(by_path[path]) for path in keep)
+
+    if policy.max_total_bytes is not None and usage > policy.max_total_bytes:
+        children: Dict[str, List[str]] = {}
+        for path in keep:
+            base = by_path[path].base
+            if base is not None:
+                children.setdefault(base, []).append(path)
+
+        for record in sorted((by_path[path] for path in keep), key=lambda r: r.created):
+            if usage <= policy.max_total_bytes:
+                break
+            if record.path not in keep:
+                continue
+            # Une version part avec tous les deltas conservés qui en dépendent
+            unit, stack = set(), [record.path]
+            while stack:
+                path = stack.pop()
+                if path in keep and path not in unit:
+                    unit.add(path)
+                    stack.extend(children.get(path, ()))
+            if unit & newest:
+                continue
+            for path in unit:
+                keep.discard(path)
+                usage -= cost(by_path[path])
+
+        if usage > policy.max_total_bytes:
+            logger.warning(f"Budget des sauvegardes dépassé: {usage} octets conservés "
+                           f"pour {policy.max_total_bytes} (dernières versions)")
+
+    plan.remove = [record for record in records if record.path not in keep]
+    plan.kept = len(keep)
+    plan.usage_after = usage
+    return plan
@@ -0,0 +1,11 @@
+"""
+Configuration commune des tests: les modules sont importés depuis src/
+(comme au lancement de l'application)
+"""
+
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
@@ -0,0 +1,208 @@
+"""
+Sauvegardes: création, restauration et conservation dans chaque format
+"""
+
+import os
+import random
+import shutil
+
+import pytest
+
+from utils import backup_manager, delta_store, fast_copy
+from utils.backup_manager import (
+    BACKUP_COMPRESSION_NONE, BACKUP_FORMAT_CHUNKS, BACKUP_FORMAT_COPY,
+    BACKUP_FORMAT_DELTA, BackupManager,
+)
+from utils.chunk_store import file_hasher
+from utils.delta_store import DeltaBackup, is_delta
+from utils.retention import RetentionPolicy
+
+# (format, compression) de chaque type de sauvegarde
+FORMATS = [
+    (BACKUP_FORMAT_CHUNKS, BACKUP_COMPRESSION_NONE),
+    (BACKUP_FORMAT_DELTA, BACKUP_COMPRESSION_NONE),
+    (BACKUP_FORMAT_COPY, BACKUP_COMPRESSION_NONE),
+    (BACKUP_FORMAT_COPY, 'zlib'),
+    (BACKUP_FORMAT_COPY, 'lzma'),
+]
+
+# Conserve seulement les keep_last plus récentes (pas de paliers horaires)
+def last_only(keep_last):
+    return RetentionPolicy(keep_last=keep_last, hourly_hours=0, daily_days=0, weekly_weeks=0)
+
+def make_versions(count, size=300 * 1024, seed=0):
+    """Versions successives d'un fichier: modifications locales, insertions et suppressions"""
+    rnd = random.Random(seed)
+    data = bytearray(rnd.getrandbits(8) for _ in range(size))
+    versions = [bytes(data)]
+    for index in range(1, count):
+        offset = rnd.randrange(len(data))
+        if index % 3 == 0:
+            data[offset:offset] = bytes(rnd.getrandbits(8) for _ in range(777))
+        elif index % 3 == 1:
+            del data[offset:offset + 500]
+        else:
+            data[offset:offset + 64] = bytes(rnd.getrandbits(8) for _ in range(64))
+        versions.append(bytes(data))
+    return versions
+
+def write_version(path, data, index):
+    """Écrit une version avec une date de modification distincte"""
+    path.write_bytes(data)
+    mtime_ns = 1_600_000_000_000_000_000 + index * 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def backup_all(manager, source, versions):
+    paths = []
+    for index, data in enumerate(versions):
+        write_version(source, data, index)
+        backup = manager.create_backup(str(source))
+        assert backup is not None
+        paths.append(backup)
+    return paths
+
+def check_restore(manager, backup, expected, target):
+    assert manager.restore_backup(backup, str(target))
+    assert target.read_bytes() == expected
+    target.unlink()
+
+@pytest.mark.parametrize("backup_format,compression", FORMATS)
+def test_backup_restore_round_trip(tmp_path, backup_format, compression):
+    manager = BackupManager(str(tmp_path / "backups"), backup_format, compression)
+    source = tmp_path / "game.save"
+    versions = make_versions(5)
+
+    paths = backup_all(manager, source, versions)
+
+    assert len(set(paths)) == len(versions)
+    assert manager.get_backups_for_file(str(source)) == list(reversed(paths))
+    for backup, expected in zip(paths, versions):
+        check_restore(manager, backup, expected, tmp_path / "restored.save")
+
+@pytest.mark.parametrize("backup_format,compression", FORMATS)
+def test_unchanged_file_reuses_backup(tmp_path, backup_format, compression):
+    manager = BackupManager(str(tmp_path / "backups"), backup_format, compression)
+    source = tmp_path / "game.save"
+    write_version(source, make_versions(1)[0], 0)
+
+    first = manager.create_backup(str(source))
+    assert manager.create_backup(str(source)) == first
+
+def simulated_clone(src_fd, dst_fd):
+    """Clonage simulé: le contenu arrive sans passer par les tampons de copy_file"""
+    with open(src_fd, 'rb', closefd=False) as src, open(dst_fd, 'wb', closefd=False) as dst:
+        src.seek(0)
+        shutil.copyfileobj(src, dst)
+    return True
+
+@pytest.mark.parametrize("clone", [False, True])
+def test_copy_backup_records_digest(tmp_path, monkeypatch, clone):
+    if clone:
+        monkeypatch.setattr(fast_copy, '_clone', simulated_clone)
+    manager = BackupManager(str(tmp_path / "backups"), BACKUP_FORMAT_COPY)
+    source = tmp_path / "game.save"
+    data = make_versions(1)[0]
+    write_version(source, data, 0)
+
+    backup = manager.create_backup(str(source))
+
+    hasher = file_hasher()
+    hasher.update(data)
+    record = manager.catalog.get(manager._relative(backup))
+    assert record.digest == hasher.hexdigest()
+    assert manager.create_backup(str(source)) == backup
+
+    # Empreinte en cache: la copie suivante ne calcule aucune empreinte
+    monkeypatch.setattr(backup_manager, 'file_hasher', None)
+    os.unlink(backup)
+    second = manager.create_backup(str(source))
+    assert second is not None
+    assert manager.catalog.get(manager._relative(second)).digest == record.digest
+    check_restore(manager, second, data, tmp_path / "restored.save")
+
+def test_delta_chain_keyframes(tmp_path, monkeypatch):
+    monkeypatch.setattr(delta_store, 'KEYFRAME_INTERVAL', 4)
+    manager = BackupManager(str(tmp_path / "backups"), BACKUP_FORMAT_DELTA)
+    source = tmp_path / "game.save"
+    versions = make_versions(10)
+
+    paths = backup_all(manager, source, versions)
+
+    depths = [DeltaBackup.open(path).depth for path in paths]
+    assert depths == [0, 1, 2, 3, 0, 1, 2, 3, 0, 1]
+    assert all(is_delta(path) for path in paths)
+    for backup, expected in zip(paths, versions):
+        check_restore(manager, backup, expected, tmp_path / "restored.save")
+
+def test_delta_retention_keeps_bases(tmp_path, monkeypatch):
+    monkeypatch.setattr(delta_store, 'KEYFRAME_INTERVAL', 4)
+    manager = BackupManager(str(tmp_path / "backups"), BACKUP_FORMAT_DELTA)
+    source = tmp_path / "game.save"
+    versions = make_versions(10)
+    paths = backup_all(manager, source, versions)
+
+    removed = manager.apply_retention(last_only(2))
+
+    # Les deux dernières (profondeur 0 et 1) suffisent: la chaîne précédente part
+    assert removed == 8
+    kept = manager.get_backups_for_file(str(source))
+    assert kept == [paths[9], paths[8]]
+    for backup, expected in zip(kept, [versions[9], versions[8]]):
+        check_restore(manager, backup, expected, tmp_path / "restored.save")
+
+def test_delta_retention_keeps_chain_of_kept_delta(tmp_path, monkeypatch):
+    monkeypatch.setattr(delta_store, 'KEYFRAME_INTERVAL', 4)
+    manager = BackupManager(str(tmp_path / "backups"), BACKUP_FORMAT_DELTA)
+    source = tmp_path / "game.save"
+    versions = make_versions(7)
+    paths = backup_all(manager, source, versions)
+
+    # La dernière est un delta de profondeur 2: sa base et l'image clé restent
+    manager.apply_retention(last_only(1))
+
+    kept = manager.get_backups_for_file(str(source))
+    assert kept == [paths[6], paths[5], paths[4]]
+    check_restore(manager, paths[6], versions[6], tmp_path / "restored.save")
+
+@pytest.mark.parametrize("backup_format,compression", FORMATS)
+def test_retention_removes_files_and_chunks(tmp_path, backup_format, compression):
+    manager = BackupManager(str(tmp_path / "backups"), backup_format, compression)
+    source = tmp_path / "game.save"
+    versions = make_versions(6)
+    paths = backup_all(manager, source, versions)
+
+    manager.apply_retention(last_only(2))
+
+    kept = manager.get_backups_for_file(str(source))
+    assert paths[-1] in kept
+    for path in paths:
+        assert os.path.exists(path) == (path in kept)
+    for backup in kept:
+        check_restore(manager, backup, versions[paths.index(backup)], tmp_path / "restored.save")
+
+    # Le magasin ne garde que les blocs encore référencés
+    assert manager.collect_garbage() == (0, 0)
+
+def test_retention_size_budget(tmp_path):
+    manager = BackupManager(str(tmp_path / "backups"), BACKUP_FORMAT_COPY)
+    source = tmp_path / "game.save"
+    versions = make_versions(5, size=100 * 1024)
+    paths = backup_all(manager, source, versions)
+
+    policy = RetentionPolicy(keep_last=10, max_total_bytes=250 * 1024)
+    manager.apply_retention(policy)
+
+    # Les plus anciennes partent jusqu'à respecter le budget
+    assert manager.get_backups_for_file(str(source)) == [paths[4], paths[3]]
+
+def test_catalog_rebuild(tmp_path):
+    backup_dir = tmp_path / "backups"
+    manager = BackupManager(str(backup_dir), BACKUP_FORMAT_CHUNKS)
+    source = tmp_path / "game.save"
+    paths = backup_all(manager, source, make_versions(3))
+
+    os.unlink(backup_dir / ".store" / "catalog.db")
+    fresh = BackupManager(str(backup_dir), BACKUP_FORMAT_CHUNKS)
+
+    assert fresh.get_backups_for_file(str(source)) == list(reversed(paths))
+    assert fresh.get_backup_stats()['total_backups'] == 3
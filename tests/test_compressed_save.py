@@ -0,0 +1,130 @@
+"""
+Sauvegardes compressées: modification, enregistrement puis relecture
+(en-tête en clair, flux zlib, octets après le flux)
+"""
+
+import os
+import random
+import zlib
+from dataclasses import dataclass
+
+import pytest
+
+from core import compression
+from core.compression import chunk_map_path, find_zlib_stream
+from core.save_file import LOAD_MODE_COW, LOAD_MODE_MEMORY, SaveFileManager
+
+PREFIX = b"TSSAVE01" + b"-" * 56
+SUFFIX = b"TAIL:" + bytes(range(64))
+
+# Petits blocs de recompression: plusieurs blocs sans fichier de plusieurs Mo
+CHUNK_SIZE = 64 * 1024
+
+def make_payload(size, seed=0):
+    """Données moyennement compressibles"""
+    rnd = random.Random(seed)
+    words = [bytes(rnd.getrandbits(8) for _ in range(rnd.randrange(4, 16))) for _ in range(200)]
+    parts, total = [], 0
+    while total < size:
+        word = rnd.choice(words)
+        parts.append(word)
+        total += len(word)
+    return b"".join(parts)[:size]
+
+def write_save(path, payload, level=6):
+    path.write_bytes(PREFIX + zlib.compress(payload, level) + SUFFIX)
+
+def read_save(path):
+    """(en-tête en clair, données décompressées, octets suivants) du fichier"""
+    raw = path.read_bytes()
+    offset = find_zlib_stream(str(path))
+    decompressor = zlib.decompressobj()
+    payload = decompressor.decompress(raw[offset:])
+    assert decompressor.eof
+    return raw[:offset], payload, decompressor.unused_data
+
+@dataclass
+class SmallChunkLayout(compression.CompressedLayout):
+    chunk_size: int = CHUNK_SIZE
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(compression, 'CompressedLayout', SmallChunkLayout)
+
+@pytest.fixture
+def manager():
+    manager = SaveFileManager()
+    yield manager
+    manager.close()
+
+@pytest.mark.parametrize("mode", [LOAD_MODE_COW, LOAD_MODE_MEMORY])
+def test_edit_save_reinflate(tmp_path, small_chunks, manager, mode):
+    path = tmp_path / "game.save"
+    payload = make_payload(10 * CHUNK_SIZE + 1234)
+    write_save(path, payload)
+
+    assert manager.load_save_file(str(path), mode) is not None
+    assert manager.compression is not None
+    assert manager.compression.prefix_size == len(PREFIX)
+    assert bytes(manager.raw_data) == PREFIX + payload
+
+    expected = bytearray(payload)
+    for offset, data in [(5, b"\xAA\xBB"), (3 * CHUNK_SIZE - 2, b"spans two chunks"),
+                         (len(payload) - 4, b"\x01\x02\x03\x04")]:
+        manager.write_bytes(len(PREFIX) + offset, data)
+        expected[offset:offset + len(data)] = data
+
+    assert manager.save_to_file(str(path), backup=False)
+
+    prefix, inflated, suffix = read_save(path)
+    assert prefix == PREFIX
+    assert inflated == bytes(expected)
+    assert suffix == SUFFIX
+    assert os.path.exists(chunk_map_path(str(path)))
+    assert len(manager.compression.segments) == 11
+
+    # Relecture par le gestionnaire (carte des blocs comprise)
+    reloaded = SaveFileManager()
+    try:
+        assert reloaded.load_save_file(str(path), mode) is not None
+        assert bytes(reloaded.raw_data) == PREFIX + bytes(expected)
+        assert reloaded.compression.segments == manager.compression.segments
+    finally:
+        reloaded.close()
+
+def test_second_save_reuses_unchanged_chunks(tmp_path, small_chunks, manager, monkeypatch):
+    path = tmp_path / "game.save"
+    payload = make_payload(8 * CHUNK_SIZE)
+    write_save(path, payload)
+    manager.load_save_file(str(path))
+
+    manager.write_bytes(len(PREFIX) + 10, b"first")
+    assert manager.save_to_file(str(path), backup=False)
+
+    compressed = []
+    original = compression.compress_chunk
+    monkeypatch.setattr(compression, 'compress_chunk',
+                        lambda chunk, level: compressed.append(len(chunk)) or original(chunk, level))
+
+    # Un seul bloc touché: un seul bloc recompressé, les autres recopiés
+    manager.write_bytes(len(PREFIX) + 5 * CHUNK_SIZE + 7, b"second")
+    assert manager.save_to_file(str(path), backup=False)
+
+    assert compressed == [CHUNK_SIZE]
+    expected = bytearray(payload)
+    expected[10:15] = b"first"
+    expected[5 * CHUNK_SIZE + 7:5 * CHUNK_SIZE + 13] = b"second"
+    assert read_save(path) == (PREFIX, bytes(expected), SUFFIX)
+
+def test_save_as_other_file(tmp_path, small_chunks, manager):
+    path = tmp_path / "game.save"
+    copy = tmp_path / "copy.save"
+    payload = make_payload(3 * CHUNK_SIZE + 99)
+    write_save(path, payload)
+    manager.load_save_file(str(path))
+
+    manager.write_bytes(len(PREFIX), b"\x00" * 8)
+    assert manager.save_to_file(str(copy), backup=False)
+
+    assert read_save(copy) == (PREFIX, b"\x00" * 8 + payload[8:], SUFFIX)
+    assert read_save(path) == (PREFIX, payload, SUFFIX)
@@ -0,0 +1,99 @@
+"""
+Index de recherche: find et find_all comparés à bytes.find, avec modifications
+"""
+
+import random
+
+import pytest
+
+from core.search_index import SearchIndex
+
+SIZE = 256 * 1024
+
+def scan_all(data, pattern):
+    hits = []
+    position = data.find(pattern)
+    while position != -1:
+        hits.append(position)
+        position = data.find(pattern, position + 1)
+    return hits
+
+def make_data(seed=0):
+    """Données peu variées (beaucoup d'occurrences) et quelques marqueurs"""
+    rnd = random.Random(seed)
+    data = bytearray(rnd.choice(b"abcd") for _ in range(SIZE))
+    for offset in (0, 1000, 77777, SIZE - 8):
+        data[offset:offset + 8] = b"MARKER!!"
+    return data
+
+PATTERNS = [b"MARKER!!", b"abcab", b"dddd", b"abcdabcd", b"zzzz", b"ab", b"ARKE"]
+
+@pytest.fixture
+def indexed(tmp_path):
+    data = make_data()
+    path = tmp_path / "game.save"
+    path.write_bytes(data)
+    index = SearchIndex.build(data, str(path))
+    yield data, index, path
+    index.close()
+
+def edit(data, rnd, count):
+    """Modifications aléatoires; retourne les plages modifiées"""
+    ranges = []
+    for _ in range(count):
+        offset = rnd.randrange(SIZE - 16)
+        chunk = bytes(rnd.choice(b"abcdMARKER!") for _ in range(rnd.randrange(1, 16)))
+        data[offset:offset + len(chunk)] = chunk
+        ranges.append((offset, offset + len(chunk)))
+    return ranges
+
+def check(data, index, extra=()):
+    data_bytes = bytes(data)
+    starts = [0, 1, 999, 1000, 1001, 77776, 77778, SIZE - 9, SIZE - 8, SIZE - 1, SIZE]
+    for pattern in PATTERNS:
+        assert index.find_all(data, pattern, extra) == scan_all(data_bytes, pattern)
+        for start in starts + list(range(0, SIZE, 9973)):
+            assert index.find(data, pattern, start, extra) == data_bytes.find(pattern, start)
+
+def test_find_matches_scan(indexed):
+    data, index, _ = indexed
+    check(data, index)
+
+def test_find_with_unindexed_edits(indexed):
+    data, index, _ = indexed
+    rnd = random.Random(1)
+    extra = edit(data, rnd, 40)
+    data[5000:5008] = b"MARKER!!"
+    extra.append((5000, 5008))
+    check(data, index, extra)
+
+def test_find_with_overlay(indexed):
+    data, index, path = indexed
+    rnd = random.Random(2)
+    ranges = edit(data, rnd, 30)
+    path.write_bytes(data)
+    assert index.update(data, ranges)
+
+    # Recouvrement de l'index et modifications plus récentes ensemble
+    extra = edit(data, rnd, 10)
+    check(data, index, extra)
+
+def test_overlay_survives_reopen(indexed):
+    data, index, path = indexed
+    ranges = edit(data, random.Random(3), 20)
+    path.write_bytes(data)
+    assert index.update(data, ranges)
+
+    reopened = SearchIndex.open(data, str(path))
+    try:
+        assert reopened is not None
+        assert list(reopened.overlay) == list(index.overlay)
+        check(data, reopened)
+    finally:
+        reopened.close()
+
+def test_open_rejects_other_content(indexed):
+    data, _, path = indexed
+    data[10:14] = b"XXXX"
+    path.write_bytes(data)
+    assert SearchIndex.open(data, str(path)) is None